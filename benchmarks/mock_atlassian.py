@@ -0,0 +1,253 @@
+"""
+Servidor local que imita a REST API v3 do JIRA e a Organizations API
+Usado pelos benchmarks para medir as ferramentas sem depender de um site
+real; cada resposta é atrasada pela latência configurada
+"""
+
+import asyncio
+import itertools
+import random
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+JIRA = "/rest/api/3"
+ORG = "/admin/v1/orgs/{org_id}"
+
+PROJECT = {"id": "10000", "key": "SCRUM", "name": "Scrum Benchmark"}
+ISSUE_TYPES = [{"id": "10001", "name": "Task"}, {"id": "10002", "name": "Bug"}]
+ROLES = {"Administrators": "10002", "Developers": "10001", "Auditors": "10100"}
+CATEGORY = {"id": "10", "name": "Benchmark"}
+
+
+class MockAtlassian:
+    """Estado em memória e rotas do servidor simulado"""
+
+    def __init__(self, latency: float = 0.02, jitter: float = 0.0,
+                 users: int = 200, projects: int = 50, groups: int = 250,
+                 page_size: int = 100):
+        self.latency = latency
+        self.jitter = jitter
+        self.users = {
+            f"user{i}@example.com": {
+                "accountId": f"5b10ac8d82e05b22cc7d{i:04d}",
+                "displayName": f"User {i}",
+                "emailAddress": f"user{i}@example.com",
+                "active": True,
+            }
+            for i in range(users)
+        }
+        self.project_keys = [f"P{i}" for i in range(projects)]
+        self.groups = [{"id": f"group-{i}", "name": f"team-{i}"} for i in range(groups)]
+        self.page_size = page_size
+        self.issue_ids = itertools.count(10000)
+        self.requests: Counter = Counter()
+        self.runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    # --- ciclo de vida -------------------------------------------------------
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._latency_middleware])
+        app.add_routes([
+            web.get(f"{JIRA}/myself", self.myself),
+            web.get(f"{JIRA}/serverInfo", self.server_info),
+            web.get(f"{JIRA}/user/search", self.user_search),
+            web.post(f"{JIRA}/user", self.create_user),
+            web.get(f"{JIRA}/project", self.projects),
+            web.get(f"{JIRA}/project/search", self.project_search),
+            web.get(f"{JIRA}/projectCategory", self.project_categories),
+            web.get(f"{JIRA}/project/{{key}}", self.project),
+            web.get(f"{JIRA}/project/{{key}}/role", self.project_roles),
+            web.put(f"{JIRA}/project/{{key}}/role/{{role_id}}", self.role_actors),
+            web.post(f"{JIRA}/project/{{key}}/role/{{role_id}}", self.role_actors),
+            web.get(f"{JIRA}/issuetype/project", self.issue_types),
+            web.post(f"{JIRA}/issue", self.create_issue),
+            web.post(f"{JIRA}/issue/bulk", self.create_issues_bulk),
+            web.get(f"{JIRA}/issue/{{key}}", self.get_issue),
+            web.post(f"{JIRA}/search/jql", self.search_jql),
+            web.post(f"{JIRA}/search/approximate-count", self.approximate_count),
+            web.get(f"{JIRA}/permissionscheme", self.permission_schemes),
+            web.post(f"{JIRA}/permissionscheme/{{scheme_id}}/permission", self.grant_permission),
+            web.get(ORG, self.org),
+            web.get(f"{ORG}/groups", self.org_groups),
+            web.post(f"{ORG}/users/{{account_id}}/manage/groups", self.manage_groups),
+        ])
+        return app
+
+    async def start(self, port: int = 0):
+        """Sobe o servidor em 127.0.0.1 (porta 0 = porta livre)"""
+        self.runner = web.AppRunner(self.build_app(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", port)
+        await site.start()
+        self.port = self.runner.addresses[0][1]
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    @web.middleware
+    async def _latency_middleware(self, request: web.Request, handler):
+        route = request.match_info.route.resource
+        self.requests[f"{request.method} {route.canonical if route else request.path}"] += 1
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await handler(request)
+
+    # --- JIRA ----------------------------------------------------------------
+
+    def _issue(self, key: str) -> Dict[str, Any]:
+        number = int(key.rsplit("-", 1)[-1]) if key.rsplit("-", 1)[-1].isdigit() else 1
+        return {
+            "id": str(10000 + number),
+            "key": key,
+            "fields": {
+                "summary": f"Issue {key}",
+                "status": {"name": "To Do" if number % 2 else "Done"},
+                "assignee": None,
+                "issuetype": {"name": "Task"},
+                "priority": {"name": "Medium"},
+                "created": "2024-01-01T10:00:00.000+0000",
+                "updated": "2024-01-02T10:00:00.000+0000",
+            },
+        }
+
+    async def myself(self, request: web.Request) -> web.Response:
+        return web.json_response({"accountId": "bench-admin", "displayName": "Benchmark Admin"})
+
+    async def server_info(self, request: web.Request) -> web.Response:
+        return web.json_response({"version": "1001.0.0", "deploymentType": "Cloud"})
+
+    async def user_search(self, request: web.Request) -> web.Response:
+        query = request.query.get("query", "").lower()
+        matches = [user for email, user in self.users.items() if query and query in email]
+        return web.json_response(matches[:50])
+
+    async def create_user(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        email = body["emailAddress"].lower()
+        user = {
+            "accountId": f"created-{len(self.users)}",
+            "displayName": body.get("displayName", email),
+            "emailAddress": email,
+            "active": True,
+        }
+        self.users[email] = user
+        return web.json_response(user, status=201)
+
+    async def projects(self, request: web.Request) -> web.Response:
+        return web.json_response([PROJECT])
+
+    async def project(self, request: web.Request) -> web.Response:
+        key = request.match_info["key"]
+        if key == PROJECT["key"]:
+            return web.json_response(PROJECT)
+        if key in self.project_keys:
+            return web.json_response({"id": key, "key": key, "name": key})
+        return web.json_response({"errorMessages": ["Projeto não encontrado"]}, status=404)
+
+    async def project_search(self, request: web.Request) -> web.Response:
+        start = int(request.query.get("startAt", 0))
+        size = int(request.query.get("maxResults", 50))
+        values = [{"id": key, "key": key, "name": key} for key in self.project_keys[start:start + size]]
+        return web.json_response({
+            "values": values,
+            "startAt": start,
+            "total": len(self.project_keys),
+            "isLast": start + size >= len(self.project_keys),
+        })
+
+    async def project_categories(self, request: web.Request) -> web.Response:
+        return web.json_response([CATEGORY])
+
+    async def project_roles(self, request: web.Request) -> web.Response:
+        key = request.match_info["key"]
+        base = f"{self.url}{JIRA}/project/{key}/role"
+        return web.json_response({name: f"{base}/{role_id}" for name, role_id in ROLES.items()})
+
+    async def role_actors(self, request: web.Request) -> web.Response:
+        await request.json()
+        return web.json_response({"id": int(request.match_info["role_id"]), "actors": []})
+
+    async def issue_types(self, request: web.Request) -> web.Response:
+        return web.json_response(ISSUE_TYPES)
+
+    async def create_issue(self, request: web.Request) -> web.Response:
+        await request.json()
+        issue_id = next(self.issue_ids)
+        key = f"{PROJECT['key']}-{issue_id}"
+        return web.json_response({"id": str(issue_id), "key": key, "self": f"{self.url}{JIRA}/issue/{key}"}, status=201)
+
+    async def create_issues_bulk(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        issues = []
+        for _ in body.get("issueUpdates", []):
+            issue_id = next(self.issue_ids)
+            issues.append({"id": str(issue_id), "key": f"{PROJECT['key']}-{issue_id}"})
+        return web.json_response({"issues": issues, "errors": []}, status=201)
+
+    async def get_issue(self, request: web.Request) -> web.Response:
+        return web.json_response(self._issue(request.match_info["key"]))
+
+    async def search_jql(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        start = int(body.get("nextPageToken") or 0)
+        size = min(int(body.get("maxResults", 50)), self.page_size)
+        total = 500
+        end = min(start + size, total)
+        issues = [self._issue(f"{PROJECT['key']}-{n}") for n in range(start + 1, end + 1)]
+        response: Dict[str, Any] = {"issues": issues, "isLast": end >= total}
+        if end < total:
+            response["nextPageToken"] = str(end)
+        return web.json_response(response)
+
+    async def approximate_count(self, request: web.Request) -> web.Response:
+        await request.json()
+        return web.json_response({"count": 500})
+
+    async def permission_schemes(self, request: web.Request) -> web.Response:
+        schemes = []
+        for i in range(20):
+            scheme = {"id": 10000 + i, "name": f"Scheme {i}", "description": ""}
+            if request.query.get("expand") == "permissions":
+                scheme["permissions"] = [
+                    {"id": i * 100 + j, "permission": permission,
+                     "holder": {"type": "group", "parameter": f"team-{(i + j) % 25}", "value": f"group-{(i + j) % 25}"}}
+                    for j, permission in enumerate(["BROWSE_PROJECTS", "CREATE_ISSUES", "EDIT_ISSUES", "ADMINISTER_PROJECTS"] * 5)
+                ]
+            schemes.append(scheme)
+        return web.json_response({"permissionSchemes": schemes})
+
+    async def grant_permission(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        return web.json_response({"id": next(self.issue_ids), **body}, status=201)
+
+    # --- Organizations API ---------------------------------------------------
+
+    async def org(self, request: web.Request) -> web.Response:
+        return web.json_response({"data": {"id": request.match_info["org_id"]}, "name": "Benchmark Org"})
+
+    async def org_groups(self, request: web.Request) -> web.Response:
+        start = int(request.query.get("cursor") or 0)
+        page = self.groups[start:start + self.page_size]
+        end = start + len(page)
+        links = {"self": str(start)}
+        if end < len(self.groups):
+            links["next"] = str(end)
+        return web.json_response({"data": page, "links": links})
+
+    async def manage_groups(self, request: web.Request) -> web.Response:
+        await request.json()
+        return web.Response(status=204)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Benchmarks offline das ferramentas MCP (SimpleJiraMCP e JiraAdminMCP)
+Sobe o servidor simulado local, executa cada ferramenta N vezes com a
+concorrência pedida e reporta percentis de latência, vazão e requisições
+ao upstream por chamada
+
+Uso:
+    python -m benchmarks.run_benchmarks --latency 0.02 --iterations 200 --concurrency 10
+    python -m benchmarks.run_benchmarks --output baseline.json
+    python -m benchmarks.run_benchmarks --baseline baseline.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.mock_atlassian import MockAtlassian  # noqa: E402
+
+ORG_ID = "bench-org"
+
+# (servidor, ferramenta, argumentos em função do índice da chamada)
+Scenario = Tuple[str, str, Callable[[int], Dict[str, Any]]]
+
+SCENARIOS: List[Scenario] = [
+    ("simple", "test_connection", lambda i: {}),
+    ("simple", "get_user_info", lambda i: {"username": f"user{i % 50}@example.com"}),
+    ("simple", "create_test_issue", lambda i: {"summary": f"Benchmark {i}", "description": "bench"}),
+    ("simple", "create_issues_bulk", lambda i: {"issues": [{"summary": f"Bulk {i}-{n}"} for n in range(20)]}),
+    ("simple", "search_issues", lambda i: {"jql": "project = SCRUM", "max_results": 200}),
+    ("simple", "get_issue", lambda i: {"key": f"SCRUM-{i % 100 + 1}"}),
+    ("simple", "count_issues", lambda i: {"project": "SCRUM"}),
+    ("admin", "create_users_bulk", lambda i: {"users": [{"email": f"new{i}-{n}@example.com"} for n in range(5)]}),
+    ("admin", "add_users_to_groups_bulk", lambda i: {
+        "users": [f"user{(i + n) % 200}@example.com" for n in range(5)],
+        "group_ids": ["group-1", "group-2"],
+    }),
+    ("admin", "assign_project_role", lambda i: {"project_key": f"P{i % 50}", "role_id": "10100", "group_name": "auditors"}),
+    ("admin", "assign_project_role_bulk", lambda i: {"role": "Auditors", "category": "Benchmark", "group_names": ["auditors"]}),
+    ("admin", "find_permission_grants", lambda i: {"permission": "BROWSE_PROJECTS", "holder_type": "group", "holder": f"team-{i % 25}"}),
+    ("admin", "get_holder_permissions", lambda i: {"holder_type": "group", "holder": f"group-{i % 25}"}),
+    ("admin", "list_org_groups", lambda i: {"name_filter": "team-1", "max_results": 500}),
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Percentil por interpolação linear (samples ordenados)"""
+    if not samples:
+        return 0.0
+    position = (len(samples) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+
+def is_error(result: Any) -> bool:
+    return isinstance(result, dict) and result.get("status") == "error"
+
+
+async def run_scenario(server: Any, mock: MockAtlassian, tool: str,
+                       make_args: Callable[[int], Dict[str, Any]],
+                       iterations: int, concurrency: int) -> Dict[str, Any]:
+    """Executa a ferramenta `iterations` vezes, no máximo `concurrency` por vez"""
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    upstream_before = mock.total_requests
+
+    async def call(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await server.dispatch(tool, make_args(i))
+                if is_error(result):
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(iterations)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "calls": iterations,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "throughput_per_s": round(iterations / elapsed, 1) if elapsed else 0.0,
+        "upstream_per_call": round((mock.total_requests - upstream_before) / iterations, 2),
+    }
+
+
+def configure_environment(mock: MockAtlassian, workdir: str):
+    """Aponta os servidores para o mock (antes de importar src)"""
+    os.environ.update({
+        "JIRA_URL": mock.url,
+        "JIRA_USERNAME": "bench@example.com",
+        "JIRA_API_TOKEN": "bench-token",
+        "ORG_ID": ORG_ID,
+        "ADMIN_API_KEY": "bench-key",
+        "ORG_API_URL": mock.url,
+        "ACTION_LOG_FILE": os.path.join(workdir, "bench_actions.jsonl"),
+        "MIRROR_PROJECTS": "",
+    })
+    # Os limites de taxa reais dominariam a medição; podem ser sobrescritos
+    # no ambiente para medir o comportamento com o limitador ativo
+    os.environ.setdefault("JIRA_RATE_LIMIT", "100000")
+    os.environ.setdefault("ORG_API_RATE_LIMIT", "100000")
+
+
+def print_report(results: Dict[str, Dict[str, Any]]):
+    header = f"{'ferramenta':<34}{'chamadas':>9}{'erros':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'req/s':>9}{'upstr/ch':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<34}{r['calls']:>9}{r['errors']:>7}{r['p50_ms']:>10}{r['p90_ms']:>10}"
+            f"{r['p99_ms']:>10}{r['max_ms']:>10}{r['throughput_per_s']:>9}{r['upstream_per_call']:>10}"
+        )
+
+
+def compare_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+                     tolerance: float) -> List[str]:
+    """Lista as regressões de p50/p99 acima da tolerância em relação à linha de base"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p99_ms", "upstream_per_call"):
+            before, after = previous.get(metric), current.get(metric)
+            if before and after is not None and after > before * (1 + tolerance):
+                regressions.append(f"{name} {metric}: {before} -> {after}")
+    return regressions
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks offline das ferramentas MCP do JIRA")
+    parser.add_argument("--latency", type=float, default=0.02, help="Latência simulada por requisição (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variação aleatória somada à latência (s)")
+    parser.add_argument("--iterations", type=int, default=100, help="Chamadas por ferramenta")
+    parser.add_argument("--concurrency", type=int, default=10, help="Chamadas simultâneas por ferramenta")
+    parser.add_argument("--only", nargs="*", help="Executar apenas estas ferramentas")
+    parser.add_argument("--output", help="Salvar os resultados em JSON")
+    parser.add_argument("--baseline", help="JSON de execução anterior para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Piora relativa aceita frente à linha de base")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    mock = MockAtlassian(latency=args.latency, jitter=args.jitter)
+    await mock.start()
+    workdir = tempfile.mkdtemp(prefix="jira-mcp-bench-")
+    configure_environment(mock, workdir)
+
+    from src.mcp_admin_server import JiraAdminMCP
+    from src.simple_mcp_server import SimpleJiraMCP
+
+    servers = {"simple": SimpleJiraMCP(), "admin": JiraAdminMCP()}
+    # Mantém o nível de log baixo mesmo após o basicConfig dos servidores
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for server_name, tool, make_args in SCENARIOS:
+            if args.only and tool not in args.only:
+                continue
+            results[f"{server_name}.{tool}"] = await run_scenario(
+                servers[server_name], mock, tool, make_args,
+                args.iterations, max(1, args.concurrency)
+            )
+    finally:
+        await servers["simple"].action_writer.aclose()
+        await servers["simple"].http.aclose()
+        await servers["admin"].http.aclose()
+        await mock.stop()
+        # Diretório temporário com o log de ações da execução
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\nLatência simulada: {args.latency * 1000:.0f} ms, {args.iterations} chamadas, concorrência {args.concurrency}\n")
+    print_report(results)
+
+    report = {
+        "config": {
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nResultados salvos em {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressões acima de {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nSem regressões acima de {args.tolerance:.0%} frente a {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
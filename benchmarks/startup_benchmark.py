@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização dos servidores MCP via stdio
+Mede, a partir do spawn do processo, o tempo até a resposta do initialize
+e até a primeira resposta de list_tools, que é quanto um cliente espera
+antes de o agente poder chamar qualquer ferramenta
+
+Uso:
+    python -m benchmarks.startup_benchmark --runs 10
+    python -m benchmarks.startup_benchmark --output startup.json
+    python -m benchmarks.startup_benchmark --baseline startup.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from mcp import ClientSession, StdioServerParameters  # noqa: E402
+from mcp.client.stdio import stdio_client  # noqa: E402
+
+from benchmarks.run_benchmarks import compare_baseline, percentile  # noqa: E402
+
+SERVERS = {
+    "simple": "src.simple_mcp_server",
+    "admin": "src.mcp_admin_server",
+}
+
+
+def server_environment() -> Dict[str, str]:
+    """Ambiente mínimo: nenhuma chamada ao upstream acontece até list_tools"""
+    env = dict(os.environ)
+    env.update({
+        "JIRA_URL": env.get("JIRA_URL") or "http://127.0.0.1:9",
+        "JIRA_USERNAME": env.get("JIRA_USERNAME") or "bench@example.com",
+        "JIRA_API_TOKEN": env.get("JIRA_API_TOKEN") or "bench-token",
+        "ORG_ID": env.get("ORG_ID") or "bench-org",
+        "MCP_TRANSPORT": "stdio",
+        "METRICS_PORT": "",
+        "MIRROR_PROJECTS": "",
+        "TRACE_EXPORTER": "none",
+        "PYTHONPATH": str(ROOT),
+    })
+    return env
+
+
+async def measure_once(module: str, env: Dict[str, str]) -> Dict[str, float]:
+    """Um spawn: segundos até initialize e até a primeira lista de ferramentas"""
+    params = StdioServerParameters(command=sys.executable, args=["-m", module], env=env, cwd=str(ROOT))
+    with open(os.devnull, "w") as devnull:
+        started = time.perf_counter()
+        async with stdio_client(params, errlog=devnull) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                initialized = time.perf_counter() - started
+                tools = await session.list_tools()
+                listed = time.perf_counter() - started
+    return {"initialize": initialized, "list_tools": listed, "tools": len(tools.tools)}
+
+
+async def run_server(module: str, runs: int, warmup: int) -> Dict[str, Any]:
+    env = server_environment()
+    # Os primeiros spawns pagam a compilação do bytecode e o cache de disco frio
+    for _ in range(warmup):
+        await measure_once(module, env)
+
+    samples = [await measure_once(module, env) for _ in range(runs)]
+    initialize = sorted(sample["initialize"] for sample in samples)
+    listed = sorted(sample["list_tools"] for sample in samples)
+    return {
+        "runs": runs,
+        "tools": samples[-1]["tools"],
+        "initialize_p50_ms": round(percentile(initialize, 50) * 1000, 1),
+        "p50_ms": round(percentile(listed, 50) * 1000, 1),
+        "p90_ms": round(percentile(listed, 90) * 1000, 1),
+        "p99_ms": round(percentile(listed, 99) * 1000, 1),
+        "max_ms": round(listed[-1] * 1000, 1),
+        "mean_ms": round(statistics.fmean(listed) * 1000, 1),
+    }
+
+
+def print_report(results: Dict[str, Dict[str, Any]]):
+    header = f"{'servidor':<18}{'spawns':>8}{'init p50':>11}{'tools p50':>11}{'tools p90':>11}{'max ms':>10}{'ferram.':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<18}{r['runs']:>8}{r['initialize_p50_ms']:>11}{r['p50_ms']:>11}"
+            f"{r['p90_ms']:>11}{r['max_ms']:>10}{r['tools']:>9}"
+        )
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tempo até o primeiro list_tools dos servidores MCP (stdio)")
+    parser.add_argument("--runs", type=int, default=10, help="Spawns medidos por servidor")
+    parser.add_argument("--warmup", type=int, default=1, help="Spawns descartados antes da medição")
+    parser.add_argument("--only", nargs="*", choices=sorted(SERVERS), help="Servidores a medir")
+    parser.add_argument("--output", help="Salvar os resultados em JSON")
+    parser.add_argument("--baseline", help="JSON de execução anterior para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Piora relativa aceita frente à linha de base")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, module in SERVERS.items():
+        if args.only and name not in args.only:
+            continue
+        results[f"startup.{name}"] = await run_server(module, max(1, args.runs), max(0, args.warmup))
+
+    print(f"\nTempo desde o spawn (ms), {args.runs} spawns por servidor\n")
+    print_report(results)
+
+    report = {"config": {"runs": args.runs, "warmup": args.warmup, "python": sys.version.split()[0]},
+              "results": results}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nResultados salvos em {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressões acima de {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nSem regressões acima de {args.tolerance:.0%} frente a {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -5,14 +5,13 @@ Servidor MCP personalizado para operações administrativas do JIRA
 """
 
 import asyncio
-import json
 import logging
 import os
+import sys
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 
-import httpx
-from mcp.server import Server
+from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -24,10 +23,24 @@ from mcp.types import (
     TextContent,
 )
 
+from src.tools.jira_admin_tools import JiraAdminTools
+from src.utils.http_client import JiraHttpClient
+from src.utils.mcp_transport import transport_from_env
+from src.utils.metrics import REGISTRY, is_error_result, track_tool
+from src.utils.prefork import run_prefork, workers_from_env
+from src.utils.result_shaper import CONTINUE_TOOL, CONTINUE_TOOL_SCHEMA, ResultShaper
+from src.utils.serialization import FIELDS_SCHEMA, make_encoder, project_fields
+from src.utils.tracing import get_tracer
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Ferramentas de leitura com projeção genérica (`fields`) antes da serialização
+FIELD_PROJECTION_TOOLS = {
+    "find_permission_grants", "get_holder_permissions", "list_org_groups", "list_permission_schemes"
+}
+
 class JiraAdminMCP:
     def __init__(self):
         self.jira_url = os.getenv("JIRA_URL")
@@ -45,6 +58,27 @@ class JiraAdminMCP:
             logger.error(f"Variáveis de ambiente obrigatórias não configuradas: {missing_vars}")
             raise ValueError(f"Variáveis de ambiente obrigatórias não configuradas: {missing_vars}")
         
+        # Cliente HTTP compartilhado (pool keep-alive)
+        self.http = JiraHttpClient(
+            self.jira_url, self.jira_username, self.jira_api_token,
+            admin_api_key=self.admin_api_key
+        )
+        
+        # Ferramentas administrativas sobre o mesmo pool HTTP
+        self.tools = JiraAdminTools(
+            self.jira_url, self.jira_username, self.jira_api_token,
+            self.org_id, self.admin_api_key, http=self.http
+        )
+        
+        # Caches expostos em /metrics (taxa de acerto)
+        REGISTRY.register_cache("admin_users", self.tools.users.cache)
+        REGISTRY.register_cache("project_roles", self.tools.role_cache)
+        
+        # Serialização dos resultados (compacta por padrão, orjson se instalado)
+        self.encode_result = make_encoder()
+        # Orçamento de bytes por resposta; o restante fica para continue_result
+        self.shaper = ResultShaper("admin", self.encode_result)
+        
         self.server = Server("jira-admin-mcp")
         self._setup_handlers()
     
@@ -108,6 +142,137 @@ class JiraAdminMCP:
                             },
                             "required": ["scheme_id", "permission", "holder_type", "holder_parameter"]
                         }
+                    ),
+                    Tool(
+                        name="create_users_bulk",
+                        description="Criar vários usuários no JIRA em paralelo, ignorando os que já existem",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "users": {
+                                    "type": "array",
+                                    "description": "Usuários a criar",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "email": {"type": "string", "description": "Email do usuário"},
+                                            "display_name": {"type": "string", "description": "Nome de exibição"},
+                                            "products": {"type": "array", "items": {"type": "string"}, "description": "Produtos para dar acesso"}
+                                        },
+                                        "required": ["email"]
+                                    }
+                                },
+                                "products": {"type": "array", "items": {"type": "string"}, "description": "Produtos padrão para todos os usuários"},
+                                "concurrency": {"type": "integer", "description": "Máximo de criações simultâneas"}
+                            },
+                            "required": ["users"]
+                        }
+                    ),
+                    Tool(
+                        name="add_users_to_groups_bulk",
+                        description="Adicionar vários usuários a vários grupos (uma requisição por usuário, em paralelo)",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "users": {"type": "array", "items": {"type": "string"}, "description": "accountIds ou emails (combinados com group_ids)"},
+                                "group_ids": {"type": "array", "items": {"type": "string"}, "description": "IDs dos grupos aplicados a todos os users"},
+                                "memberships": {
+                                    "type": "array",
+                                    "description": "Associações individuais (alternativa/complemento a users x group_ids)",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "user": {"type": "string", "description": "accountId ou email"},
+                                            "group_ids": {"type": "array", "items": {"type": "string"}}
+                                        },
+                                        "required": ["user", "group_ids"]
+                                    }
+                                },
+                                "concurrency": {"type": "integer", "description": "Máximo de requisições simultâneas"}
+                            }
+                        }
+                    ),
+                    Tool(
+                        name="assign_project_role_bulk",
+                        description="Adicionar usuários/grupos a um papel em vários projetos (lista de chaves ou categoria), em paralelo",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "role": {"type": "string", "description": "Nome (ex: Administrators) ou ID do papel"},
+                                "project_keys": {"type": "array", "items": {"type": "string"}, "description": "Chaves dos projetos"},
+                                "category": {"type": "string", "description": "ID ou nome da categoria de projetos"},
+                                "account_ids": {"type": "array", "items": {"type": "string"}, "description": "IDs das contas de usuários"},
+                                "group_names": {"type": "array", "items": {"type": "string"}, "description": "Nomes dos grupos"},
+                                "concurrency": {"type": "integer", "description": "Máximo de projetos processados em paralelo"}
+                            },
+                            "required": ["role"]
+                        }
+                    ),
+                    Tool(
+                        name="find_permission_grants",
+                        description="Listar os esquemas de permissões que concedem uma permissão (opcionalmente a um detentor)",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "permission": {"type": "string", "description": "Chave da permissão (ex: BROWSE_PROJECTS)"},
+                                "holder_type": {"type": "string", "description": "Tipo do detentor (group, user, projectRole, ...)"},
+                                "holder": {"type": "string", "description": "Nome/ID do grupo, account_id ou ID do papel"},
+                                "fields": FIELDS_SCHEMA
+                            },
+                            "required": ["permission"]
+                        }
+                    ),
+                    Tool(
+                        name="get_holder_permissions",
+                        description="Listar as permissões concedidas a um grupo/usuário/papel em cada esquema",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "holder_type": {"type": "string", "description": "Tipo do detentor (group, user, projectRole, anyone, ...)"},
+                                "holder": {"type": "string", "description": "Nome/ID do grupo, account_id ou ID do papel"},
+                                "fields": FIELDS_SCHEMA
+                            },
+                            "required": ["holder_type"]
+                        }
+                    ),
+                    Tool(
+                        name="list_org_groups",
+                        description="Listar grupos da organização (todas as páginas), com filtro por nome",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "name_filter": {"type": "string", "description": "Trecho do nome do grupo"},
+                                "max_results": {"type": "integer", "description": "Máximo de grupos retornados (padrão: 500)"},
+                                "fields": FIELDS_SCHEMA
+                            }
+                        }
+                    ),
+                    Tool(
+                        name="list_permission_schemes",
+                        description="Listar esquemas de permissões (com expand=permissions, inclui as concessões de cada esquema)",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "expand": {"type": "string", "description": "Expansões da API (ex: permissions, user, group, all)"},
+                                "fields": FIELDS_SCHEMA
+                            }
+                        }
+                    ),
+                    Tool(
+                        name="list_project_roles",
+                        description="Listar papéis disponíveis em um projeto",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "project_key": {"type": "string", "description": "Chave do projeto"}
+                            },
+                            "required": ["project_key"]
+                        }
+                    ),
+                    Tool(
+                        name=CONTINUE_TOOL,
+                        description="Buscar o próximo trecho de um resultado truncado pelo limite de tamanho (campo continuation.handle)",
+                        inputSchema=CONTINUE_TOOL_SCHEMA
                     )
                 ]
             )
@@ -116,19 +281,12 @@ class JiraAdminMCP:
         async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
             """Executa uma ferramenta específica"""
             try:
-                if name == "create_user":
-                    result = await self._create_user(arguments)
-                elif name == "add_user_to_group":
-                    result = await self._add_user_to_group(arguments)
-                elif name == "assign_project_role":
-                    result = await self._assign_project_role(arguments)
-                elif name == "grant_permission":
-                    result = await self._grant_permission(arguments)
-                else:
-                    raise ValueError(f"Ferramenta desconhecida: {name}")
+                result = await self.dispatch(name, arguments)
+                if name in FIELD_PROJECTION_TOOLS:
+                    result = project_fields(result, (arguments or {}).get("fields"))
                 
                 return CallToolResult(
-                    content=[TextContent(type="text", text=json.dumps(result, indent=2))]
+                    content=[TextContent(type="text", text=self.shaper.render(name, result))]
                 )
             except Exception as e:
                 logger.error(f"Erro ao executar ferramenta {name}: {e}")
@@ -136,48 +294,66 @@ class JiraAdminMCP:
                     content=[TextContent(type="text", text=f"Erro: {str(e)}")]
                 )
     
+    async def dispatch(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Executa a ferramenta pelo nome e retorna o resultado (instrumentado)"""
+        async with get_tracer().tool_span("admin", name) as span:
+            with track_tool("admin", name) as call:
+                call["result"] = await self._call_tool(name, arguments)
+            if span is not None and is_error_result(call["result"]):
+                span.fail(call["result"].get("message", "erro"))
+            return call["result"]
+    
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Despacha para o método da ferramenta"""
+        if name == "create_user":
+            return await self._create_user(arguments)
+        elif name == "add_user_to_group":
+            return await self._add_user_to_group(arguments)
+        elif name == "assign_project_role":
+            return await self._assign_project_role(arguments)
+        elif name == "grant_permission":
+            return await self._grant_permission(arguments)
+        elif name == "create_users_bulk":
+            return await self._create_users_bulk(arguments)
+        elif name == "add_users_to_groups_bulk":
+            return await self._add_users_to_groups_bulk(arguments)
+        elif name == "assign_project_role_bulk":
+            return await self._assign_project_role_bulk(arguments)
+        elif name == "find_permission_grants":
+            return await self._find_permission_grants(arguments)
+        elif name == "get_holder_permissions":
+            return await self._get_holder_permissions(arguments)
+        elif name == "list_org_groups":
+            return await self._list_org_groups(arguments)
+        elif name == "list_permission_schemes":
+            return await self.tools.list_permission_schemes(expand=(arguments or {}).get("expand"))
+        elif name == "list_project_roles":
+            return await self.tools.list_project_roles(arguments["project_key"])
+        elif name == CONTINUE_TOOL:
+            return self.shaper.continue_result((arguments or {}).get("handle"))
+        else:
+            raise ValueError(f"Ferramenta desconhecida: {name}")
+    
     async def _create_user(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """Criar novo usuário no JIRA"""
-        url = urljoin(self.jira_url, "/rest/api/3/user")
-        
-        payload = {
-            "emailAddress": args["email"],
-            "products": args.get("products", [])
-        }
-        
-        if "display_name" in args:
-            payload["displayName"] = args["display_name"]
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=payload,
-                auth=(self.jira_username, self.jira_api_token),
-                headers={"Content-Type": "application/json"}
-            )
-            response.raise_for_status()
-            return response.json()
+        """Criar novo usuário no JIRA (atualiza o cache de usuários compartilhado)"""
+        return await self.tools.create_user_invitation(
+            args["email"],
+            display_name=args.get("display_name"),
+            products=args.get("products", [])
+        )
     
     async def _add_user_to_group(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Adicionar usuário a grupo via Organizations API"""
         # Esta implementação usa a Organizations API da Atlassian
-        url = f"https://api.atlassian.com/admin/v1/orgs/{self.org_id}/users/{args['account_id']}/manage/groups"
+        url = self.http.org_api(self.org_id, f"users/{args['account_id']}/manage/groups")
         
         payload = {
             "groupIds": [args["group_name"]]  # Assumindo que group_name é o ID do grupo
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {self.admin_api_key}",
-                    "Content-Type": "application/json"
-                }
-            )
-            response.raise_for_status()
-            return {"status": "success", "message": f"Usuário adicionado ao grupo {args['group_name']}"}
+        response = await self.http.post(url, json=payload, api="org")
+        response.raise_for_status()
+        return {"status": "success", "message": f"Usuário adicionado ao grupo {args['group_name']}"}
     
     async def _assign_project_role(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Atribuir usuário/grupo a papel do projeto"""
@@ -193,15 +369,9 @@ class JiraAdminMCP:
         
         payload = {"categorisedActors": categorised_actors}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                url,
-                json=payload,
-                auth=(self.jira_username, self.jira_api_token),
-                headers={"Content-Type": "application/json"}
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self.http.put(url, json=payload)
+        response.raise_for_status()
+        return response.json()
     
     async def _grant_permission(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Conceder permissão em esquema de permissões"""
@@ -215,31 +385,149 @@ class JiraAdminMCP:
             "permission": args["permission"]
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=payload,
-                auth=(self.jira_username, self.jira_api_token),
-                headers={"Content-Type": "application/json"}
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self.http.post(url, json=payload)
+        response.raise_for_status()
+        self.tools.permissions.invalidate()
+        return response.json()
+    
+    async def _create_users_bulk(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Criar vários usuários com concorrência limitada"""
+        results = await self.tools.create_users_bulk(
+            args["users"],
+            concurrency=args.get("concurrency"),
+            default_products=args.get("products")
+        )
+        
+        summary = {"created": 0, "exists": 0, "error": 0}
+        for result in results:
+            summary[result["status"]] += 1
+        
+        return {"summary": summary, "results": results}
+    
+    async def _add_users_to_groups_bulk(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Adicionar usuários a grupos em lote via Organizations API"""
+        memberships: Dict[str, List[str]] = {}
+        for user in args.get("users", []):
+            memberships.setdefault(user, []).extend(args.get("group_ids", []))
+        for item in args.get("memberships", []):
+            memberships.setdefault(item["user"], []).extend(item["group_ids"])
+        
+        if not memberships:
+            raise ValueError("Informe users + group_ids ou memberships")
+        
+        results = await self.tools.add_users_to_groups_bulk(
+            memberships, concurrency=args.get("concurrency")
+        )
+        
+        failed = [r for r in results if r["status"] == "error"]
+        return {
+            "summary": {
+                "requests": len(results),
+                "memberships": sum(len(r["group_ids"]) for r in results),
+                "succeeded": len(results) - len(failed),
+                "failed": len(failed)
+            },
+            "results": results
+        }
+    
+    async def _assign_project_role_bulk(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Atribuir papel em vários projetos"""
+        results = await self.tools.assign_project_role_bulk(
+            args["role"],
+            project_keys=args.get("project_keys"),
+            category=args.get("category"),
+            account_ids=args.get("account_ids"),
+            group_names=args.get("group_names"),
+            concurrency=args.get("concurrency")
+        )
+        
+        failed = [r for r in results if r["status"] == "error"]
+        return {
+            "summary": {
+                "projects": len(results),
+                "succeeded": len(results) - len(failed),
+                "failed": len(failed)
+            },
+            "results": results
+        }
+    
+    async def _find_permission_grants(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Consultar o índice de permissões por permissão"""
+        schemes = await self.tools.permissions.schemes_granting(
+            args["permission"],
+            holder_type=args.get("holder_type"),
+            holder=args.get("holder")
+        )
+        return {"permission": args["permission"], "count": len(schemes), "schemes": schemes}
+    
+    async def _get_holder_permissions(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Consultar o índice de permissões por detentor"""
+        schemes = await self.tools.permissions.holder_permissions(
+            args["holder_type"], args.get("holder")
+        )
+        return {
+            "holder_type": args["holder_type"],
+            "holder": args.get("holder"),
+            "count": len(schemes),
+            "schemes": schemes
+        }
+    
+    async def _list_org_groups(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Listar grupos da organização até o limite pedido"""
+        max_results = max(1, int(args.get("max_results") or 500))
+        groups: List[Dict[str, Any]] = []
+        truncated = False
+        
+        iterator = self.tools.get_groups_for_org(name_filter=args.get("name_filter"))
+        try:
+            async for group in iterator:
+                if len(groups) >= max_results:
+                    truncated = True
+                    break
+                groups.append({"id": group.get("id"), "name": group.get("name")})
+        finally:
+            await iterator.aclose()
+        
+        return {"count": len(groups), "truncated": truncated, "groups": groups}
     
     async def run(self):
         """Executar o servidor MCP"""
         logger.info(f"Iniciando servidor MCP Admin na porta {self.port}")
         
-        # Para este exemplo, usamos stdio_server
-        # Em produção, você pode querer usar um servidor HTTP
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="jira-admin-mcp",
-                    server_version="1.0.0",
-                ),
-            )
+        # MCP_TRANSPORT=http: várias sessões de clientes no mesmo processo
+        # (pool HTTP e caches compartilhados); padrão: stdio, um cliente por processo
+        # health_check (aiohttp) e o transporte HTTP são importados só quando usados
+        metrics_runner = None
+        try:
+            if transport_from_env() == "http":
+                from src.utils.health_check import HealthChecker
+                from src.utils.mcp_transport import serve_http
+                
+                await serve_http(self.server, self.port, health_checker=HealthChecker(http=self.http))
+            else:
+                # /health e /metrics no mesmo processo, se METRICS_PORT estiver definido
+                if os.getenv("METRICS_PORT"):
+                    from src.utils.health_check import HealthChecker, start_health_server
+                    
+                    metrics_runner = await start_health_server(
+                        int(os.getenv("METRICS_PORT")), HealthChecker(http=self.http)
+                    )
+                
+                async with stdio_server() as (read_stream, write_stream):
+                    await self.server.run(
+                        read_stream,
+                        write_stream,
+                        InitializationOptions(
+                            server_name="jira-admin-mcp",
+                            server_version="1.0.0",
+                            capabilities=self.server.get_capabilities(NotificationOptions(), {}),
+                        ),
+                    )
+        finally:
+            if metrics_runner is not None:
+                await metrics_runner.cleanup()
+            await get_tracer().aclose()
+            await self.http.aclose()
 
 async def main():
     """Função principal"""
@@ -251,4 +539,12 @@ async def main():
         raise
 
 if __name__ == "__main__":
+    # --profile-startup: tempos de importação, construção e primeiro list_tools
+    from src.utils.startup_profile import run_cli
+    if run_cli("src.mcp_admin_server", JiraAdminMCP):
+        sys.exit(0)
+    
+    # MCP_WORKERS > 1 no transporte HTTP: um processo por worker na mesma porta
+    if transport_from_env() == "http" and workers_from_env() > 1:
+        sys.exit(run_prefork(main))
     asyncio.run(main())
\ No newline at end of file
@@ -4,23 +4,34 @@ Servidor MCP simples para JIRA Admin
 """
 
 import asyncio
-import json
 import logging
 import os
-from typing import Any, Dict, List
+import sys
+from typing import Any, Dict, List, Optional
 
 import httpx
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
-    CallToolRequest,
     CallToolResult,
-    ListToolsRequest,
     ListToolsResult,
     Tool,
     TextContent,
 )
 
+from src.sync.issue_mirror import MIRROR_FIELDS, IssueMirror, MirrorSyncer
+from src.tools.jira_search import iter_issue_pages, jql_string, project_issue
+from src.tools.user_resolver import UserResolver
+from src.utils.action_log import ActionLog, ActionLogWriter
+from src.utils.cache import make_cache
+from src.utils.http_client import JiraHttpClient
+from src.utils.mcp_transport import transport_from_env
+from src.utils.metrics import REGISTRY, is_error_result, track_tool
+from src.utils.prefork import is_primary_worker, run_prefork, workers_from_env
+from src.utils.result_shaper import CONTINUE_TOOL, CONTINUE_TOOL_SCHEMA, ResultShaper
+from src.utils.serialization import FIELDS_SCHEMA, make_encoder, project_fields
+from src.utils.tracing import get_tracer
+
 # Carregar variáveis de ambiente do arquivo .env
 try:
     from dotenv import load_dotenv
@@ -34,6 +45,19 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Limite de issues por requisição do endpoint /issue/bulk do JIRA
+BULK_CREATE_BATCH_SIZE = 50
+
+# Limite rígido de issues retornados por search_issues
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", 1000))
+
+# Idade máxima (segundos) do espelho local para responder leituras
+MIRROR_MAX_STALENESS = float(os.getenv("MIRROR_MAX_STALENESS", 300))
+
+# Ferramentas de leitura com projeção genérica (`fields`) antes da serialização;
+# search_issues trata `fields` na própria busca
+FIELD_PROJECTION_TOOLS = {"get_user_info", "get_issue", "search_mirror"}
+
 class SimpleJiraMCP:
     def __init__(self):
         # Configurações do JIRA
@@ -42,6 +66,39 @@ class SimpleJiraMCP:
         self.jira_api_token = os.getenv("JIRA_API_TOKEN", "")
         self.org_id = os.getenv("ORG_ID", "")
         
+        # Cliente HTTP compartilhado (pool keep-alive)
+        self.http = JiraHttpClient(self.jira_url, self.jira_username, self.jira_api_token)
+        
+        # Resolução de usuários com cache (compartilhada pelas ferramentas)
+        self.users = UserResolver(self.http)
+        
+        # Cache de metadados (projeto e tipo de issue) usado por create_test_issue
+        self.metadata_cache = make_cache(
+            "metadata",
+            maxsize=int(os.getenv("METADATA_CACHE_SIZE", 128)),
+            ttl=float(os.getenv("METADATA_CACHE_TTL", 300))
+        )
+        
+        # Caches expostos em /metrics (taxa de acerto)
+        REGISTRY.register_cache("metadata", self.metadata_cache)
+        REGISTRY.register_cache("simple_users", self.users.cache)
+        
+        # Log local de ações (JSONL, apenas acréscimo) gravado em segundo plano
+        self.action_log = ActionLog()
+        self.action_writer = ActionLogWriter(self.action_log)
+        
+        # Espelho SQLite opcional dos projetos em MIRROR_PROJECTS
+        self.mirror: Optional[IssueMirror] = None
+        self.mirror_syncer: Optional[MirrorSyncer] = None
+        if os.getenv("MIRROR_PROJECTS"):
+            self.mirror = IssueMirror()
+            self.mirror_syncer = MirrorSyncer(self.http, self.mirror)
+        
+        # Serialização dos resultados (compacta por padrão, orjson se instalado)
+        self.encode_result = make_encoder()
+        # Orçamento de bytes por resposta; o restante fica para continue_result
+        self.shaper = ResultShaper("simple", self.encode_result)
+        
         # Servidor MCP
         self.server = Server("jira-admin-mcp")
         self._setup_handlers()
@@ -74,7 +131,8 @@ class SimpleJiraMCP:
                                 "username": {
                                     "type": "string",
                                     "description": "Nome de usuário ou email"
-                                }
+                                },
+                                "fields": FIELDS_SCHEMA
                             },
                             "required": ["username"]
                         }
@@ -97,57 +155,212 @@ class SimpleJiraMCP:
                             },
                             "required": ["summary"]
                         }
+                    ),
+                    Tool(
+                        name="create_issues_bulk",
+                        description="Cria vários issues no JIRA de uma vez (endpoint bulk, lotes de 50)",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "issues": {
+                                    "type": "array",
+                                    "description": "Lista de issues a criar",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "summary": {
+                                                "type": "string",
+                                                "description": "Título/resumo do issue"
+                                            },
+                                            "description": {
+                                                "type": "string",
+                                                "description": "Descrição detalhada do issue"
+                                            }
+                                        },
+                                        "required": ["summary"]
+                                    }
+                                }
+                            },
+                            "required": ["issues"]
+                        }
+                    ),
+                    Tool(
+                        name="search_issues",
+                        description="Busca issues por JQL, com paginação e projeção de campos",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "jql": {
+                                    "type": "string",
+                                    "description": "Consulta JQL (ex: project = SCRUM AND status = 'To Do')"
+                                },
+                                "fields": {
+                                    "type": "array",
+                                    "items": {"type": "string"},
+                                    "description": "Campos a retornar (padrão: summary, status, assignee, issuetype, updated); aceita caminhos com ponto (ex: status.name)"
+                                },
+                                "max_results": {
+                                    "type": "integer",
+                                    "description": f"Número máximo de issues (limite: {SEARCH_MAX_RESULTS})",
+                                    "default": 50
+                                }
+                            },
+                            "required": ["jql"]
+                        }
+                    ),
+                    Tool(
+                        name="get_issue",
+                        description="Obtém um issue pela chave (usa o espelho local quando atualizado)",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "key": {
+                                    "type": "string",
+                                    "description": "Chave do issue (ex: SCRUM-40)"
+                                },
+                                "max_staleness": {
+                                    "type": "number",
+                                    "description": "Idade máxima aceitável do espelho, em segundos"
+                                },
+                                "fields": FIELDS_SCHEMA
+                            },
+                            "required": ["key"]
+                        }
+                    ),
+                    Tool(
+                        name="count_issues",
+                        description="Conta issues de um projeto, opcionalmente por status (usa o espelho local quando atualizado)",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "project": {
+                                    "type": "string",
+                                    "description": "Chave do projeto"
+                                },
+                                "status": {
+                                    "type": "string",
+                                    "description": "Nome do status (opcional)"
+                                },
+                                "max_staleness": {
+                                    "type": "number",
+                                    "description": "Idade máxima aceitável do espelho, em segundos"
+                                }
+                            },
+                            "required": ["project"]
+                        }
+                    ),
+                    Tool(
+                        name="search_mirror",
+                        description="Busca issues no espelho local por projeto, status, responsável ou texto do resumo",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "project": {
+                                    "type": "string",
+                                    "description": "Chave do projeto espelhado"
+                                },
+                                "status": {
+                                    "type": "string",
+                                    "description": "Nome do status"
+                                },
+                                "assignee": {
+                                    "type": "string",
+                                    "description": "accountId ou nome de exibição do responsável"
+                                },
+                                "text": {
+                                    "type": "string",
+                                    "description": "Trecho do resumo"
+                                },
+                                "limit": {
+                                    "type": "integer",
+                                    "description": "Número máximo de issues",
+                                    "default": 50
+                                },
+                                "fields": FIELDS_SCHEMA
+                            },
+                            "required": ["project"]
+                        }
+                    ),
+                    Tool(
+                        name=CONTINUE_TOOL,
+                        description="Buscar o próximo trecho de um resultado truncado pelo limite de tamanho (campo continuation.handle)",
+                        inputSchema=CONTINUE_TOOL_SCHEMA
                     )
                 ]
             )
 
         @self.server.call_tool()
-        async def handle_call_tool(request: CallToolRequest) -> CallToolResult:
+        async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
             """Executa uma ferramenta"""
             try:
-                if request.name == "test_connection":
-                    result = await self._test_connection()
-                elif request.name == "get_user_info":
-                    result = await self._get_user_info(request.arguments)
-                elif request.name == "create_test_issue":
-                    result = await self._create_test_issue(request.arguments)
-                else:
-                    raise ValueError(f"Ferramenta desconhecida: {request.name}")
+                result = await self.dispatch(name, arguments)
+                if name in FIELD_PROJECTION_TOOLS:
+                    result = project_fields(result, (arguments or {}).get("fields"))
                 
                 return CallToolResult(
-                    content=[TextContent(type="text", text=json.dumps(result, indent=2))]
+                    content=[TextContent(type="text", text=self.shaper.render(name, result))]
                 )
             except Exception as e:
-                logger.error(f"Erro ao executar ferramenta {request.name}: {e}")
+                logger.error(f"Erro ao executar ferramenta {name}: {e}")
                 return CallToolResult(
                     content=[TextContent(type="text", text=f"Erro: {str(e)}")],
                     isError=True
                 )
 
+    async def dispatch(self, name: str, arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Executa a ferramenta pelo nome e retorna o resultado (instrumentado)"""
+        async with get_tracer().tool_span("simple", name) as span:
+            with track_tool("simple", name) as call:
+                call["result"] = await self._call_tool(name, arguments)
+            if span is not None and is_error_result(call["result"]):
+                span.fail(call["result"].get("message", "erro"))
+            return call["result"]
+
+    async def _call_tool(self, name: str, arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Despacha para o método da ferramenta"""
+        if name == "test_connection":
+            return await self._test_connection()
+        elif name == "get_user_info":
+            return await self._get_user_info(arguments)
+        elif name == "create_test_issue":
+            return await self._create_test_issue(arguments)
+        elif name == "create_issues_bulk":
+            return await self._create_issues_bulk(arguments)
+        elif name == "search_issues":
+            return await self._search_issues(arguments)
+        elif name == "get_issue":
+            return await self._get_issue(arguments)
+        elif name == "count_issues":
+            return await self._count_issues(arguments)
+        elif name == "search_mirror":
+            return await self._search_mirror(arguments)
+        elif name == CONTINUE_TOOL:
+            return self.shaper.continue_result((arguments or {}).get("handle"))
+        else:
+            raise ValueError(f"Ferramenta desconhecida: {name}")
+
     async def _test_connection(self) -> Dict[str, Any]:
         """Testa a conexão com o JIRA"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.jira_url}/rest/api/3/myself",
-                    auth=(self.jira_username, self.jira_api_token),
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    user_data = response.json()
-                    return {
-                        "status": "success",
-                        "message": "Conexão com JIRA estabelecida com sucesso",
-                        "user": user_data.get("displayName", "Usuário"),
-                        "account_id": user_data.get("accountId", "")
-                    }
-                else:
-                    return {
-                        "status": "error",
-                        "message": f"Erro na conexão: {response.status_code}",
-                        "details": response.text
-                    }
+            response = await self.http.get(
+                f"{self.jira_url}/rest/api/3/myself",
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                user_data = response.json()
+                return {
+                    "status": "success",
+                    "message": "Conexão com JIRA estabelecida com sucesso",
+                    "user": user_data.get("displayName", "Usuário"),
+                    "account_id": user_data.get("accountId", "")
+                }
+            else:
+                return {
+                    "status": "error",
+                    "message": f"Erro na conexão: {response.status_code}",
+                    "details": response.text
+                }
         except Exception as e:
             return {
                 "status": "error",
@@ -159,45 +372,180 @@ class SimpleJiraMCP:
         username = args.get("username", "")
         
         try:
-            async with httpx.AsyncClient() as client:
-                # Buscar usuário
-                response = await client.get(
-                    f"{self.jira_url}/rest/api/3/user/search",
-                    params={"query": username},
-                    auth=(self.jira_username, self.jira_api_token),
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    users = response.json()
-                    if users:
-                        user = users[0]
-                        return {
-                            "status": "success",
-                            "user": {
-                                "accountId": user.get("accountId", ""),
-                                "displayName": user.get("displayName", ""),
-                                "emailAddress": user.get("emailAddress", ""),
-                                "active": user.get("active", False)
-                            }
-                        }
-                    else:
-                        return {
-                            "status": "not_found",
-                            "message": f"Usuário '{username}' não encontrado"
-                        }
-                else:
-                    return {
-                        "status": "error",
-                        "message": f"Erro na busca: {response.status_code}",
-                        "details": response.text
+            # Buscar usuário (cache compartilhado, inclusive para buscas sem resultado)
+            users = await self.users.search(username)
+            
+            if users:
+                user = users[0]
+                return {
+                    "status": "success",
+                    "user": {
+                        "accountId": user.get("accountId", ""),
+                        "displayName": user.get("displayName", ""),
+                        "emailAddress": user.get("emailAddress", ""),
+                        "active": user.get("active", False)
                     }
+                }
+            else:
+                return {
+                    "status": "not_found",
+                    "message": f"Usuário '{username}' não encontrado"
+                }
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"Erro ao buscar usuário: {str(e)}"
             }
     
+    async def _resolve_project(self) -> Dict[str, Any]:
+        """
+        Descobre o projeto onde os issues serão criados
+        
+        O resultado fica no cache de metadados; chamadas seguintes não
+        fazem nenhuma requisição até o TTL expirar ou o cache ser invalidado.
+        """
+        cached = self.metadata_cache.get("project")
+        if cached is not None:
+            return cached
+        
+        # Primeiro, tentar acessar o projeto SCRUM diretamente
+        logger.info("Tentando acessar projeto SCRUM diretamente...")
+        scrum_response = await self.http.get(
+            f"{self.jira_url}/rest/api/3/project/SCRUM",
+            timeout=30.0
+        )
+        
+        if scrum_response.status_code == 200:
+            scrum_project = scrum_response.json()
+            logger.info(f"✅ Projeto SCRUM encontrado: {scrum_project.get('name')}")
+            projects = [scrum_project]
+        else:
+            logger.info(f"Projeto SCRUM não acessível diretamente (status: {scrum_response.status_code})")
+            
+            # Buscar projetos disponíveis de forma genérica
+            projects_response = await self.http.get(
+                f"{self.jira_url}/rest/api/3/project",
+                timeout=30.0
+            )
+            
+            if projects_response.status_code != 200:
+                raise ValueError(
+                    f"❌ Erro ao conectar com JIRA: {projects_response.status_code} - {projects_response.text}"
+                )
+            
+            projects = projects_response.json()
+            
+            # Debug: mostrar informações sobre projetos
+            logger.info(f"Projetos encontrados: {len(projects)}")
+            if projects:
+                for project in projects[:3]:  # Log primeiros 3 projetos
+                    logger.info(f"Projeto: {project.get('key')} - {project.get('name')}")
+            
+            if not projects:
+                # Tentar buscar projetos com permissões diferentes
+                search_response = await self.http.get(
+                    f"{self.jira_url}/rest/api/3/project/search",
+                    timeout=30.0
+                )
+                
+                if search_response.status_code == 200:
+                    search_projects = search_response.json()
+                    if search_projects.get('values'):
+                        projects = search_projects['values']
+                        logger.info(f"Projetos encontrados via search: {len(projects)}")
+                
+                if not projects:
+                    raise ValueError(
+                        "❌ Nenhum projeto encontrado no JIRA. Verifique as permissões do usuário ou se há projetos disponíveis."
+                    )
+        
+        # Usar o primeiro projeto disponível
+        project = {
+            "id": projects[0]["id"],
+            "key": projects[0]["key"],
+            "name": projects[0]["name"]
+        }
+        self.metadata_cache.set("project", project)
+        return project
+    
+    async def _resolve_issue_type(self, project: Dict[str, Any]) -> Dict[str, Any]:
+        """Descobre o tipo de issue padrão (Task, Story ou Bug) do projeto, com cache"""
+        cache_key = ("issuetype", project["id"])
+        cached = self.metadata_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Buscar tipos de issue disponíveis para o projeto
+        issue_types_response = await self.http.get(
+            f"{self.jira_url}/rest/api/3/issuetype/project",
+            params={"projectId": project["id"]},
+            timeout=30.0
+        )
+        
+        if issue_types_response.status_code != 200:
+            # Fallback para tipos de issue gerais (não vai para o cache)
+            return {"id": "10001", "name": "Task"}  # Task padrão
+        
+        issue_types = issue_types_response.json()
+        # Procurar por Task, Story ou Bug
+        issue_type = next(
+            (it for it in issue_types if it["name"].lower() in ["task", "story", "bug"]),
+            issue_types[0] if issue_types else None
+        )
+        
+        if not issue_type:
+            raise ValueError("❌ Nenhum tipo de issue disponível no projeto.")
+        
+        resolved = {"id": issue_type["id"], "name": issue_type["name"]}
+        self.metadata_cache.set(cache_key, resolved)
+        return resolved
+    
+    def invalidate_metadata_cache(self, project_id: Optional[str] = None):
+        """
+        Invalida o cache de metadados
+        
+        Args:
+            project_id: Invalida apenas os dados deste projeto (opcional)
+        """
+        if project_id is None:
+            self.metadata_cache.clear()
+        else:
+            self.metadata_cache.invalidate("project")
+            self.metadata_cache.invalidate(("issuetype", project_id))
+    
+    def _build_issue_fields(self, summary: str, description: str,
+                            project: Dict[str, Any], issue_type: Dict[str, Any]) -> Dict[str, Any]:
+        """Monta o bloco `fields` de criação de issue (descrição em ADF)"""
+        return {
+            "project": {
+                "key": project["key"]
+            },
+            "summary": summary,
+            "description": {
+                "type": "doc",
+                "version": 1,
+                "content": [
+                    {
+                        "type": "paragraph",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": description
+                            }
+                        ]
+                    }
+                ]
+            },
+            "issuetype": {
+                "id": issue_type["id"]
+            }
+        }
+    
+    async def _append_actions(self, new_actions: List[Dict[str, Any]]) -> str:
+        """Enfileira entradas para o log local de ações e retorna o caminho do arquivo"""
+        await self.action_writer.enqueue_many(new_actions)
+        return self.action_log.path
+    
     async def _create_test_issue(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Cria um issue real no JIRA usando a API"""
         summary = args.get("summary", "")
@@ -205,7 +553,6 @@ class SimpleJiraMCP:
         
         try:
             from datetime import datetime
-            import base64
             
             # Verificar se as credenciais estão configuradas
             if not all([self.jira_url, self.jira_username, self.jira_api_token]):
@@ -214,218 +561,447 @@ class SimpleJiraMCP:
                     "message": "❌ Credenciais do JIRA não configuradas. Configure JIRA_URL, JIRA_USERNAME e JIRA_API_TOKEN no arquivo .env"
                 }
             
-            # Preparar autenticação
-            auth_string = f"{self.jira_username}:{self.jira_api_token}"
-            auth_bytes = auth_string.encode('ascii')
-            auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
+            # Resolver projeto e tipo de issue (cache de metadados)
+            try:
+                project = await self._resolve_project()
+                issue_type = await self._resolve_issue_type(project)
+            except ValueError as e:
+                return {
+                    "status": "error",
+                    "message": str(e)
+                }
             
-            headers = {
-                "Authorization": f"Basic {auth_b64}",
-                "Content-Type": "application/json",
-                "Accept": "application/json"
+            project_key = project["key"]
+            project_name = project["name"]
+            issue_type_id = issue_type["id"]
+            issue_type_name = issue_type["name"]
+            
+            # Criar o issue
+            issue_data = {
+                "fields": self._build_issue_fields(summary, description, project, issue_type)
             }
             
-            # Primeiro, tentar acessar diretamente o projeto SCRUM conhecido
-            async with httpx.AsyncClient() as client:
-                # Primeiro, tentar acessar o projeto SCRUM diretamente
-                logger.info("Tentando acessar projeto SCRUM diretamente...")
-                scrum_response = await client.get(
-                    f"{self.jira_url}/rest/api/3/project/SCRUM",
-                    headers=headers,
-                    timeout=30.0
-                )
-                
-                if scrum_response.status_code == 200:
-                    scrum_project = scrum_response.json()
-                    logger.info(f"✅ Projeto SCRUM encontrado: {scrum_project.get('name')}")
-                    projects = [scrum_project]
-                else:
-                    logger.info(f"Projeto SCRUM não acessível diretamente (status: {scrum_response.status_code})")
-                    
-                    # Buscar projetos disponíveis de forma genérica
-                    projects_response = await client.get(
-                        f"{self.jira_url}/rest/api/3/project",
-                        headers=headers,
-                        timeout=30.0
-                    )
-                    
-                    if projects_response.status_code != 200:
-                        return {
-                            "status": "error",
-                            "message": f"❌ Erro ao conectar com JIRA: {projects_response.status_code} - {projects_response.text}"
-                        }
-                    
-                    projects = projects_response.json()
-                    
-                    # Debug: mostrar informações sobre projetos
-                    logger.info(f"Projetos encontrados: {len(projects)}")
-                    if projects:
-                        for project in projects[:3]:  # Log primeiros 3 projetos
-                            logger.info(f"Projeto: {project.get('key')} - {project.get('name')}")
-                    
-                    if not projects:
-                        # Tentar buscar projetos com permissões diferentes
-                        search_response = await client.get(
-                            f"{self.jira_url}/rest/api/3/project/search",
-                            headers=headers,
-                            timeout=30.0
+            create_response = await self.http.post(
+                f"{self.jira_url}/rest/api/3/issue",
+                json=issue_data,
+                timeout=30.0
+            )
+            
+            if create_response.status_code not in [200, 201]:
+                error_detail = create_response.text
+                # Metadados podem estar desatualizados (projeto/tipo removido)
+                if create_response.status_code in [400, 404]:
+                    self.invalidate_metadata_cache(project["id"])
+                return {
+                    "status": "error",
+                    "message": f"❌ Erro ao criar issue: {create_response.status_code} - {error_detail}"
+                }
+            
+            created_issue = create_response.json()
+            issue_key = created_issue["key"]
+            issue_url = f"{self.jira_url}/browse/{issue_key}"
+            
+            # Registrar no log local
+            log_file = await self._append_actions([{
+                "timestamp": datetime.now().isoformat(),
+                "action": "create_real_issue",
+                "data": {
+                    "key": issue_key,
+                    "summary": summary,
+                    "description": description,
+                    "project": project_name,
+                    "project_key": project_key,
+                    "issue_type": issue_type_name,
+                    "url": issue_url,
+                    "created": datetime.now().isoformat()
+                },
+                "success": True
+            }])
+            
+            return {
+                "status": "success",
+                "message": f"✅ Issue criado com sucesso no JIRA!",
+                "issue": {
+                    "key": issue_key,
+                    "summary": summary,
+                    "project": project_name,
+                    "project_key": project_key,
+                    "issue_type": issue_type_name,
+                    "url": issue_url
+                },
+                "log_file": log_file
+            }
+            
+        except httpx.TimeoutException:
+            return {
+                "status": "error",
+                "message": "❌ Timeout ao conectar com o JIRA. Verifique a URL e conexão de rede."
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"❌ Erro inesperado: {str(e)}"
+            }
+
+    async def _create_issues_bulk(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Cria vários issues via /rest/api/3/issue/bulk, em lotes"""
+        items = args.get("issues") or []
+        
+        if not items:
+            return {
+                "status": "error",
+                "message": "❌ Nenhum issue informado"
+            }
+        
+        try:
+            from datetime import datetime
+            
+            if not all([self.jira_url, self.jira_username, self.jira_api_token]):
+                return {
+                    "status": "error",
+                    "message": "❌ Credenciais do JIRA não configuradas. Configure JIRA_URL, JIRA_USERNAME e JIRA_API_TOKEN no arquivo .env"
+                }
+            
+            # Projeto e tipo de issue são resolvidos uma única vez para todo o lote
+            try:
+                project = await self._resolve_project()
+                issue_type = await self._resolve_issue_type(project)
+            except ValueError as e:
+                return {
+                    "status": "error",
+                    "message": str(e)
+                }
+            
+            results: List[Dict[str, Any]] = []
+            
+            for start in range(0, len(items), BULK_CREATE_BATCH_SIZE):
+                batch = items[start:start + BULK_CREATE_BATCH_SIZE]
+                issue_updates = [
+                    {
+                        "fields": self._build_issue_fields(
+                            item.get("summary", ""),
+                            item.get("description", "Issue criado via MCP JIRA Admin"),
+                            project,
+                            issue_type
                         )
-                        
-                        if search_response.status_code == 200:
-                            search_projects = search_response.json()
-                            if search_projects.get('values'):
-                                projects = search_projects['values']
-                                logger.info(f"Projetos encontrados via search: {len(projects)}")
-                        
-                        if not projects:
-                            return {
-                                "status": "error",
-                                "message": "❌ Nenhum projeto encontrado no JIRA. Verifique as permissões do usuário ou se há projetos disponíveis."
-                            }
-                
-                # Usar o primeiro projeto disponível
-                project_key = projects[0]["key"]
-                project_name = projects[0]["name"]
+                    }
+                    for item in batch
+                ]
                 
-                # Buscar tipos de issue disponíveis para o projeto
-                issue_types_response = await client.get(
-                    f"{self.jira_url}/rest/api/3/issuetype/project?projectId={projects[0]['id']}",
-                    headers=headers,
-                    timeout=30.0
+                response = await self.http.post(
+                    f"{self.jira_url}/rest/api/3/issue/bulk",
+                    json={"issueUpdates": issue_updates},
+                    timeout=60.0
                 )
                 
-                if issue_types_response.status_code != 200:
-                    # Fallback para tipos de issue gerais
-                    issue_type_id = "10001"  # Task padrão
-                    issue_type_name = "Task"
-                else:
-                    issue_types = issue_types_response.json()
-                    # Procurar por Task, Story ou Bug
-                    issue_type = next(
-                        (it for it in issue_types if it["name"].lower() in ["task", "story", "bug"]),
-                        issue_types[0] if issue_types else None
-                    )
-                    
-                    if not issue_type:
-                        return {
+                try:
+                    body = response.json()
+                except ValueError:
+                    body = {}
+                
+                if response.status_code not in [200, 201, 400] or not isinstance(body, dict):
+                    # Falha do lote inteiro
+                    for offset, item in enumerate(batch):
+                        results.append({
+                            "index": start + offset,
+                            "summary": item.get("summary", ""),
                             "status": "error",
-                            "message": "❌ Nenhum tipo de issue disponível no projeto."
-                        }
-                    
-                    issue_type_id = issue_type["id"]
-                    issue_type_name = issue_type["name"]
+                            "error": f"{response.status_code} - {response.text}"
+                        })
+                    continue
                 
-                # Criar o issue
-                issue_data = {
-                    "fields": {
-                        "project": {
-                            "key": project_key
-                        },
-                        "summary": summary,
-                        "description": {
-                            "type": "doc",
-                            "version": 1,
-                            "content": [
-                                {
-                                    "type": "paragraph",
-                                    "content": [
-                                        {
-                                            "type": "text",
-                                            "text": description
-                                        }
-                                    ]
-                                }
-                            ]
-                        },
-                        "issuetype": {
-                            "id": issue_type_id
-                        }
-                    }
+                # O JIRA devolve os criados em ordem e os erros por posição no lote
+                errors = {
+                    err.get("failedElementNumber"): err
+                    for err in body.get("errors", [])
                 }
+                created = iter(body.get("issues", []))
                 
-                create_response = await client.post(
-                    f"{self.jira_url}/rest/api/3/issue",
-                    headers=headers,
-                    json=issue_data,
-                    timeout=30.0
-                )
+                for offset, item in enumerate(batch):
+                    entry = {
+                        "index": start + offset,
+                        "summary": item.get("summary", "")
+                    }
+                    if offset in errors:
+                        element_errors = errors[offset].get("elementErrors", {})
+                        entry["status"] = "error"
+                        entry["error"] = element_errors.get("errors") or element_errors.get("errorMessages") or errors[offset]
+                    else:
+                        issue = next(created, None)
+                        if issue is None:
+                            entry["status"] = "error"
+                            entry["error"] = f"Resposta sem issue correspondente (HTTP {response.status_code})"
+                        else:
+                            entry["status"] = "success"
+                            entry["key"] = issue["key"]
+                            entry["url"] = f"{self.jira_url}/browse/{issue['key']}"
+                    results.append(entry)
                 
-                if create_response.status_code not in [200, 201]:
-                    error_detail = create_response.text
+                if response.status_code == 400 and not body.get("issues"):
+                    # Nenhum issue criado: metadados podem estar desatualizados
+                    self.invalidate_metadata_cache(project["id"])
+            
+            succeeded = [r for r in results if r["status"] == "success"]
+            failed = [r for r in results if r["status"] == "error"]
+            
+            log_file = None
+            if succeeded:
+                now = datetime.now().isoformat()
+                log_file = await self._append_actions([
+                    {
+                        "timestamp": now,
+                        "action": "create_real_issue",
+                        "data": {
+                            "key": r["key"],
+                            "summary": r["summary"],
+                            "description": items[r["index"]].get("description", "Issue criado via MCP JIRA Admin"),
+                            "project": project["name"],
+                            "project_key": project["key"],
+                            "issue_type": issue_type["name"],
+                            "url": r["url"],
+                            "created": now
+                        },
+                        "success": True
+                    }
+                    for r in succeeded
+                ])
+            
+            if not failed:
+                status = "success"
+            elif succeeded:
+                status = "partial"
+            else:
+                status = "error"
+            
+            return {
+                "status": status,
+                "message": f"{len(succeeded)} de {len(items)} issues criados no projeto {project['key']}",
+                "created": len(succeeded),
+                "failed": len(failed),
+                "results": results,
+                "log_file": log_file
+            }
+        
+        except httpx.TimeoutException:
+            return {
+                "status": "error",
+                "message": "❌ Timeout ao conectar com o JIRA. Verifique a URL e conexão de rede."
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"❌ Erro inesperado: {str(e)}"
+            }
+
+    async def _search_issues(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Busca issues por JQL, página a página, até o limite pedido"""
+        jql = args.get("jql", "")
+        fields = args.get("fields")
+        # Só o primeiro segmento vai para o JIRA; caminhos com ponto (status.name)
+        # são projetados na resposta
+        upstream_fields = list(dict.fromkeys(field.split(".")[0] for field in fields)) if fields else None
+        max_results = min(int(args.get("max_results", 50)), SEARCH_MAX_RESULTS)
+        
+        try:
+            issues: List[Dict[str, Any]] = []
+            pages = 0
+            # has_more vem do nextPageToken/isLast da última página buscada
+            search: Dict[str, Any] = {}
+            
+            async for page in iter_issue_pages(self.http, jql, fields=upstream_fields,
+                                               max_results=max_results, state=search):
+                pages += 1
+                issues.extend(project_issue(issue) for issue in page)
+            
+            truncated = search["has_more"]
+            if fields and any("." in field for field in fields):
+                issues = project_fields({"issues": issues}, ["key", "id"] + list(fields))["issues"]
+            return {
+                "status": "success",
+                "jql": jql,
+                "count": len(issues),
+                "pages": pages,
+                "truncated": truncated,
+                "issues": issues
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Erro na busca: {str(e)}"
+            }
+
+    async def _mirror_staleness(self, project: str, max_staleness: Optional[float]) -> Optional[float]:
+        """Idade do espelho do projeto, ou None se não puder ser usado"""
+        if self.mirror is None or project.upper() not in self.mirror_syncer.projects:
+            return None
+        staleness = await asyncio.to_thread(self.mirror.staleness, project.upper())
+        limit = MIRROR_MAX_STALENESS if max_staleness is None else float(max_staleness)
+        if staleness is None or staleness > limit:
+            return None
+        return staleness
+    
+    async def _get_issue(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Obtém um issue, do espelho local se estiver dentro do limite de idade"""
+        key = args.get("key", "").upper()
+        project = key.rsplit("-", 1)[0]
+        
+        try:
+            staleness = await self._mirror_staleness(project, args.get("max_staleness"))
+            if staleness is not None:
+                issue = await asyncio.to_thread(self.mirror.get_issue, key)
+                if issue is not None:
                     return {
-                        "status": "error",
-                        "message": f"❌ Erro ao criar issue: {create_response.status_code} - {error_detail}"
+                        "status": "success",
+                        "source": "mirror",
+                        "staleness_seconds": round(staleness, 1),
+                        "issue": issue
                     }
-                
-                created_issue = create_response.json()
-                issue_key = created_issue["key"]
-                issue_url = f"{self.jira_url}/browse/{issue_key}"
-                
-                # Registrar no log local
-                log_file = "c:\\Users\\ebine\\OneDrive\\Documents\\MCP-Jira\\test_actions.json"
-                
-                try:
-                    with open(log_file, 'r', encoding='utf-8') as f:
-                        actions = json.load(f)
-                except (FileNotFoundError, json.JSONDecodeError):
-                    actions = []
-                
-                action_log = {
-                    "timestamp": datetime.now().isoformat(),
-                    "action": "create_real_issue",
-                    "data": {
-                        "key": issue_key,
-                        "summary": summary,
-                        "description": description,
-                        "project": project_name,
-                        "project_key": project_key,
-                        "issue_type": issue_type_name,
-                        "url": issue_url,
-                        "created": datetime.now().isoformat()
-                    },
-                    "success": True
+            
+            response = await self.http.get(
+                f"{self.jira_url}/rest/api/3/issue/{key}",
+                params={"fields": ",".join(MIRROR_FIELDS)},
+                timeout=30.0
+            )
+            
+            if response.status_code == 404:
+                return {
+                    "status": "not_found",
+                    "message": f"Issue '{key}' não encontrado"
                 }
-                
-                actions.append(action_log)
-                
-                with open(log_file, 'w', encoding='utf-8') as f:
-                    json.dump(actions, f, indent=2, ensure_ascii=False)
-                
+            if response.status_code != 200:
                 return {
-                    "status": "success",
-                    "message": f"✅ Issue criado com sucesso no JIRA!",
-                    "issue": {
-                        "key": issue_key,
-                        "summary": summary,
-                        "project": project_name,
-                        "project_key": project_key,
-                        "issue_type": issue_type_name,
-                        "url": issue_url
-                    },
-                    "log_file": log_file
+                    "status": "error",
+                    "message": f"Erro ao obter issue: {response.status_code}",
+                    "details": response.text
                 }
-                
-        except httpx.TimeoutException:
+            
+            return {
+                "status": "success",
+                "source": "jira",
+                "issue": project_issue(response.json())
+            }
+        except Exception as e:
             return {
                 "status": "error",
-                "message": "❌ Timeout ao conectar com o JIRA. Verifique a URL e conexão de rede."
+                "message": f"Erro ao obter issue: {str(e)}"
+            }
+    
+    async def _count_issues(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Conta issues de um projeto, do espelho local se estiver dentro do limite de idade"""
+        project = args.get("project", "").upper()
+        status = args.get("status")
+        
+        try:
+            staleness = await self._mirror_staleness(project, args.get("max_staleness"))
+            if staleness is not None:
+                count = await asyncio.to_thread(self.mirror.count, project, status)
+                return {
+                    "status": "success",
+                    "source": "mirror",
+                    "staleness_seconds": round(staleness, 1),
+                    "project": project,
+                    "count": count
+                }
+            
+            jql = f"project = {jql_string(project)}"
+            if status:
+                jql += f" AND status = {jql_string(status)}"
+            response = await self.http.post(
+                f"{self.jira_url}/rest/api/3/search/approximate-count",
+                json={"jql": jql},
+                timeout=30.0,
+                idempotent=True
+            )
+            
+            if response.status_code != 200:
+                return {
+                    "status": "error",
+                    "message": f"Erro ao contar issues: {response.status_code}",
+                    "details": response.text
+                }
+            
+            return {
+                "status": "success",
+                "source": "jira",
+                "project": project,
+                "count": response.json().get("count", 0)
             }
         except Exception as e:
             return {
                 "status": "error",
-                "message": f"❌ Erro inesperado: {str(e)}"
+                "message": f"Erro ao contar issues: {str(e)}"
+            }
+    
+    async def _search_mirror(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Busca issues no espelho local"""
+        project = args.get("project", "").upper()
+        
+        if self.mirror is None or project not in self.mirror_syncer.projects:
+            return {
+                "status": "error",
+                "message": f"Projeto '{project}' não está espelhado. Configure MIRROR_PROJECTS."
             }
+        
+        issues = await asyncio.to_thread(
+            self.mirror.search,
+            project,
+            args.get("status"),
+            args.get("assignee"),
+            args.get("text"),
+            int(args.get("limit", 50))
+        )
+        staleness = await asyncio.to_thread(self.mirror.staleness, project)
+        return {
+            "status": "success",
+            "source": "mirror",
+            "staleness_seconds": round(staleness, 1) if staleness is not None else None,
+            "count": len(issues),
+            "issues": issues
+        }
 
     async def run(self):
         """Executa o servidor MCP"""
         logger.info("Iniciando servidor MCP JIRA Admin...")
         
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options()
-            )
+        # No modo prefork só o worker 0 sincroniza; os demais leem o mesmo arquivo
+        if self.mirror_syncer is not None and is_primary_worker():
+            self.mirror_syncer.start()
+        
+        # HealthChecker com pool próprio: a verificação da Organizations API
+        # usa ADMIN_API_KEY, que este servidor não carrega
+        # health_check (aiohttp) e o transporte HTTP são importados só quando usados:
+        # no modo stdio padrão cada cliente inicia um processo e espera o handshake
+        metrics_runner = None
+        try:
+            if transport_from_env() == "http":
+                from src.utils.health_check import HealthChecker
+                from src.utils.mcp_transport import serve_http
+                
+                # Várias sessões de clientes no mesmo processo (pool e caches compartilhados),
+                # com /health e /metrics na mesma porta
+                await serve_http(self.server, int(os.getenv("MCP_PORT", 6000)), health_checker=HealthChecker())
+            else:
+                # /health e /metrics no mesmo processo, se METRICS_PORT estiver definido
+                if os.getenv("METRICS_PORT"):
+                    from src.utils.health_check import HealthChecker, start_health_server
+                    
+                    metrics_runner = await start_health_server(int(os.getenv("METRICS_PORT")), HealthChecker())
+                
+                async with stdio_server() as (read_stream, write_stream):
+                    await self.server.run(
+                        read_stream,
+                        write_stream,
+                        self.server.create_initialization_options()
+                    )
+        finally:
+            if metrics_runner is not None:
+                await metrics_runner.cleanup()
+            if self.mirror_syncer is not None:
+                await self.mirror_syncer.stop()
+                self.mirror.close()
+            await self.action_writer.aclose()
+            await get_tracer().aclose()
+            await self.http.aclose()
 
 async def main():
     """Função principal"""
@@ -437,4 +1013,12 @@ async def main():
         raise
 
 if __name__ == "__main__":
+    # --profile-startup: tempos de importação, construção e primeiro list_tools
+    from src.utils.startup_profile import run_cli
+    if run_cli("src.simple_mcp_server", SimpleJiraMCP):
+        sys.exit(0)
+    
+    # MCP_WORKERS > 1 no transporte HTTP: um processo por worker na mesma porta
+    if transport_from_env() == "http" and workers_from_env() > 1:
+        sys.exit(run_prefork(main))
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+Espelho local de issues do JIRA em SQLite
+Mantém projetos selecionados sincronizados por polling incremental
+(`updated >= <watermark>`) e responde leituras sem chamar o JIRA Cloud
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from src.tools.jira_search import iter_issue_pages, jql_string
+from src.utils.http_client import JiraHttpClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIRROR_DB = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "jira_mirror.sqlite3"
+)
+
+# Campos sincronizados para cada issue
+MIRROR_FIELDS = [
+    "summary", "status", "assignee", "reporter", "issuetype",
+    "priority", "labels", "created", "updated"
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    id TEXT,
+    project TEXT NOT NULL,
+    summary TEXT,
+    status TEXT,
+    assignee TEXT,
+    assignee_account_id TEXT,
+    issuetype TEXT,
+    created TEXT,
+    updated TEXT,
+    fields TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_issues_project_status ON issues(project, status);
+CREATE INDEX IF NOT EXISTS idx_issues_assignee ON issues(assignee_account_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    project TEXT PRIMARY KEY,
+    watermark TEXT,
+    last_synced_at REAL,
+    issue_count INTEGER
+);
+"""
+
+
+def _name(value: Any, *keys: str) -> Optional[str]:
+    """Extrai o primeiro atributo presente de um objeto de campo do JIRA"""
+    if isinstance(value, dict):
+        for key in keys:
+            if value.get(key):
+                return value[key]
+    return None
+
+
+def _parse_jira_datetime(value: str) -> datetime:
+    """Converte '2025-09-16T23:24:27.592-0300' para datetime com fuso"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+
+
+class IssueMirror:
+    """Armazenamento SQLite do espelho (acesso serializado por lock)"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.getenv("MIRROR_DB") or DEFAULT_MIRROR_DB
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def upsert_issues(self, project: str, issues: List[Dict[str, Any]]) -> int:
+        """Insere/atualiza issues de um projeto"""
+        rows = []
+        for issue in issues:
+            fields = issue.get("fields") or {}
+            assignee = fields.get("assignee")
+            rows.append((
+                issue["key"],
+                issue.get("id"),
+                project,
+                fields.get("summary"),
+                _name(fields.get("status"), "name"),
+                _name(assignee, "displayName"),
+                _name(assignee, "accountId"),
+                _name(fields.get("issuetype"), "name"),
+                fields.get("created"),
+                fields.get("updated"),
+                json.dumps(fields, ensure_ascii=False),
+            ))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO issues (key, id, project, summary, status, assignee,
+                                    assignee_account_id, issuetype, created, updated, fields)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    id=excluded.id, project=excluded.project, summary=excluded.summary,
+                    status=excluded.status, assignee=excluded.assignee,
+                    assignee_account_id=excluded.assignee_account_id,
+                    issuetype=excluded.issuetype, created=excluded.created,
+                    updated=excluded.updated, fields=excluded.fields
+                """,
+                rows
+            )
+        return len(rows)
+
+    def get_sync_state(self, project: str) -> Optional[Dict[str, Any]]:
+        """Watermark e horário da última sincronização do projeto"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM sync_state WHERE project = ?", (project,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def set_sync_state(self, project: str, watermark: Optional[str],
+                       synced_at: Optional[float] = None):
+        """Grava o watermark do projeto (synced_at só ao fim de uma sincronização)"""
+        with self._lock, self._conn:
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM issues WHERE project = ?", (project,)
+            ).fetchone()[0]
+            self._conn.execute(
+                """
+                INSERT INTO sync_state (project, watermark, last_synced_at, issue_count)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(project) DO UPDATE SET
+                    watermark=excluded.watermark,
+                    last_synced_at=COALESCE(excluded.last_synced_at, sync_state.last_synced_at),
+                    issue_count=excluded.issue_count
+                """,
+                (project, watermark, synced_at, count)
+            )
+
+    def staleness(self, project: str) -> Optional[float]:
+        """Segundos desde a última sincronização completa (None se nunca sincronizado)"""
+        state = self.get_sync_state(project)
+        if not state or state["last_synced_at"] is None:
+            return None
+        return time.time() - state["last_synced_at"]
+
+    def get_issue(self, key: str) -> Optional[Dict[str, Any]]:
+        """Issue espelhado no formato {key, id, <campos>}"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, id, fields FROM issues WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        issue = {"key": row["key"], "id": row["id"]}
+        issue.update(json.loads(row["fields"]))
+        return issue
+
+    def count(self, project: str, status: Optional[str] = None) -> int:
+        """Conta issues espelhados do projeto (opcionalmente por status)"""
+        query = "SELECT COUNT(*) FROM issues WHERE project = ?"
+        params: List[Any] = [project]
+        if status:
+            query += " AND status = ? COLLATE NOCASE"
+            params.append(status)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def search(self, project: str, status: Optional[str] = None,
+               assignee: Optional[str] = None, text: Optional[str] = None,
+               limit: int = 50) -> List[Dict[str, Any]]:
+        """Busca simples por projeto/status/responsável/texto do resumo"""
+        query = ("SELECT key, summary, status, assignee, issuetype, updated "
+                 "FROM issues WHERE project = ?")
+        params: List[Any] = [project]
+        if status:
+            query += " AND status = ? COLLATE NOCASE"
+            params.append(status)
+        if assignee:
+            query += " AND (assignee_account_id = ? OR assignee = ? COLLATE NOCASE)"
+            params.extend([assignee, assignee])
+        if text:
+            query += " AND summary LIKE ?"
+            params.append(f"%{text}%")
+        query += " ORDER BY updated DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params)]
+
+
+class MirrorSyncer:
+    """
+    Sincronização incremental dos projetos espelhados
+
+    Cada ciclo busca `updated >= <watermark>` em ordem crescente e avança o
+    watermark a cada página, então uma sincronização interrompida continua
+    de onde parou. Issues excluídos no JIRA não são detectados por esse
+    polling e permanecem no espelho.
+    """
+
+    def __init__(self, http: JiraHttpClient, mirror: IssueMirror,
+                 projects: Optional[List[str]] = None,
+                 interval: Optional[float] = None):
+        self.http = http
+        self.mirror = mirror
+        if projects is None:
+            projects = [p.strip() for p in os.getenv("MIRROR_PROJECTS", "").split(",") if p.strip()]
+        self.projects = [p.upper() for p in projects]
+        self.interval = interval or float(os.getenv("MIRROR_SYNC_INTERVAL", 60))
+        self._task: Optional[asyncio.Task] = None
+
+    def _build_jql(self, project: str, watermark: Optional[str]) -> str:
+        jql = f"project = {jql_string(project)}"
+        if watermark:
+            # JQL tem precisão de minutos; recuar 1 minuto evita perder
+            # issues atualizados no mesmo minuto (o upsert remove duplicatas)
+            since = _parse_jira_datetime(watermark) - timedelta(minutes=1)
+            jql += f' AND updated >= "{since.strftime("%Y-%m-%d %H:%M")}"'
+        return jql + " ORDER BY updated ASC"
+
+    async def sync_project(self, project: str) -> int:
+        """Sincroniza um projeto a partir do seu watermark; retorna issues recebidos"""
+        state = await asyncio.to_thread(self.mirror.get_sync_state, project)
+        watermark = state["watermark"] if state else None
+        jql = self._build_jql(project, watermark)
+
+        received = 0
+        async for page in iter_issue_pages(self.http, jql, fields=MIRROR_FIELDS):
+            await asyncio.to_thread(self.mirror.upsert_issues, project, page)
+            received += len(page)
+            for issue in page:
+                updated = (issue.get("fields") or {}).get("updated")
+                if updated and (watermark is None or
+                                _parse_jira_datetime(updated) > _parse_jira_datetime(watermark)):
+                    watermark = updated
+            await asyncio.to_thread(self.mirror.set_sync_state, project, watermark)
+
+        await asyncio.to_thread(self.mirror.set_sync_state, project, watermark, time.time())
+        logger.info(f"Espelho {project}: {received} issues sincronizados (watermark={watermark})")
+        return received
+
+    async def sync_all(self) -> Dict[str, Any]:
+        """Sincroniza todos os projetos configurados"""
+        results: Dict[str, Any] = {}
+        for project in self.projects:
+            try:
+                results[project] = await self.sync_project(project)
+            except Exception as e:
+                logger.error(f"Erro ao sincronizar projeto {project}: {e}")
+                results[project] = f"erro: {e}"
+        return results
+
+    async def _loop(self):
+        while True:
+            await self.sync_all()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Inicia a sincronização periódica em segundo plano"""
+        if self.projects and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._loop())
+            logger.info(f"Sincronização do espelho a cada {self.interval}s: {', '.join(self.projects)}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
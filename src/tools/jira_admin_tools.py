@@ -3,12 +3,17 @@ Ferramentas MCP para Administração do JIRA
 Implementa as principais operações administrativas do JIRA
 """
 
+import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
 from urllib.parse import urljoin
 
-import httpx
+from src.tools.permission_index import PermissionSchemeIndex
+from src.tools.user_resolver import UserResolver
+from src.utils.cache import make_cache
+from src.utils.http_client import JiraHttpClient
 
 logger = logging.getLogger(__name__)
 
@@ -16,16 +21,36 @@ class JiraAdminTools:
     """Classe com ferramentas administrativas para JIRA"""
     
     def __init__(self, jira_url: str, username: str, api_token: str, 
-                 org_id: str, admin_api_key: str):
+                 org_id: str, admin_api_key: str,
+                 http: Optional[JiraHttpClient] = None):
         self.jira_url = jira_url.rstrip('/')
         self.username = username
         self.api_token = api_token
         self.org_id = org_id
         self.admin_api_key = admin_api_key
         
+        # Cliente HTTP compartilhado (pode ser injetado pelo servidor)
+        self._owns_http = http is None
+        self.http = http or JiraHttpClient(
+            self.jira_url, username, api_token, admin_api_key=admin_api_key
+        )
+        
+        # Resolução email -> conta com cache (inclui negativos)
+        self.users = UserResolver(self.http)
+
+        # Papéis por projeto (nome -> ID), estáveis: TTL longo
+        self.role_cache = make_cache(
+            "project_roles",
+            maxsize=int(os.getenv("PROJECT_ROLE_CACHE_SIZE", 1000)),
+            ttl=float(os.getenv("PROJECT_ROLE_CACHE_TTL", 3600))
+        )
+
+        # Índice dos esquemas de permissões (permissão <-> detentores)
+        self.permissions = PermissionSchemeIndex(self.http)
+
         # URLs base para diferentes APIs
         self.jira_api_base = f"{self.jira_url}/rest/api/3"
-        self.org_api_base = f"https://api.atlassian.com/admin/v1/orgs/{self.org_id}"
+        self.org_api_base = self.http.org_api(self.org_id)
     
     async def create_user_invitation(self, email: str, display_name: Optional[str] = None, 
                                    products: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -50,21 +75,77 @@ class JiraAdminTools:
         if display_name:
             payload["displayName"] = display_name
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=payload,
-                auth=(self.username, self.api_token),
-                headers={"Content-Type": "application/json"}
-            )
+        response = await self.http.post(url, json=payload)
+        
+        if response.status_code == 201:
+            logger.info(f"Usuário {email} criado com sucesso")
+            created = response.json()
+            self.users.remember({**created, "emailAddress": created.get("emailAddress") or email})
+            return created
+        else:
+            error_msg = f"Erro ao criar usuário: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+    async def create_users_bulk(self, users: List[Dict[str, Any]],
+                                concurrency: Optional[int] = None,
+                                default_products: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Criar vários usuários, ignorando os que já existem
+        
+        Args:
+            users: Lista de {"email", "display_name" (opcional), "products" (opcional)}
+            concurrency: Máximo de usuários processados em paralelo
+            default_products: Produtos usados quando o item não define "products"
+        
+        Returns:
+            Resultado por usuário, na ordem de entrada
+        """
+        limit = concurrency or int(os.getenv("BULK_USER_CONCURRENCY", 5))
+        semaphore = asyncio.Semaphore(max(1, limit))
+        
+        async def provision(user: Dict[str, Any]) -> Dict[str, Any]:
+            email = (user.get("email") or "").strip()
+            if not email:
+                return {"email": email, "status": "error", "error": "Email não informado"}
             
-            if response.status_code == 201:
-                logger.info(f"Usuário {email} criado com sucesso")
-                return response.json()
-            else:
-                error_msg = f"Erro ao criar usuário: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
+            async with semaphore:
+                try:
+                    # Falha na busca não equivale a "não existe": sem criar às cegas
+                    existing = await self.users.find_by_email(email)
+                except Exception as e:
+                    return {"email": email, "status": "error", "error": f"Falha ao verificar usuário: {e}"}
+                
+                if existing:
+                    return {
+                        "email": email,
+                        "status": "exists",
+                        "account_id": existing.get("accountId")
+                    }
+                
+                try:
+                    created = await self.create_user_invitation(
+                        email,
+                        display_name=user.get("display_name"),
+                        products=user.get("products", default_products)
+                    )
+                    return {
+                        "email": email,
+                        "status": "created",
+                        "account_id": created.get("accountId")
+                    }
+                except Exception as e:
+                    return {"email": email, "status": "error", "error": str(e)}
+        
+        # Emails repetidos na entrada são processados uma única vez
+        unique: Dict[str, Dict[str, Any]] = {}
+        for user in users:
+            unique.setdefault((user.get("email") or "").strip().lower(), user)
+        
+        outcomes = await asyncio.gather(*(provision(user) for user in unique.values()))
+        by_email = {outcome["email"].lower(): outcome for outcome in outcomes}
+        
+        return [by_email[(user.get("email") or "").strip().lower()] for user in users]
     
     async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """
@@ -76,26 +157,11 @@ class JiraAdminTools:
         Returns:
             Dados do usuário ou None se não encontrado
         """
-        url = f"{self.jira_api_base}/user/search"
-        params = {"query": email}
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                params=params,
-                auth=(self.username, self.api_token)
-            )
-            
-            if response.status_code == 200:
-                users = response.json()
-                for user in users:
-                    if user.get("emailAddress", "").lower() == email.lower():
-                        return user
-                return None
-            else:
-                logger.error(f"Erro ao buscar usuário: {response.status_code}")
-                return None
-    
+        try:
+            return await self.users.find_by_email(email)
+        except Exception:
+            return None
+
     async def add_user_to_group_org_api(self, account_id: str, group_id: str) -> Dict[str, Any]:
         """
         Adicionar usuário a grupo via Organizations API
@@ -104,31 +170,84 @@ class JiraAdminTools:
             account_id: ID da conta do usuário
             group_id: ID do grupo
         
+        Returns:
+            Resultado da operação
+        """
+        await self.add_user_to_groups_org_api(account_id, [group_id])
+        return {"status": "success", "message": "Usuário adicionado ao grupo"}
+    
+    async def add_user_to_groups_org_api(self, account_id: str, group_ids: List[str]) -> Dict[str, Any]:
+        """
+        Adicionar usuário a vários grupos em uma única requisição
+        
+        Args:
+            account_id: ID da conta do usuário
+            group_ids: IDs dos grupos
+        
         Returns:
             Resultado da operação
         """
         url = f"{self.org_api_base}/users/{account_id}/manage/groups"
         
-        payload = {"groupIds": [group_id]}
+        payload = {"groupIds": list(group_ids)}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {self.admin_api_key}",
-                    "Content-Type": "application/json"
-                }
-            )
-            
-            if response.status_code in [200, 204]:
-                logger.info(f"Usuário {account_id} adicionado ao grupo {group_id}")
-                return {"status": "success", "message": "Usuário adicionado ao grupo"}
-            else:
-                error_msg = f"Erro ao adicionar usuário ao grupo: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
+        response = await self.http.post(url, json=payload, api="org")
+        
+        if response.status_code in [200, 204]:
+            logger.info(f"Usuário {account_id} adicionado aos grupos {', '.join(group_ids)}")
+            return {"status": "success", "message": f"Usuário adicionado a {len(group_ids)} grupo(s)"}
+        else:
+            error_msg = f"Erro ao adicionar usuário ao grupo: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
     
+    async def add_users_to_groups_bulk(self, memberships: Dict[str, List[str]],
+                                       concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Adicionar muitos usuários a muitos grupos via Organizations API
+        
+        As associações são agrupadas por usuário: cada usuário gera uma única
+        requisição com todos os seus grupos. Usuários podem ser informados
+        por accountId ou por email (resolvido pelo cache de usuários).
+        
+        Args:
+            memberships: Mapa usuário (accountId ou email) -> IDs de grupos
+            concurrency: Máximo de requisições simultâneas
+        
+        Returns:
+            Resultado por usuário
+        """
+        limit = concurrency or int(os.getenv("ORG_BULK_CONCURRENCY", 5))
+        semaphore = asyncio.Semaphore(max(1, limit))
+        
+        # Consolidar por usuário, removendo grupos repetidos (mantendo a ordem)
+        plan: Dict[str, List[str]] = {}
+        for user, group_ids in memberships.items():
+            key = user.strip()
+            groups = plan.setdefault(key, [])
+            for group_id in group_ids:
+                if group_id not in groups:
+                    groups.append(group_id)
+        
+        async def apply(user: str, group_ids: List[str]) -> Dict[str, Any]:
+            result: Dict[str, Any] = {"user": user, "group_ids": group_ids}
+            async with semaphore:
+                try:
+                    account_id = user
+                    if "@" in user:
+                        account_id = await self.users.account_id(user)
+                        if not account_id:
+                            return {**result, "status": "error", "error": "Usuário não encontrado"}
+                    result["account_id"] = account_id
+                    await self.add_user_to_groups_org_api(account_id, group_ids)
+                    return {**result, "status": "success"}
+                except Exception as e:
+                    return {**result, "status": "error", "error": str(e)}
+        
+        return list(await asyncio.gather(
+            *(apply(user, group_ids) for user, group_ids in plan.items() if group_ids)
+        ))
+
     async def assign_project_role(self, project_key: str, role_id: str, 
                                 account_ids: Optional[List[str]] = None,
                                 group_names: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -159,22 +278,167 @@ class JiraAdminTools:
         
         payload = {"categorisedActors": categorised_actors}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                url,
-                json=payload,
-                auth=(self.username, self.api_token),
-                headers={"Content-Type": "application/json"}
+        response = await self.http.put(url, json=payload)
+        
+        if response.status_code == 200:
+            logger.info(f"Papel {role_id} atribuído no projeto {project_key}")
+            return response.json()
+        else:
+            error_msg = f"Erro ao atribuir papel: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+    async def resolve_role_id(self, project_key: str, role: str) -> str:
+        """
+        Resolver nome de papel para ID no projeto (com cache por projeto)
+
+        Args:
+            project_key: Chave do projeto
+            role: Nome do papel (ex: Administrators) ou ID numérico
+
+        Returns:
+            ID do papel
+        """
+        role = str(role).strip()
+        if role.isdigit():
+            return role
+
+        roles = self.role_cache.get(project_key)
+        if roles is None:
+            # /project/{key}/role retorna {nome: URL do papel}; o ID é o último segmento
+            listed = await self.list_project_roles(project_key)
+            roles = {
+                name.strip().lower(): url.rstrip('/').rsplit('/', 1)[-1]
+                for name, url in listed.items()
+            }
+            self.role_cache.set(project_key, roles)
+
+        role_id = roles.get(role.lower())
+        if role_id is None:
+            raise ValueError(f"Papel '{role}' não encontrado no projeto {project_key}")
+        return role_id
+
+    async def list_project_keys(self, category: str) -> List[str]:
+        """
+        Listar chaves dos projetos de uma categoria
+
+        Args:
+            category: ID ou nome da categoria de projeto
+
+        Returns:
+            Chaves dos projetos da categoria
+        """
+        category_id = str(category).strip()
+        if not category_id.isdigit():
+            response = await self.http.get(f"{self.jira_api_base}/projectCategory")
+            if response.status_code != 200:
+                error_msg = f"Erro ao listar categorias: {response.status_code} - {response.text}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
+            matches = [
+                c["id"] for c in response.json()
+                if c.get("name", "").strip().lower() == category_id.lower()
+            ]
+            if not matches:
+                raise ValueError(f"Categoria de projeto não encontrada: {category}")
+            category_id = str(matches[0])
+
+        keys: List[str] = []
+        start_at = 0
+        while True:
+            response = await self.http.get(
+                f"{self.jira_api_base}/project/search",
+                params={"categoryId": category_id, "startAt": start_at, "maxResults": 100}
             )
-            
-            if response.status_code == 200:
-                logger.info(f"Papel {role_id} atribuído no projeto {project_key}")
-                return response.json()
-            else:
-                error_msg = f"Erro ao atribuir papel: {response.status_code} - {response.text}"
+            if response.status_code != 200:
+                error_msg = f"Erro ao listar projetos: {response.status_code} - {response.text}"
                 logger.error(error_msg)
                 raise Exception(error_msg)
-    
+            body = response.json()
+            values = body.get("values", [])
+            keys.extend(project["key"] for project in values)
+            start_at += len(values)
+            if body.get("isLast", True) or not values:
+                return keys
+
+    async def add_project_role_actors(self, project_key: str, role_id: str,
+                                      account_ids: Optional[List[str]] = None,
+                                      group_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Adicionar usuários/grupos a um papel do projeto, mantendo os atuais
+
+        Diferente de assign_project_role (PUT, que substitui os atores do
+        papel), usa POST e apenas acrescenta os atores informados.
+
+        Returns:
+            Papel do projeto atualizado
+        """
+        payload: Dict[str, Any] = {}
+        if account_ids:
+            payload["user"] = account_ids
+        if group_names:
+            payload["group"] = group_names
+        if not payload:
+            raise ValueError("Deve fornecer pelo menos account_ids ou group_names")
+
+        url = f"{self.jira_api_base}/project/{project_key}/role/{role_id}"
+        response = await self.http.post(url, json=payload)
+
+        if response.status_code == 200:
+            logger.info(f"Atores adicionados ao papel {role_id} no projeto {project_key}")
+            return response.json()
+        else:
+            error_msg = f"Erro ao adicionar atores ao papel: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+    async def assign_project_role_bulk(self, role: str,
+                                       project_keys: Optional[List[str]] = None,
+                                       category: Optional[str] = None,
+                                       account_ids: Optional[List[str]] = None,
+                                       group_names: Optional[List[str]] = None,
+                                       concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Atribuir usuários/grupos a um papel em vários projetos em paralelo
+
+        Args:
+            role: Nome ou ID do papel (nomes são resolvidos uma vez por projeto)
+            project_keys: Chaves dos projetos
+            category: ID ou nome de categoria (projetos somados a project_keys)
+            account_ids: IDs de contas de usuários
+            group_names: Nomes de grupos
+            concurrency: Máximo de projetos processados em paralelo
+
+        Returns:
+            Resultado por projeto
+        """
+        if not account_ids and not group_names:
+            raise ValueError("Deve fornecer pelo menos account_ids ou group_names")
+
+        keys = list(project_keys or [])
+        if category:
+            keys.extend(await self.list_project_keys(category))
+        # Remover repetidos mantendo a ordem
+        keys = list(dict.fromkeys(key.strip().upper() for key in keys if key and key.strip()))
+        if not keys:
+            raise ValueError("Informe project_keys ou uma categoria com projetos")
+
+        limit = concurrency or int(os.getenv("PROJECT_BULK_CONCURRENCY", 10))
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def assign(project_key: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    role_id = await self.resolve_role_id(project_key, role)
+                    await self.add_project_role_actors(
+                        project_key, role_id, account_ids=account_ids, group_names=group_names
+                    )
+                    return {"project_key": project_key, "role_id": role_id, "status": "success"}
+                except Exception as e:
+                    return {"project_key": project_key, "status": "error", "error": str(e)}
+
+        return list(await asyncio.gather(*(assign(key) for key in keys)))
+
     async def grant_permission_to_scheme(self, scheme_id: str, permission: str,
                                        holder_type: str, holder_parameter: str) -> Dict[str, Any]:
         """
@@ -199,22 +463,17 @@ class JiraAdminTools:
             "permission": permission
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=payload,
-                auth=(self.username, self.api_token),
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code == 201:
-                logger.info(f"Permissão {permission} concedida no esquema {scheme_id}")
-                return response.json()
-            else:
-                error_msg = f"Erro ao conceder permissão: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-    
+        response = await self.http.post(url, json=payload)
+        
+        if response.status_code == 201:
+            logger.info(f"Permissão {permission} concedida no esquema {scheme_id}")
+            self.permissions.invalidate()
+            return response.json()
+        else:
+            error_msg = f"Erro ao conceder permissão: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
     async def list_project_roles(self, project_key: str) -> Dict[str, Any]:
         """
         Listar papéis disponíveis em um projeto
@@ -227,59 +486,77 @@ class JiraAdminTools:
         """
         url = f"{self.jira_api_base}/project/{project_key}/role"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                auth=(self.username, self.api_token)
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                error_msg = f"Erro ao listar papéis: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-    
-    async def list_permission_schemes(self) -> Dict[str, Any]:
+        response = await self.http.get(url)
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            error_msg = f"Erro ao listar papéis: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+    async def list_permission_schemes(self, expand: Optional[str] = None) -> Dict[str, Any]:
         """
         Listar esquemas de permissões disponíveis
         
+        Args:
+            expand: Expansões da API (ex: permissions, all)
+        
         Returns:
             Lista de esquemas de permissões
         """
         url = f"{self.jira_api_base}/permissionscheme"
+        params = {"expand": expand} if expand else None
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                auth=(self.username, self.api_token)
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                error_msg = f"Erro ao listar esquemas: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-    
-    async def get_groups_for_org(self) -> Dict[str, Any]:
+        response = await self.http.get(url, params=params)
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            error_msg = f"Erro ao listar esquemas: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+    async def get_groups_for_org(self, name_filter: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
         """
-        Listar grupos da organização via Organizations API
+        Percorrer os grupos da organização via Organizations API
         
-        Returns:
-            Lista de grupos da organização
+        Segue os links de cursor página a página e entrega os grupos à medida
+        que chegam, sem manter a lista completa em memória.
+        
+        Args:
+            name_filter: Trecho do nome do grupo (sem diferenciar maiúsculas)
+        
+        Yields:
+            Grupos da organização
         """
         url = f"{self.org_api_base}/groups"
+        params: Optional[Dict[str, str]] = None
+        wanted = name_filter.strip().lower() if name_filter else None
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers={"Authorization": f"Bearer {self.admin_api_key}"}
-            )
+        while True:
+            response = await self.http.get(url, api="org", params=params)
             
-            if response.status_code == 200:
-                return response.json()
-            else:
+            if response.status_code != 200:
                 error_msg = f"Erro ao listar grupos: {response.status_code} - {response.text}"
                 logger.error(error_msg)
-                raise Exception(error_msg)
\ No newline at end of file
+                raise Exception(error_msg)
+            
+            body = response.json()
+            for group in body.get("data", []):
+                if wanted is None or wanted in (group.get("name") or "").lower():
+                    yield group
+            
+            # links.next pode ser um cursor ou a URL completa da próxima página
+            next_link = (body.get("links") or {}).get("next")
+            if not next_link or not body.get("data"):
+                return
+            if next_link.startswith("http"):
+                url, params = next_link, None
+            else:
+                url, params = f"{self.org_api_base}/groups", {"cursor": next_link}
+    
+    async def aclose(self):
+        """Fecha o pool HTTP, caso tenha sido criado por esta instância"""
+        if self._owns_http:
+            await self.http.aclose()
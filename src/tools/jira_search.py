@@ -0,0 +1,94 @@
+"""
+Busca JQL paginada do JIRA
+Percorre a paginação da busca aprimorada (nextPageToken) página a página,
+sem manter o conjunto completo de resultados em memória
+"""
+
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from src.utils.http_client import JiraHttpClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_FIELDS = ["summary", "status", "assignee", "issuetype", "updated"]
+MAX_PAGE_SIZE = 100
+
+
+def jql_string(value: Any) -> str:
+    """Literal JQL entre aspas, com barra invertida e aspas escapadas"""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+async def iter_issue_pages(http: JiraHttpClient, jql: str,
+                           fields: Optional[List[str]] = None,
+                           page_size: int = MAX_PAGE_SIZE,
+                           max_results: Optional[int] = None,
+                           state: Optional[Dict[str, Any]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Gera as páginas de issues de uma busca JQL à medida que chegam
+
+    Args:
+        http: Cliente HTTP compartilhado
+        jql: Consulta JQL
+        fields: Campos a retornar (projeção feita pelo próprio JIRA)
+        page_size: Issues por página (máximo 100)
+        max_results: Limite rígido de issues no total (opcional)
+        state: Preenchido com `has_more` (o JIRA tinha mais issues além do
+            que foi entregue), sem buscar páginas além do limite
+
+    Yields:
+        Lista de issues de cada página
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    url = http.jira_api("search/jql")
+    next_page_token: Optional[str] = None
+    returned = 0
+    if state is not None:
+        state["has_more"] = False
+
+    while True:
+        if max_results is not None:
+            remaining = max_results - returned
+            if remaining <= 0:
+                return
+        else:
+            remaining = page_size
+
+        payload: Dict[str, Any] = {
+            "jql": jql,
+            "fields": fields or DEFAULT_SEARCH_FIELDS,
+            "maxResults": min(page_size, remaining),
+        }
+        if next_page_token:
+            payload["nextPageToken"] = next_page_token
+
+        response = await http.post(url, json=payload, idempotent=True)
+
+        if response.status_code != 200:
+            error_msg = f"Erro na busca JQL: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+        body = response.json()
+        page = body.get("issues", [])
+        issues = page[:max_results - returned] if max_results is not None else page
+        next_page_token = body.get("nextPageToken")
+        last = bool(body.get("isLast", not next_page_token)) or not next_page_token or not page
+        if state is not None:
+            state["has_more"] = len(issues) < len(page) or not last
+
+        if issues:
+            returned += len(issues)
+            yield issues
+
+        if last:
+            return
+
+
+def project_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Achata um issue da busca em {key, id, <campos>}"""
+    projected = {"key": issue.get("key"), "id": issue.get("id")}
+    projected.update(issue.get("fields") or {})
+    return projected
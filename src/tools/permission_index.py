@@ -0,0 +1,168 @@
+"""
+Índice em memória dos esquemas de permissões do JIRA
+Carrega todos os esquemas com expand=permissions e indexa
+permissão -> detentores e detentor -> esquemas, respondendo consultas
+sem baixar e percorrer os esquemas a cada chamada
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.utils.http_client import JiraHttpClient
+
+logger = logging.getLogger(__name__)
+
+HolderKey = Tuple[str, str]
+
+
+def holder_keys(holder: Dict[str, Any]) -> List[HolderKey]:
+    """
+    Chaves de índice de um detentor
+
+    O JIRA identifica grupos tanto pelo nome ("parameter") quanto pelo
+    groupId ("value"); ambos são indexados para aceitar qualquer um na consulta.
+    """
+    holder_type = holder.get("type", "")
+    identifiers = {
+        str(holder[field]).strip().lower()
+        for field in ("parameter", "value")
+        if holder.get(field)
+    }
+    return [(holder_type, identifier) for identifier in identifiers] or [(holder_type, "")]
+
+
+class PermissionSchemeIndex:
+    """Índice dos esquemas de permissões, recarregado após o TTL ou invalidação"""
+
+    def __init__(self, http: JiraHttpClient, ttl: Optional[float] = None):
+        self.http = http
+        self.ttl = ttl if ttl is not None else float(os.getenv("PERMISSION_INDEX_TTL", 300))
+        self.schemes: Dict[str, Dict[str, Any]] = {}
+        self.by_permission: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_holder: Dict[HolderKey, Dict[str, Set[str]]] = {}
+        self.loaded_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def invalidate(self):
+        """Força a recarga na próxima consulta"""
+        self.loaded_at = None
+
+    def _fresh(self) -> bool:
+        return self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl
+
+    async def ensure_loaded(self):
+        """Carrega o índice se ausente ou expirado (uma única carga por vez)"""
+        if self._fresh():
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Outra tarefa pode ter carregado enquanto esta aguardava
+            if not self._fresh():
+                await self._load()
+
+    async def _load(self):
+        response = await self.http.get(
+            self.http.jira_api("permissionscheme"),
+            params={"expand": "permissions"}
+        )
+
+        if response.status_code != 200:
+            error_msg = f"Erro ao carregar esquemas de permissões: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+        schemes: Dict[str, Dict[str, Any]] = {}
+        by_permission: Dict[str, List[Dict[str, Any]]] = {}
+        by_holder: Dict[HolderKey, Dict[str, Set[str]]] = {}
+
+        for scheme in response.json().get("permissionSchemes", []):
+            scheme_id = str(scheme.get("id"))
+            schemes[scheme_id] = {
+                "id": scheme_id,
+                "name": scheme.get("name"),
+                "description": scheme.get("description", ""),
+            }
+            for grant in scheme.get("permissions", []):
+                permission = grant.get("permission", "")
+                holder = grant.get("holder") or {}
+                by_permission.setdefault(permission, []).append({
+                    "scheme_id": scheme_id,
+                    "grant_id": grant.get("id"),
+                    "holder_type": holder.get("type"),
+                    "holder_parameter": holder.get("parameter"),
+                    "holder_value": holder.get("value"),
+                })
+                for key in holder_keys(holder):
+                    by_holder.setdefault(key, {}).setdefault(scheme_id, set()).add(permission)
+
+        self.schemes = schemes
+        self.by_permission = by_permission
+        self.by_holder = by_holder
+        self.loaded_at = time.monotonic()
+        logger.info(
+            f"Índice de permissões carregado: {len(schemes)} esquemas, "
+            f"{sum(len(grants) for grants in by_permission.values())} concessões"
+        )
+
+    async def schemes_granting(self, permission: str, holder_type: Optional[str] = None,
+                               holder: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Esquemas que concedem a permissão (opcionalmente a um detentor específico)
+
+        Args:
+            permission: Chave da permissão (ex: BROWSE_PROJECTS)
+            holder_type: Tipo do detentor (group, user, projectRole...)
+            holder: Nome/ID do grupo, accountId ou ID do papel
+
+        Returns:
+            Esquemas com as concessões correspondentes
+        """
+        await self.ensure_loaded()
+        wanted = holder.strip().lower() if holder else None
+
+        matches: Dict[str, List[Dict[str, Any]]] = {}
+        for grant in self.by_permission.get(permission.strip().upper(), []):
+            if holder_type and grant["holder_type"] != holder_type:
+                continue
+            if wanted is not None and wanted not in {
+                str(grant[field]).strip().lower()
+                for field in ("holder_parameter", "holder_value")
+                if grant[field]
+            }:
+                continue
+            matches.setdefault(grant["scheme_id"], []).append(grant)
+
+        return [
+            {**self.schemes[scheme_id], "grants": grants}
+            for scheme_id, grants in matches.items()
+        ]
+
+    async def holder_permissions(self, holder_type: str, holder: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Permissões concedidas a um detentor, por esquema
+
+        Args:
+            holder_type: Tipo do detentor (group, user, projectRole, anyone...)
+            holder: Nome/ID do grupo, accountId ou ID do papel
+
+        Returns:
+            Esquemas e permissões concedidas ao detentor
+        """
+        await self.ensure_loaded()
+        key = (holder_type, holder.strip().lower() if holder else "")
+        return [
+            {**self.schemes[scheme_id], "permissions": sorted(permissions)}
+            for scheme_id, permissions in self.by_holder.get(key, {}).items()
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "schemes": len(self.schemes),
+            "permissions": len(self.by_permission),
+            "holders": len(self.by_holder),
+            "age_seconds": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at else None,
+        }
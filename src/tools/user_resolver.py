@@ -0,0 +1,111 @@
+"""
+Resolução de usuários do JIRA (email/consulta -> conta) com cache
+Cache LRU+TTL, incluindo entradas negativas de curta duração para
+buscas sem resultado
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from src.utils.cache import TTLCache, make_cache
+from src.utils.http_client import JiraHttpClient
+
+logger = logging.getLogger(__name__)
+
+_NOT_FOUND: Dict[str, Any] = {}
+
+
+def normalize(value: str) -> str:
+    """Normaliza email/consulta para uso como chave de cache"""
+    return (value or "").strip().lower()
+
+
+class UserResolver:
+    """Busca de usuários via /user/search, compartilhada pelas ferramentas do servidor"""
+
+    def __init__(self, http: JiraHttpClient, cache: Optional[TTLCache] = None,
+                 negative_ttl: Optional[float] = None):
+        self.http = http
+        # Cache vazio é falso (__len__): comparar com None
+        self.cache = cache if cache is not None else make_cache(
+            "users",
+            maxsize=int(os.getenv("USER_CACHE_SIZE", 1000)),
+            ttl=float(os.getenv("USER_CACHE_TTL", 600))
+        )
+        self.negative_ttl = (
+            negative_ttl if negative_ttl is not None
+            else float(os.getenv("USER_CACHE_NEGATIVE_TTL", 60))
+        )
+
+    def _remember(self, users: List[Dict[str, Any]]):
+        """Indexa por email os usuários retornados por uma busca"""
+        for user in users:
+            email = normalize(user.get("emailAddress", ""))
+            if email:
+                self.cache.set(("email", email), user)
+
+    async def search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Resultado de /user/search para a consulta (com cache)
+
+        Raises:
+            Exception: Erro HTTP na busca (não vai para o cache)
+        """
+        key = ("search", normalize(query))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self.http.get(
+            self.http.jira_api("user/search"),
+            params={"query": query},
+            timeout=10.0
+        )
+
+        if response.status_code != 200:
+            error_msg = f"Erro ao buscar usuário: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+        users = response.json()
+        self.cache.set(key, users, ttl=None if users else self.negative_ttl)
+        self._remember(users)
+        return users
+
+    async def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Usuário com o email exato, ou None se não existir
+
+        Raises:
+            Exception: Erro HTTP na busca
+        """
+        key = ("email", normalize(email))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached or None
+
+        await self.search(email)
+        user = self.cache.get(key)
+        if user is None:
+            self.cache.set(key, _NOT_FOUND, ttl=self.negative_ttl)
+            return None
+        return user
+
+    async def account_id(self, email: str) -> Optional[str]:
+        """accountId do usuário com o email, ou None"""
+        user = await self.find_by_email(email)
+        return user.get("accountId") if user else None
+
+    def remember(self, user: Dict[str, Any]):
+        """Registra um usuário recém-criado (substitui entradas negativas)"""
+        email = normalize(user.get("emailAddress", ""))
+        if email:
+            self.cache.invalidate(("search", email))
+            self.cache.set(("email", email), user)
+
+    def invalidate(self, email: str):
+        """Remove do cache as entradas de um email"""
+        email = normalize(email)
+        self.cache.invalidate(("email", email))
+        self.cache.invalidate(("search", email))
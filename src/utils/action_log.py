@@ -0,0 +1,168 @@
+"""
+Log local de ações em formato JSONL (uma ação por linha)
+Escritas são apenas de acréscimo: o custo não cresce com o histórico
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACTION_LOG = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "test_actions.jsonl"
+)
+
+
+class ActionLog:
+    """Log de ações append-only, seguro para chamadas concorrentes"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("ACTION_LOG_FILE") or DEFAULT_ACTION_LOG
+        self._lock = threading.Lock()
+
+    def append(self, entries: Iterable[Dict[str, Any]], fsync: bool = False) -> int:
+        """
+        Acrescenta entradas ao final do arquivo
+
+        Todas as linhas são gravadas em uma única chamada write() sobre um
+        descritor aberto com O_APPEND, de modo que escritas concorrentes
+        (inclusive de outros processos) não se intercalam.
+
+        Args:
+            entries: Entradas a gravar
+            fsync: Força a gravação em disco antes de retornar
+
+        Returns:
+            Número de entradas gravadas
+        """
+        lines = [json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries]
+        if not lines:
+            return 0
+
+        data = "".join(lines).encode("utf-8")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                written = 0
+                while written < len(data):
+                    written += os.write(fd, data[written:])
+                if fsync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        return len(lines)
+
+    def iter_entries(self, action: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lê o log linha a linha, sem carregá-lo inteiro em memória
+
+        Args:
+            action: Filtra pelo tipo de ação (opcional)
+        """
+        try:
+            f = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+
+        with f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Linha inválida ignorada em {self.path}:{line_number}")
+                    continue
+                if action is None or entry.get("action") == action:
+                    yield entry
+
+
+class ActionLogWriter:
+    """
+    Gravador em segundo plano para o ActionLog
+
+    Os handlers apenas enfileiram as entradas; uma tarefa asyncio agrupa o
+    que estiver na fila e grava cada lote com um único write+fsync
+    (group commit). A fila é limitada: quando cheia, `enqueue` aguarda,
+    aplicando backpressure em vez de crescer sem limite.
+    """
+
+    def __init__(self, log: ActionLog, max_queue: Optional[int] = None,
+                 batch_size: Optional[int] = None, flush_interval: Optional[float] = None,
+                 fsync: Optional[bool] = None):
+        self.log = log
+        self.max_queue = max_queue or int(os.getenv("ACTION_LOG_QUEUE_SIZE", 1000))
+        self.batch_size = batch_size or int(os.getenv("ACTION_LOG_BATCH_SIZE", 100))
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else float(os.getenv("ACTION_LOG_FLUSH_INTERVAL", 0.05))
+        )
+        self.fsync = (
+            fsync if fsync is not None
+            else os.getenv("ACTION_LOG_FSYNC", "true").lower() in ("1", "true", "yes")
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Inicia a tarefa de gravação no loop atual (idempotente)"""
+        if self._task is None or self._task.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    async def enqueue(self, entry: Dict[str, Any]):
+        """Enfileira uma entrada (aguarda se a fila estiver cheia)"""
+        self.start()
+        await self._queue.put(entry)
+
+    async def enqueue_many(self, entries: Iterable[Dict[str, Any]]):
+        """Enfileira várias entradas, na ordem"""
+        for entry in entries:
+            await self.enqueue(entry)
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            batch: List[Dict[str, Any]] = [await queue.get()]
+
+            # Aguardar brevemente para agrupar escritas próximas no mesmo commit
+            if self.flush_interval > 0 and queue.empty():
+                await asyncio.sleep(self.flush_interval)
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            try:
+                await asyncio.to_thread(self.log.append, batch, self.fsync)
+            except Exception as e:
+                logger.error(f"Erro ao gravar {len(batch)} ações em {self.log.path}: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def flush(self):
+        """Aguarda até que todas as entradas enfileiradas sejam gravadas"""
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def aclose(self):
+        """Grava o que estiver pendente e encerra a tarefa"""
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,329 @@
+"""
+Cache em memória com TTL e limite de tamanho
+Usado para metadados do JIRA (projetos, tipos de issue, etc.)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Arquivo do cache compartilhado dentro de MCP_SHARED_DIR
+SHARED_CACHE_FILE = "cache.sqlite3"
+
+_SHARED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (name, key)
+);
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(name, expires_at);
+"""
+
+
+class TTLCache:
+    """
+    Cache LRU com expiração por entrada
+
+    Com `maxbytes`, o total dos tamanhos informados em `set(size=...)`
+    também é limitado (entradas grandes, como resultados de ferramentas).
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 maxbytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _drop(self, key: Hashable):
+        self._data.pop(key, None)
+        self.bytes -= self._sizes.pop(key, 0)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor em cache ou `default` se ausente/expirado"""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            self._drop(key)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: int = 0):
+        """Armazena um valor; `ttl` sobrescreve o TTL padrão, `size` conta para `maxbytes`"""
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        self._drop(key)
+        self._data[key] = (expires_at, value)
+        if size:
+            self._sizes[key] = size
+            self.bytes += size
+        while self._data and (
+            len(self._data) > self.maxsize
+            or (self.maxbytes is not None and self.bytes > self.maxbytes)
+        ):
+            self._drop(next(iter(self._data)))
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key, _MISSING)
+        return entry is not _MISSING and entry[0] > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def invalidate(self, key: Hashable):
+        """Remove uma entrada específica"""
+        self._drop(key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """Remove todas as entradas cuja chave satisfaz o predicado"""
+        for key in [k for k in self._data if predicate(k)]:
+            self._drop(key)
+
+    def clear(self):
+        """Esvazia o cache"""
+        self._data.clear()
+        self._sizes.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas de uso do cache"""
+        total = self.hits + self.misses
+        stats = {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+        if self.maxbytes is not None:
+            stats.update(bytes=self.bytes, maxbytes=self.maxbytes)
+        return stats
+
+
+def _encode_key(key: Hashable) -> str:
+    return json.dumps(key, ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode_key(raw: str) -> Hashable:
+    def freeze(value: Any) -> Hashable:
+        return tuple(freeze(item) for item in value) if isinstance(value, list) else value
+    return freeze(json.loads(raw))
+
+
+class SharedTTLCache:
+    """
+    Cache com expiração por entrada em SQLite, compartilhado entre processos
+
+    Mesma interface do TTLCache, usado pelos workers do modo prefork para
+    que uma resolução feita em um processo sirva aos demais. Chaves e
+    valores são serializados em JSON (valores lidos são cópias). Acima de
+    `maxsize` (ou de `maxbytes` de JSON gravado), saem primeiro as
+    entradas que expiram antes, o que evita uma gravação a cada leitura.
+
+    As chamadas rodam no loop de eventos, então a espera pelo lock do
+    SQLite é curta (`busy_timeout`): com outro worker gravando, a leitura
+    conta como miss e a gravação é descartada. Só as invalidações, raras
+    e necessárias à consistência, aguardam `INVALIDATE_TIMEOUT`.
+    """
+
+    INVALIDATE_TIMEOUT = 5.0
+
+    def __init__(self, path: str, name: str, maxsize: int = 128, ttl: float = 300.0,
+                 clock: Callable[[], float] = time.time, maxbytes: Optional[int] = None,
+                 busy_timeout: Optional[float] = None):
+        self.path = path
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.busy_timeout = (
+            busy_timeout if busy_timeout is not None
+            else float(os.getenv("SHARED_CACHE_BUSY_TIMEOUT", 0.05))
+        )
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.busy = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Criação do esquema aguarda os demais workers; depois, espera curta
+        self._conn = sqlite3.connect(path, timeout=self.INVALIDATE_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SHARED_SCHEMA)
+        self._conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _invalidating(self) -> Iterator[None]:
+        """Transação de invalidação, com espera maior pelo lock"""
+        with self._lock:
+            self._conn.execute(f"PRAGMA busy_timeout = {int(self.INVALIDATE_TIMEOUT * 1000)}")
+            try:
+                with self._conn:
+                    yield
+            finally:
+                self._conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+
+    def _lookup(self, key: Hashable) -> Any:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM cache WHERE name = ? AND key = ? AND expires_at > ?",
+                    (self.name, _encode_key(key), self._clock())
+                ).fetchone()
+        except sqlite3.OperationalError as e:
+            self.busy += 1
+            logger.debug(f"Cache compartilhado {self.name} ocupado na leitura ({e}); tratando como miss")
+            return _MISSING
+        return _MISSING if row is None else json.loads(row[0])
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor em cache ou `default` se ausente/expirado"""
+        value = self._lookup(key)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: int = 0):
+        """
+        Armazena um valor; `ttl` sobrescreve o TTL padrão
+
+        `size` existe pela compatibilidade com TTLCache: aqui `maxbytes`
+        mede o JSON gravado.
+        """
+        now = self._clock()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (name, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (self.name, _encode_key(key), json.dumps(value, ensure_ascii=False), expires_at)
+                )
+                self._conn.execute("DELETE FROM cache WHERE name = ? AND expires_at <= ?", (self.name, now))
+                excess = self._conn.execute(
+                    "SELECT COUNT(*) FROM cache WHERE name = ?", (self.name,)
+                ).fetchone()[0] - self.maxsize
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM cache WHERE name = ? AND key IN "
+                        "(SELECT key FROM cache WHERE name = ? ORDER BY expires_at LIMIT ?)",
+                        (self.name, self.name, excess)
+                    )
+                if self.maxbytes is not None:
+                    excess = self._conn.execute(
+                        "SELECT COALESCE(SUM(length(value)), 0) FROM cache WHERE name = ?", (self.name,)
+                    ).fetchone()[0] - self.maxbytes
+                    if excess > 0:
+                        evicted = []
+                        for raw, length in self._conn.execute(
+                            "SELECT key, length(value) FROM cache WHERE name = ? ORDER BY expires_at", (self.name,)
+                        ).fetchall():
+                            if excess <= 0:
+                                break
+                            evicted.append((self.name, raw))
+                            excess -= length
+                        self._conn.executemany("DELETE FROM cache WHERE name = ? AND key = ?", evicted)
+        except sqlite3.OperationalError as e:
+            # Cache é melhor esforço: sem esperar pelo worker que está gravando
+            self.busy += 1
+            logger.debug(f"Cache compartilhado {self.name} ocupado na gravação ({e}); entrada descartada")
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def __len__(self) -> int:
+        try:
+            with self._lock:
+                return self._conn.execute(
+                    "SELECT COUNT(*) FROM cache WHERE name = ? AND expires_at > ?",
+                    (self.name, self._clock())
+                ).fetchone()[0]
+        except sqlite3.OperationalError:
+            self.busy += 1
+            return 0
+
+    def invalidate(self, key: Hashable):
+        """Remove uma entrada específica (em todos os processos)"""
+        with self._invalidating():
+            self._conn.execute("DELETE FROM cache WHERE name = ? AND key = ?", (self.name, _encode_key(key)))
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """Remove todas as entradas cuja chave satisfaz o predicado"""
+        with self._invalidating():
+            keys = [row[0] for row in self._conn.execute("SELECT key FROM cache WHERE name = ?", (self.name,))]
+            self._conn.executemany(
+                "DELETE FROM cache WHERE name = ? AND key = ?",
+                [(self.name, raw) for raw in keys if predicate(_decode_key(raw))]
+            )
+
+    def clear(self):
+        """Esvazia o cache"""
+        with self._invalidating():
+            self._conn.execute("DELETE FROM cache WHERE name = ?", (self.name,))
+
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas de uso (acertos/erros deste processo)"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "shared": self.path,
+            "busy": self.busy,
+            **({"maxbytes": self.maxbytes} if self.maxbytes is not None else {}),
+        }
+
+
+def make_cache(name: str, maxsize: int, ttl: float,
+               maxbytes: Optional[int] = None) -> Union[TTLCache, SharedTTLCache]:
+    """
+    Cache em memória do processo ou, com MCP_SHARED_DIR definido (modo
+    prefork), em SQLite compartilhado por todos os workers
+
+    Args:
+        name: Nome do cache (separa as entradas no arquivo compartilhado)
+        maxsize: Número máximo de entradas
+        ttl: Tempo de vida padrão (s)
+        maxbytes: Limite do total em bytes das entradas (opcional)
+    """
+    shared_dir = os.getenv("MCP_SHARED_DIR")
+    if shared_dir:
+        return SharedTTLCache(os.path.join(shared_dir, SHARED_CACHE_FILE), name, maxsize, ttl, maxbytes=maxbytes)
+    return TTLCache(maxsize=maxsize, ttl=ttl, maxbytes=maxbytes)
@@ -7,48 +7,60 @@ import asyncio
 import json
 import logging
 import os
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
 from urllib.parse import urljoin
 
-import httpx
 from aiohttp import web
 
+from src.utils.http_client import JiraHttpClient
+from src.utils.metrics import CONTENT_TYPE, REGISTRY
+
 logger = logging.getLogger(__name__)
 
 class HealthChecker:
     """Classe para verificações de saúde do sistema"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[JiraHttpClient] = None,
+                 probe_interval: Optional[float] = None):
         self.jira_url = os.getenv("JIRA_URL")
         self.jira_username = os.getenv("JIRA_USERNAME")
         self.jira_api_token = os.getenv("JIRA_API_TOKEN")
         self.org_id = os.getenv("ORG_ID")
         self.admin_api_key = os.getenv("ADMIN_API_KEY")
+        
+        # Cliente HTTP compartilhado (pool keep-alive)
+        self._owns_http = http is None
+        self.http = http or JiraHttpClient.from_env()
+        
+        # Status em cache, atualizado por um loop de verificação em segundo plano
+        self.probe_interval = probe_interval or float(os.getenv("HEALTH_PROBE_INTERVAL", 15))
+        self.max_staleness = float(os.getenv("HEALTH_MAX_STALENESS", self.probe_interval * 3))
+        self._cached_status: Optional[Dict[str, Any]] = None
+        self._cached_at: Optional[float] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
     
     async def check_jira_connectivity(self) -> Dict[str, Any]:
         """Verificar conectividade com JIRA"""
         try:
             url = urljoin(self.jira_url, "/rest/api/3/myself")
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    url,
-                    auth=(self.jira_username, self.jira_api_token)
-                )
-                
-                if response.status_code == 200:
-                    user_data = response.json()
-                    return {
-                        "status": "healthy",
-                        "message": f"Conectado como {user_data.get('displayName', 'Unknown')}",
-                        "user": user_data.get("accountId")
-                    }
-                else:
-                    return {
-                        "status": "unhealthy",
-                        "message": f"Erro HTTP {response.status_code}",
-                        "error": response.text
-                    }
+            response = await self.http.get(url, timeout=10.0)
+            
+            if response.status_code == 200:
+                user_data = response.json()
+                return {
+                    "status": "healthy",
+                    "message": f"Conectado como {user_data.get('displayName', 'Unknown')}",
+                    "user": user_data.get("accountId")
+                }
+            else:
+                return {
+                    "status": "unhealthy",
+                    "message": f"Erro HTTP {response.status_code}",
+                    "error": response.text
+                }
         except Exception as e:
             return {
                 "status": "unhealthy",
@@ -59,27 +71,23 @@ class HealthChecker:
     async def check_org_api_connectivity(self) -> Dict[str, Any]:
         """Verificar conectividade com Organizations API"""
         try:
-            url = f"https://api.atlassian.com/admin/v1/orgs/{self.org_id}"
+            url = self.http.org_api(self.org_id)
+            
+            response = await self.http.get(url, api="org", timeout=10.0)
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    url,
-                    headers={"Authorization": f"Bearer {self.admin_api_key}"}
-                )
-                
-                if response.status_code == 200:
-                    org_data = response.json()
-                    return {
-                        "status": "healthy",
-                        "message": f"Conectado à organização {org_data.get('name', 'Unknown')}",
-                        "org_id": self.org_id
-                    }
-                else:
-                    return {
-                        "status": "unhealthy",
-                        "message": f"Erro HTTP {response.status_code}",
-                        "error": response.text
-                    }
+            if response.status_code == 200:
+                org_data = response.json()
+                return {
+                    "status": "healthy",
+                    "message": f"Conectado à organização {org_data.get('name', 'Unknown')}",
+                    "org_id": self.org_id
+                }
+            else:
+                return {
+                    "status": "unhealthy",
+                    "message": f"Erro HTTP {response.status_code}",
+                    "error": response.text
+                }
         except Exception as e:
             return {
                 "status": "unhealthy",
@@ -120,10 +128,16 @@ class HealthChecker:
     
     async def get_full_health_status(self) -> Dict[str, Any]:
         """Obter status completo de saúde do sistema"""
+        # As verificações são independentes: executar em paralelo
+        environment, jira_connectivity, org_api_connectivity = await asyncio.gather(
+            self.check_environment_variables(),
+            self.check_jira_connectivity(),
+            self.check_org_api_connectivity()
+        )
         checks = {
-            "environment": await self.check_environment_variables(),
-            "jira_connectivity": await self.check_jira_connectivity(),
-            "org_api_connectivity": await self.check_org_api_connectivity()
+            "environment": environment,
+            "jira_connectivity": jira_connectivity,
+            "org_api_connectivity": org_api_connectivity
         }
         
         # Determinar status geral
@@ -134,44 +148,128 @@ class HealthChecker:
             "status": overall_status,
             "timestamp": asyncio.get_event_loop().time(),
             "checks": checks,
+            "circuit_breakers": self.http.breakers.open_circuits(),
             "version": "1.0.0",
             "port": int(os.getenv("MCP_PORT", 6000))
         }
+    
+    async def refresh(self) -> Dict[str, Any]:
+        """Executa as verificações e atualiza o status em cache"""
+        requested_at = time.time()
+        async with self._refresh_lock:
+            # Outro chamador concluiu as verificações enquanto este aguardava
+            if self._cached_at is not None and self._cached_at >= requested_at:
+                return self._cached_status
+            status = await self.get_full_health_status()
+            self._cached_status = status
+            self._cached_at = time.time()
+            return status
+    
+    async def _probe_loop(self):
+        """Loop que mantém o status em cache atualizado"""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Erro na verificação de saúde em segundo plano: {e}")
+            await asyncio.sleep(self.probe_interval)
+    
+    def start(self):
+        """Inicia o loop de verificação em segundo plano"""
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe_loop())
+            logger.info(f"Verificação de saúde em segundo plano a cada {self.probe_interval}s")
+    
+    async def stop(self):
+        """Para o loop de verificação e libera o pool HTTP próprio"""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+        if self._owns_http:
+            await self.http.aclose()
+    
+    async def get_cached_status(self) -> Dict[str, Any]:
+        """
+        Status de saúde a partir do cache, sem chamadas externas
+        
+        Só executa as verificações na hora se ainda não houver nenhum
+        resultado. Um cache mais antigo que `max_staleness` indica que o
+        loop de verificação parou, e o status é reportado como unhealthy.
+        """
+        if self._cached_status is None:
+            await self.refresh()
+        
+        staleness = time.time() - self._cached_at
+        status = dict(self._cached_status)
+        status["checked_at"] = self._cached_at
+        status["staleness_seconds"] = round(staleness, 3)
+        if staleness > self.max_staleness:
+            status["status"] = "unhealthy"
+            status["stale"] = True
+        else:
+            status["stale"] = False
+        return status
+
+# Chave da instância compartilhada de HealthChecker na aplicação aiohttp
+HEALTH_CHECKER_KEY = web.AppKey("health_checker", HealthChecker)
 
 # Handler para endpoint HTTP de health check
 async def health_endpoint(request):
-    """Endpoint HTTP para verificação de saúde"""
-    health_checker = HealthChecker()
-    health_status = await health_checker.get_full_health_status()
+    """Endpoint HTTP para verificação de saúde (servido do cache)"""
+    health_checker = request.app[HEALTH_CHECKER_KEY]
+    health_status = await health_checker.get_cached_status()
     
     status_code = 200 if health_status["status"] == "healthy" else 503
     
-    return web.json_response(
-        health_status,
-        status=status_code,
-        headers={"Content-Type": "application/json"}
+    return web.json_response(health_status, status=status_code)
+
+# Handler para endpoint de métricas (formato Prometheus)
+async def metrics_endpoint(request):
+    """Endpoint HTTP com as métricas do processo"""
+    return web.Response(
+        body=REGISTRY.render().encode("utf-8"),
+        headers={"Content-Type": CONTENT_TYPE}
     )
 
 # Função para criar aplicação web simples com health check
-def create_health_app():
+def create_health_app(health_checker: Optional[HealthChecker] = None):
     """Criar aplicação web para health check"""
     app = web.Application()
+    app[HEALTH_CHECKER_KEY] = health_checker or HealthChecker()
+    
+    async def start_probe(app):
+        app[HEALTH_CHECKER_KEY].start()
+    
+    async def stop_probe(app):
+        await app[HEALTH_CHECKER_KEY].stop()
+    
+    app.on_startup.append(start_probe)
+    app.on_cleanup.append(stop_probe)
+    
     app.router.add_get('/health', health_endpoint)
+    app.router.add_get('/metrics', metrics_endpoint)
     app.router.add_get('/', health_endpoint)  # Root também retorna health
     
     return app
 
-async def run_health_server(port: int = 6000):
-    """Executar servidor de health check"""
-    app = create_health_app()
-    
-    runner = web.AppRunner(app)
+async def start_health_server(port: int, health_checker: Optional[HealthChecker] = None) -> web.AppRunner:
+    """Iniciar /health e /metrics no loop atual (retorna o runner para cleanup)"""
+    runner = web.AppRunner(create_health_app(health_checker), access_log=None)
     await runner.setup()
     
     site = web.TCPSite(runner, '0.0.0.0', port)
     await site.start()
     
-    logger.info(f"Health check server rodando na porta {port}")
+    logger.info(f"Health check e métricas na porta {port}")
+    return runner
+
+async def run_health_server(port: int = 6000):
+    """Executar servidor de health check"""
+    runner = await start_health_server(port)
     
     # Manter servidor rodando
     try:
@@ -0,0 +1,339 @@
+"""
+Cliente HTTP compartilhado para JIRA e Organizations API
+Mantém um pool de conexões keep-alive por servidor, evitando um novo
+handshake TCP+TLS a cada chamada de ferramenta
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from src.utils.metrics import (
+    CIRCUIT_REJECTIONS,
+    UPSTREAM_COALESCED,
+    UPSTREAM_LATENCY,
+    UPSTREAM_REQUESTS,
+    UPSTREAM_RETRIES,
+)
+from src.utils.rate_limiter import RateLimiter, get_shared_rate_limiter
+from src.utils.tracing import get_tracer
+from src.utils.retry import (
+    IDEMPOTENT_METHODS,
+    RETRYABLE_STATUS,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    RetryPolicy,
+    get_shared_breakers,
+)
+
+logger = logging.getLogger(__name__)
+
+# ORG_API_URL permite apontar a Organizations API para outro host (ex: mock local)
+ORG_API_BASE = f"{os.getenv('ORG_API_URL', 'https://api.atlassian.com').rstrip('/')}/admin/v1/orgs"
+
+# Segmentos de caminho que identificam recursos (ids, chaves de projeto/issue, emails...)
+_ID_SEGMENT = re.compile(r"^(\d+|[A-Z][A-Z0-9_]*(-\d+)?|[0-9a-fA-F-]{16,}|[^/]*@[^/]*|\d+:[\w-]+)$")
+
+
+def endpoint_template(url: str) -> str:
+    """Normaliza a URL em host + caminho com ids trocados por {id}"""
+    parsed = httpx.URL(url)
+    segments = parsed.path.split("/")
+    for i, segment in enumerate(segments):
+        # A versão da API (/rest/api/3) não é um id
+        if i > 0 and segments[i - 1] == "api":
+            continue
+        if _ID_SEGMENT.match(segment):
+            segments[i] = "{id}"
+    return f"{parsed.host}{'/'.join(segments)}"
+
+
+def _cap_timeout(timeout: Any, remaining: float) -> httpx.Timeout:
+    """
+    Timeout da tentativa limitado ao prazo restante
+
+    Aceita o que o httpx aceita (número, httpx.Timeout ou None = sem
+    limite) e limita cada fase (connect, read, write, pool).
+    """
+    def cap(value: Optional[float]) -> float:
+        return max(0.1, remaining if value is None else min(value, remaining))
+
+    if isinstance(timeout, httpx.Timeout):
+        return httpx.Timeout(
+            connect=cap(timeout.connect), read=cap(timeout.read),
+            write=cap(timeout.write), pool=cap(timeout.pool)
+        )
+    return httpx.Timeout(cap(None if timeout is None else float(timeout)))
+
+
+def _env_int(name: str, default: int) -> int:
+    """Lê um inteiro de variável de ambiente, com valor padrão"""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Valor inválido para {name}, usando {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Lê um float de variável de ambiente, com valor padrão"""
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Valor inválido para {name}, usando {default}")
+        return default
+
+
+class JiraHttpClient:
+    """Camada HTTP de longa duração compartilhada pelas ferramentas do servidor"""
+
+    def __init__(self, jira_url: str, username: str, api_token: str,
+                 admin_api_key: Optional[str] = None,
+                 max_connections: Optional[int] = None,
+                 max_keepalive_connections: Optional[int] = None,
+                 keepalive_expiry: Optional[float] = None,
+                 timeout: Optional[float] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 breakers: Optional[CircuitBreakerRegistry] = None):
+        self.jira_url = (jira_url or "").rstrip('/')
+        self.username = username or ""
+        self.api_token = api_token or ""
+        self.admin_api_key = admin_api_key or ""
+
+        # Limites do pool (configuráveis via ambiente)
+        self.limits = httpx.Limits(
+            max_connections=max_connections or _env_int("HTTP_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=max_keepalive_connections or _env_int("HTTP_MAX_KEEPALIVE", 10),
+            keepalive_expiry=keepalive_expiry or _env_float("HTTP_KEEPALIVE_EXPIRY", 30.0),
+        )
+        self.timeout = timeout or _env_float("HTTP_TIMEOUT", 30.0)
+
+        # Limitador de taxa por host (compartilhado no processo por padrão)
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.max_throttle_retries = _env_int("RATE_LIMIT_MAX_RETRIES", 5)
+
+        # Repetição de falhas transitórias e circuit breaker por endpoint
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breakers = breakers or get_shared_breakers()
+
+        # Cabeçalhos de autenticação pré-montados
+        auth_b64 = base64.b64encode(
+            f"{self.username}:{self.api_token}".encode('ascii')
+        ).decode('ascii')
+        self.jira_headers = {
+            "Authorization": f"Basic {auth_b64}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        self.org_headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        if self.admin_api_key:
+            self.org_headers["Authorization"] = f"Bearer {self.admin_api_key}"
+
+        # GETs idênticos em andamento compartilham uma única requisição
+        self.coalesce_gets = os.getenv("HTTP_COALESCE_GETS", "true").lower() != "false"
+        self._inflight: Dict[Tuple[Any, ...], "asyncio.Task[httpx.Response]"] = {}
+        self.coalesced = 0
+
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_env(cls) -> "JiraHttpClient":
+        """Cria o cliente a partir das variáveis de ambiente padrão"""
+        return cls(
+            jira_url=os.getenv("JIRA_URL", ""),
+            username=os.getenv("JIRA_USERNAME", ""),
+            api_token=os.getenv("JIRA_API_TOKEN", ""),
+            admin_api_key=os.getenv("ADMIN_API_KEY", ""),
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente httpx subjacente, criado sob demanda"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            logger.info(
+                f"Pool HTTP criado (max_connections={self.limits.max_connections}, "
+                f"keepalive={self.limits.max_keepalive_connections})"
+            )
+        return self._client
+
+    def jira_api(self, path: str) -> str:
+        """Monta a URL completa da REST API v3 do JIRA"""
+        return f"{self.jira_url}/rest/api/3/{path.lstrip('/')}"
+
+    def org_api(self, org_id: str, path: str = "") -> str:
+        """Monta a URL completa da Organizations API"""
+        url = f"{ORG_API_BASE}/{org_id}"
+        return f"{url}/{path.lstrip('/')}" if path else url
+
+    async def request(self, method: str, url: str, api: str = "jira",
+                      idempotent: Optional[bool] = None, **kwargs: Any) -> httpx.Response:
+        """
+        Executa uma requisição usando o pool compartilhado
+
+        GETs idênticos (mesma API, URL, parâmetros e cabeçalhos extras) feitos
+        ao mesmo tempo compartilham uma única requisição e a mesma resposta.
+
+        Args:
+            method: Método HTTP
+            url: URL completa
+            api: "jira" (Basic auth) ou "org" (Bearer da Organizations API)
+            idempotent: Permite repetir após falha transitória (padrão: pelo método;
+                use True para POSTs somente leitura, como buscas)
+            **kwargs: Argumentos repassados ao httpx (params, json, timeout...)
+
+        Returns:
+            Resposta HTTP (após aguardar e repetir em caso de 429 e, para chamadas
+            idempotentes, de 5xx/timeouts)
+
+        Raises:
+            CircuitOpenError: O circuito do endpoint está aberto
+        """
+        method = method.upper()
+        if method != "GET" or not self.coalesce_gets:
+            return await self._request(method, url, api, idempotent, **kwargs)
+
+        key = (
+            api,
+            str(httpx.URL(url, params=kwargs.get("params"))),
+            tuple(sorted((kwargs.get("headers") or {}).items())),
+        )
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request(method, url, api, idempotent, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_inflight(key, t))
+        else:
+            self.coalesced += 1
+            UPSTREAM_COALESCED.inc(endpoint=endpoint_template(url))
+        # shield: o cancelamento de um chamador não cancela a requisição dos demais
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: Tuple[Any, ...], task: "asyncio.Task[httpx.Response]"):
+        """Remove a requisição concluída do mapa de GETs em andamento"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Marca a exceção como observada mesmo se todos os chamadores desistiram
+            task.exception()
+
+    async def _request(self, method: str, url: str, api: str,
+                       idempotent: Optional[bool], **kwargs: Any) -> httpx.Response:
+        """Requisição com circuit breaker, repetições e limitador de taxa"""
+        headers: Dict[str, str] = dict(self.org_headers if api == "org" else self.jira_headers)
+        headers.update(kwargs.pop("headers", None) or {})
+        host = httpx.URL(url).host
+        path = endpoint_template(url)
+        endpoint = f"{method} {path}"
+        breaker = self.breakers.get(endpoint)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        max_attempts = self.retry_policy.max_attempts if idempotent else 1
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.retry_policy.deadline
+        timeout = kwargs.pop("timeout", self.timeout)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            if not breaker.allow():
+                CIRCUIT_REJECTIONS.inc(endpoint=endpoint)
+                raise CircuitOpenError(endpoint, breaker.retry_in())
+
+            remaining = deadline - loop.time()
+            try:
+                response = await self._send_throttled(
+                    method, url, host, path, headers,
+                    timeout=_cap_timeout(timeout, remaining), **kwargs
+                )
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                breaker.record_failure()
+                delay = self.retry_policy.backoff(attempt)
+                if attempt >= max_attempts or loop.time() + delay >= deadline:
+                    raise
+                logger.warning(f"{endpoint}: {type(e).__name__}, tentativa {attempt} de {max_attempts}")
+                UPSTREAM_RETRIES.inc(method=method, endpoint=path, reason=type(e).__name__)
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code in RETRYABLE_STATUS:
+                breaker.record_failure()
+                delay = self.retry_policy.backoff(attempt)
+                if attempt >= max_attempts or loop.time() + delay >= deadline:
+                    return response
+                logger.warning(f"{endpoint}: HTTP {response.status_code}, tentativa {attempt} de {max_attempts}")
+                UPSTREAM_RETRIES.inc(method=method, endpoint=path, reason=str(response.status_code))
+                await response.aclose()
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code == 429:
+                # Limitada até o fim das esperas: o endpoint não foi exercitado
+                breaker.record_neutral()
+            else:
+                breaker.record_success()
+            return response
+
+    async def _send_throttled(self, method: str, url: str, host: str, path: str,
+                              headers: Dict[str, str], **kwargs: Any) -> httpx.Response:
+        """Envia a requisição respeitando o limitador (repete após 429)"""
+        # Respostas 429 não foram processadas pelo servidor: é seguro repetir
+        # qualquer método depois de aguardar o tempo indicado
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(host)
+            with get_tracer().upstream_span(method, path) as span:
+                started = time.perf_counter()
+                try:
+                    response = await self.client.request(method, url, headers=headers, **kwargs)
+                except Exception:
+                    UPSTREAM_REQUESTS.inc(method=method, endpoint=path, status="error")
+                    raise
+                finally:
+                    UPSTREAM_LATENCY.observe(time.perf_counter() - started, method=method, endpoint=path)
+                UPSTREAM_REQUESTS.inc(method=method, endpoint=path, status=response.status_code)
+                if span is not None:
+                    span.set(**{
+                        "http.status_code": response.status_code,
+                        "http.request.body.size": len(response.request.content),
+                        "http.response.body.size": len(response.content),
+                        "http.throttle_retry": attempt,
+                    })
+                    if response.status_code >= 400:
+                        span.status = "error"
+            delay = self.rate_limiter.observe(host, response)
+            if delay is None or attempt >= self.max_throttle_retries:
+                return response
+            attempt += 1
+            UPSTREAM_RETRIES.inc(method=method, endpoint=path, reason="429")
+            await response.aclose()
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self):
+        """Fecha o pool de conexões"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Pool HTTP encerrado")
+        self._client = None
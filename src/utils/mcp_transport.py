@@ -0,0 +1,140 @@
+"""
+Transporte HTTP para os servidores MCP
+Streamable HTTP (/mcp) e SSE legado (/sse + /messages/) na mesma porta:
+um único processo atende muitas sessões de clientes, compartilhando o
+pool HTTP e os caches do servidor
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+import uvicorn
+from mcp.server import Server
+from mcp.server.sse import SseServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+
+from src.utils.metrics import CONTENT_TYPE, REGISTRY
+from src.utils.prefork import worker_id, worker_sockets
+
+if TYPE_CHECKING:
+    # health_check importa o aiohttp; só é carregado quando usado
+    from src.utils.health_check import HealthChecker
+
+logger = logging.getLogger(__name__)
+
+
+def transport_from_env() -> str:
+    """MCP_TRANSPORT: stdio (padrão) ou http"""
+    transport = os.getenv("MCP_TRANSPORT", "stdio").strip().lower()
+    if transport not in ("stdio", "http"):
+        logger.warning(f"MCP_TRANSPORT desconhecido: {transport}; usando stdio")
+        return "stdio"
+    return transport
+
+
+class _StreamableHTTPEndpoint:
+    """Endpoint ASGI (o Starlette repassa scope/receive/send sem adaptar)"""
+
+    def __init__(self, session_manager: StreamableHTTPSessionManager):
+        self.session_manager = session_manager
+
+    async def __call__(self, scope, receive, send):
+        await self.session_manager.handle_request(scope, receive, send)
+
+
+def create_http_app(server: Server, health_checker: Optional["HealthChecker"] = None,
+                    stateless: Optional[bool] = None) -> Starlette:
+    """
+    Aplicação ASGI com os transportes MCP, /health e /metrics
+
+    Args:
+        server: Servidor MCP de baixo nível (as sessões compartilham a instância)
+        health_checker: Verificador usado em /health (opcional)
+        stateless: Sem sessão entre requisições (MCP_HTTP_STATELESS; padrão
+            ativado no modo prefork)
+    """
+    prefork = worker_id() is not None
+    if stateless is None:
+        # Entre workers não há sessão compartilhada: cada requisição pode cair em outro processo
+        default = "true" if prefork else "false"
+        stateless = (os.getenv("MCP_HTTP_STATELESS") or default).lower() in ("1", "true", "yes")
+
+    session_manager = StreamableHTTPSessionManager(
+        app=server,
+        stateless=stateless,
+        json_response=os.getenv("MCP_HTTP_JSON_RESPONSE", "false").lower() in ("1", "true", "yes"),
+    )
+    sse = SseServerTransport("/messages/")
+
+    async def handle_sse(request: Request) -> Response:
+        async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+        return Response()
+
+    async def health(request: Request) -> Response:
+        if health_checker is None:
+            return JSONResponse({"status": "healthy"})
+        status = await health_checker.get_cached_status()
+        return JSONResponse(status, status_code=200 if status["status"] == "healthy" else 503)
+
+    async def metrics(request: Request) -> Response:
+        return Response(REGISTRY.render(), headers={"Content-Type": CONTENT_TYPE})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        if health_checker is not None:
+            health_checker.start()
+        # Modo prefork: snapshot periódico para o /metrics agregado
+        snapshots = asyncio.create_task(REGISTRY.snapshot_loop()) if REGISTRY.multiprocess else None
+        try:
+            async with session_manager.run():
+                yield
+        finally:
+            if snapshots is not None:
+                snapshots.cancel()
+                await asyncio.gather(snapshots, return_exceptions=True)
+            if health_checker is not None:
+                await health_checker.stop()
+
+    routes = [Route("/mcp", endpoint=_StreamableHTTPEndpoint(session_manager))]
+    if prefork:
+        # O POST em /messages/ precisa chegar ao worker que mantém o stream /sse
+        if worker_id() == 0:
+            logger.warning("SSE legado (/sse) desativado com MCP_WORKERS > 1; use Streamable HTTP em /mcp")
+    else:
+        routes += [
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Mount("/messages/", app=sse.handle_post_message),
+        ]
+    routes += [
+        Route("/health", endpoint=health, methods=["GET"]),
+        Route("/metrics", endpoint=metrics, methods=["GET"]),
+    ]
+
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+async def serve_http(server: Server, port: int, host: Optional[str] = None,
+                     health_checker: Optional["HealthChecker"] = None):
+    """Executa o servidor MCP via HTTP até o processo ser encerrado"""
+    host = host or os.getenv("MCP_HOST", "0.0.0.0")
+    app = create_http_app(server, health_checker)
+    config = uvicorn.Config(
+        app, host=host, port=port,
+        log_level=os.getenv("LOG_LEVEL", "info").lower(),
+        access_log=False,
+    )
+    # Modo prefork: cada worker abre a porta com SO_REUSEPORT
+    sockets = worker_sockets(host, port)
+    if worker_id() is None:
+        logger.info(f"Transporte MCP HTTP em http://{host}:{port}/mcp (SSE legado em /sse)")
+    else:
+        logger.info(f"Worker {worker_id()} (pid {os.getpid()}) em http://{host}:{port}/mcp")
+    await uvicorn.Server(config).serve(sockets=sockets)
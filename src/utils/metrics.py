@@ -0,0 +1,412 @@
+"""
+Métricas no formato de exposição do Prometheus
+Registro em memória (sem dependências externas) com contadores,
+histogramas e gauges calculados na coleta, servido em /metrics
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+# Buckets de latência em segundos (chamadas de ferramenta e upstream)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def items(self) -> List[Tuple[LabelValues, Any]]:
+        raise NotImplementedError
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado serializável em JSON (agregação entre workers)"""
+        return {
+            "kind": self.kind,
+            "help": self.help,
+            "labelnames": list(self.labelnames),
+            "values": [[list(key), value] for key, value in self.items()],
+        }
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Contador monotônico com rótulos"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def items(self) -> List[Tuple[LabelValues, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self.items())
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Histograma cumulativo com rótulos"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # rótulos -> (contagem por bucket, soma, total)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            counts, total_sum, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total_sum + value, count + 1)
+
+    def items(self) -> List[Tuple[LabelValues, Tuple[List[int], float, int]]]:
+        with self._lock:
+            return [(key, (list(counts), s, c)) for key, (counts, s, c) in self._values.items()]
+
+    def snapshot(self) -> Dict[str, Any]:
+        entry = super().snapshot()
+        entry["buckets"] = list(self.buckets)
+        return entry
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total_sum, count) in sorted(self.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            labels = _format_labels(self.labelnames + ("le",), key + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            base = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{base} {_format_value(total_sum)}")
+            lines.append(f"{self.name}_count{base} {count}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class GaugeFunc(_Metric):
+    """Gauge cujo valor é calculado no momento da coleta"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str],
+                 collect: Callable[[], Dict[LabelValues, float]]):
+        super().__init__(name, help_text, labelnames)
+        self._collect = collect
+
+    def items(self) -> List[Tuple[LabelValues, float]]:
+        return list(self._collect().items())
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self.items())
+        ]
+
+    def clear(self):
+        pass
+
+
+class Gauge(_Metric):
+    """Gauge com valor definido explicitamente"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def items(self) -> List[Tuple[LabelValues, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self.items())
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas do processo e caches observados
+
+    No modo prefork cada worker grava um snapshot em JSON no diretório
+    compartilhado; render() soma contadores e histogramas de todos os
+    workers e expõe os gauges com o rótulo `worker`.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._caches: Dict[str, Any] = {}
+        self._shared_dir: Optional[str] = None
+        self._worker: Optional[int] = None
+        self.register(GaugeFunc(
+            "jira_mcp_cache_hit_ratio", "Fração de acertos por cache",
+            ("cache",), lambda: {(name,): cache.stats()["hit_ratio"] for name, cache in self._caches.items()}
+        ))
+        self.register(GaugeFunc(
+            "jira_mcp_cache_requests", "Consultas aos caches por resultado",
+            ("cache", "result"), self._cache_requests
+        ))
+        self.register(GaugeFunc(
+            "jira_mcp_cache_entries", "Entradas em cada cache",
+            ("cache",), lambda: {(name,): cache.stats()["size"] for name, cache in self._caches.items()}
+        ))
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._metrics.get(name) or self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._metrics.get(name) or self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def register_cache(self, name: str, cache: Any):
+        """Expõe hits/misses de um cache com stats() (ex: TTLCache)"""
+        self._caches[name] = cache
+
+    def _cache_requests(self) -> Dict[LabelValues, float]:
+        values: Dict[LabelValues, float] = {}
+        for name, cache in self._caches.items():
+            stats = cache.stats()
+            values[(name, "hit")] = stats["hits"]
+            values[(name, "miss")] = stats["misses"]
+        return values
+
+    def metrics(self) -> List[_Metric]:
+        return list(self._metrics.values())
+
+    @property
+    def multiprocess(self) -> bool:
+        return self._shared_dir is not None
+
+    def enable_multiprocess(self, directory: str, worker: int):
+        """Ativa a agregação entre workers (snapshots em `directory`)"""
+        os.makedirs(directory, exist_ok=True)
+        self._shared_dir = directory
+        self._worker = worker
+
+    def write_snapshot(self):
+        """Grava o estado deste worker (substituição atômica do arquivo)"""
+        if self._shared_dir is None:
+            return
+        path = os.path.join(self._shared_dir, f"metrics-{self._worker}.json")
+        data = {name: metric.snapshot() for name, metric in self._metrics.items()}
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    async def snapshot_loop(self, interval: Optional[float] = None):
+        """Grava o snapshot periodicamente até ser cancelado"""
+        interval = interval or float(os.getenv("METRICS_SNAPSHOT_INTERVAL", 5))
+        try:
+            while True:
+                try:
+                    self.write_snapshot()
+                except OSError as e:
+                    logger.warning(f"Erro ao gravar snapshot de métricas: {e}")
+                await asyncio.sleep(interval)
+        finally:
+            try:
+                self.write_snapshot()
+            except OSError:
+                pass
+
+    def _merged(self) -> List[_Metric]:
+        """Métricas de todos os workers, a partir dos snapshots em disco"""
+        self.write_snapshot()
+        merged: Dict[str, _Metric] = {}
+        for path in sorted(glob.glob(os.path.join(self._shared_dir, "metrics-*.json"))):
+            worker = os.path.basename(path)[len("metrics-"):-len(".json")]
+            try:
+                with open(path, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, entry in snapshot.items():
+                labelnames = tuple(entry["labelnames"])
+                if entry["kind"] == "gauge":
+                    metric = merged.get(name) or merged.setdefault(name, Gauge(name, entry["help"], labelnames + ("worker",)))
+                    for key, value in entry["values"]:
+                        metric._values[tuple(key) + (worker,)] = value
+                elif entry["kind"] == "histogram":
+                    metric = merged.get(name) or merged.setdefault(name, Histogram(name, entry["help"], labelnames, entry["buckets"]))
+                    for key, (counts, total_sum, count) in entry["values"]:
+                        previous = metric._values.get(tuple(key))
+                        if previous is not None:
+                            counts = [a + b for a, b in zip(previous[0], counts)]
+                            total_sum += previous[1]
+                            count += previous[2]
+                        metric._values[tuple(key)] = (counts, total_sum, count)
+                else:
+                    metric = merged.get(name) or merged.setdefault(name, Counter(name, entry["help"], labelnames))
+                    for key, value in entry["values"]:
+                        metric._values[tuple(key)] = metric._values.get(tuple(key), 0.0) + value
+        return list(merged.values())
+
+    def render(self) -> str:
+        """Texto no formato de exposição do Prometheus"""
+        metrics = self._merged() if self.multiprocess else self._metrics.values()
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_CALLS = REGISTRY.counter(
+    "jira_mcp_tool_calls_total", "Chamadas de ferramentas MCP", ("server", "tool")
+)
+TOOL_ERRORS = REGISTRY.counter(
+    "jira_mcp_tool_errors_total", "Chamadas de ferramentas que falharam", ("server", "tool")
+)
+TOOL_LATENCY = REGISTRY.histogram(
+    "jira_mcp_tool_duration_seconds", "Duração das chamadas de ferramentas", ("server", "tool")
+)
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "jira_mcp_upstream_requests_total", "Requisições às APIs da Atlassian",
+    ("method", "endpoint", "status")
+)
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "jira_mcp_upstream_duration_seconds", "Duração das requisições às APIs da Atlassian",
+    ("method", "endpoint")
+)
+UPSTREAM_RETRIES = REGISTRY.counter(
+    "jira_mcp_upstream_retries_total", "Repetições de requisições ao upstream por motivo",
+    ("method", "endpoint", "reason")
+)
+UPSTREAM_COALESCED = REGISTRY.counter(
+    "jira_mcp_upstream_coalesced_total", "GETs atendidos por uma requisição idêntica em andamento",
+    ("endpoint",)
+)
+CIRCUIT_REJECTIONS = REGISTRY.counter(
+    "jira_mcp_circuit_rejections_total", "Chamadas rejeitadas por circuito aberto", ("endpoint",)
+)
+RESULTS_TRUNCATED = REGISTRY.counter(
+    "jira_mcp_results_truncated_total", "Resultados acima de RESULT_MAX_BYTES entregues com continuação",
+    ("server", "tool")
+)
+
+
+def is_error_result(result: Any) -> bool:
+    """Resultados {"status": "error"} contam como erro mesmo sem exceção"""
+    return isinstance(result, dict) and result.get("status") == "error"
+
+
+@contextmanager
+def track_tool(server: str, tool: str) -> Iterator[Dict[str, Any]]:
+    """
+    Mede uma chamada de ferramenta (contagem, erros e duração)
+
+    Uso:
+        with track_tool("simple", name) as call:
+            call["result"] = await ...
+    """
+    call: Dict[str, Any] = {}
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield call
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        TOOL_CALLS.inc(server=server, tool=tool)
+        TOOL_LATENCY.observe(time.perf_counter() - started, server=server, tool=tool)
+        if failed or is_error_result(call.get("result")):
+            TOOL_ERRORS.inc(server=server, tool=tool)
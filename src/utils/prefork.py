@@ -0,0 +1,195 @@
+"""
+Modo prefork do transporte HTTP
+O processo pai cria MCP_WORKERS processos filhos; cada worker abre a
+MCP_PORT com SO_REUSEPORT e o kernel distribui as conexões entre eles,
+usando todos os núcleos para a serialização dos resultados. Os workers
+compartilham, via MCP_SHARED_DIR, um cache SQLite e os snapshots de
+métricas agregados em /metrics
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Limites de taxa divididos entre os workers (o total continua o configurado)
+RATE_LIMIT_VARS = ("JIRA_RATE_LIMIT", "ORG_API_RATE_LIMIT")
+RATE_LIMIT_DEFAULTS = {"JIRA_RATE_LIMIT": 10.0, "ORG_API_RATE_LIMIT": 5.0}
+
+_worker_id: Optional[int] = None
+# Socket aberto pelo pai quando o sistema não oferece SO_REUSEPORT
+_inherited_socket: Optional[socket.socket] = None
+
+
+def workers_from_env() -> int:
+    """MCP_WORKERS: número de processos do transporte HTTP (padrão 1)"""
+    try:
+        return max(1, int(os.getenv("MCP_WORKERS", 1)))
+    except ValueError:
+        logger.warning(f"MCP_WORKERS inválido: {os.getenv('MCP_WORKERS')}; usando 1")
+        return 1
+
+
+def worker_id() -> Optional[int]:
+    """Índice do worker atual (None fora do modo prefork)"""
+    return _worker_id
+
+
+def is_primary_worker() -> bool:
+    """Processo único ou worker 0 (tarefas que não devem se repetir por worker)"""
+    return _worker_id in (None, 0)
+
+
+def bind_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    """Socket TCP em escuta na porta, opcionalmente com SO_REUSEPORT"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(int(os.getenv("MCP_BACKLOG", 2048)))
+    sock.set_inheritable(True)
+    return sock
+
+
+def worker_sockets(host: str, port: int) -> Optional[List[socket.socket]]:
+    """Sockets do worker para o uvicorn (None fora do modo prefork: o uvicorn abre a porta)"""
+    if _worker_id is None:
+        return None
+    if _inherited_socket is not None:
+        return [_inherited_socket]
+    return [bind_socket(host, port, reuse_port=True)]
+
+
+def _share_rate_limits(workers: int):
+    """Cada worker recebe 1/N dos limites por host configurados"""
+    for name in RATE_LIMIT_VARS:
+        try:
+            total = float(os.getenv(name) or RATE_LIMIT_DEFAULTS[name])
+        except ValueError:
+            continue
+        os.environ[name] = str(total / workers)
+
+
+def _worker_main(main: Callable[[], Awaitable[Any]], index: int, workers: int, shared_dir: str):
+    global _worker_id
+    _worker_id = index
+    # O uvicorn instala os próprios tratadores de SIGINT/SIGTERM
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    _share_rate_limits(workers)
+    REGISTRY.enable_multiprocess(shared_dir, index)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+def run_prefork(main: Callable[[], Awaitable[Any]], workers: Optional[int] = None) -> int:
+    """
+    Executa `main` em N processos filhos e os supervisiona
+
+    Workers que terminam inesperadamente são recriados; SIGTERM/SIGINT
+    no pai encerram todos os workers.
+
+    Args:
+        main: Corrotina principal do servidor (executada em cada worker)
+        workers: Número de workers (padrão: MCP_WORKERS)
+
+    Returns:
+        Código de saída do processo pai
+    """
+    global _inherited_socket
+    workers = workers or workers_from_env()
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Modo prefork indisponível nesta plataforma; executando um único processo")
+        asyncio.run(main())
+        return 0
+
+    shared_dir = os.getenv("MCP_SHARED_DIR")
+    temporary_dir = None
+    if not shared_dir:
+        shared_dir = temporary_dir = tempfile.mkdtemp(prefix="jira-mcp-")
+        os.environ["MCP_SHARED_DIR"] = shared_dir
+    os.makedirs(shared_dir, exist_ok=True)
+    # Snapshots de uma execução anterior não entram na agregação
+    for name in os.listdir(shared_dir):
+        if name.startswith("metrics-"):
+            os.remove(os.path.join(shared_dir, name))
+
+    if not hasattr(socket, "SO_REUSEPORT"):
+        # Sem SO_REUSEPORT: os workers herdam um único socket aberto pelo pai
+        _inherited_socket = bind_socket(
+            os.getenv("MCP_HOST", "0.0.0.0"), int(os.getenv("MCP_PORT", 6000)), reuse_port=False
+        )
+
+    context = multiprocessing.get_context("fork")
+    processes: Dict[int, multiprocessing.Process] = {}
+    stopping = False
+
+    def start_worker(index: int):
+        process = context.Process(
+            target=_worker_main, args=(main, index, workers, shared_dir),
+            name=f"jira-mcp-worker-{index}", daemon=False
+        )
+        process.start()
+        processes[index] = process
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    previous_handlers = {
+        signum: signal.signal(signum, request_stop) for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+
+    logger.info(f"Iniciando {workers} workers na porta {os.getenv('MCP_PORT', 6000)} (diretório compartilhado: {shared_dir})")
+    try:
+        for index in range(workers):
+            start_worker(index)
+
+        while not stopping:
+            sentinels = {process.sentinel: index for index, process in processes.items()}
+            ready = multiprocessing.connection.wait(list(sentinels), timeout=1.0)
+            for sentinel in ready:
+                if stopping:
+                    break
+                index = sentinels[sentinel]
+                processes[index].join()
+                logger.error(f"Worker {index} terminou com código {processes[index].exitcode}; reiniciando")
+                # Evita reinícios em laço quando o worker falha ao subir
+                time.sleep(1.0)
+                start_worker(index)
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + float(os.getenv("MCP_WORKER_SHUTDOWN_TIMEOUT", 30))
+        for process in processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Worker {process.name} não encerrou a tempo; forçando")
+                process.kill()
+                process.join()
+        if _inherited_socket is not None:
+            _inherited_socket.close()
+        if temporary_dir is not None:
+            shutil.rmtree(temporary_dir, ignore_errors=True)
+
+    logger.info("Workers encerrados")
+    return 0
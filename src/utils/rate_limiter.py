@@ -0,0 +1,183 @@
+"""
+Limitador de taxa por host para as APIs da Atlassian
+Token bucket adaptativo: respeita 429/Retry-After e os cabeçalhos
+X-RateLimit-* e enfileira as chamadas em vez de deixá-las falhar
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+ORG_API_HOST = httpx.URL(os.getenv("ORG_API_URL", "https://api.atlassian.com")).host
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After em segundos (aceita número ou data HTTP)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """X-RateLimit-Reset (ISO 8601) em segundos a partir de agora"""
+    if not value:
+        return None
+    try:
+        when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Token bucket com fila FIFO e taxa ajustável"""
+
+    def __init__(self, rate: float, capacity: float, min_rate: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+        self.paused_until = 0.0
+        self.throttled = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Aguarda um token; chamadores são atendidos em ordem de chegada"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Suspende a emissão de tokens por `seconds`"""
+        now = self._clock()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0
+        self._updated = max(now, self.paused_until)
+
+    def slow_down(self):
+        """Reduz a taxa pela metade (até `min_rate`)"""
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def speed_up(self):
+        """Recupera a taxa gradualmente até o máximo configurado"""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class RateLimiter:
+    """Conjunto de token buckets, um por host (site JIRA e Organizations API)"""
+
+    def __init__(self, jira_rate: Optional[float] = None, org_rate: Optional[float] = None,
+                 burst: Optional[float] = None):
+        self.jira_rate = jira_rate or float(os.getenv("JIRA_RATE_LIMIT", 10))
+        self.org_rate = org_rate or float(os.getenv("ORG_API_RATE_LIMIT", 5))
+        self.burst = burst or float(os.getenv("RATE_LIMIT_BURST", 2))
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        """Bucket do host, criado sob demanda"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = self.org_rate if host == ORG_API_HOST else self.jira_rate
+            bucket = TokenBucket(rate, capacity=max(1.0, rate * self.burst))
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, host: str):
+        await self.bucket(host).acquire()
+
+    def observe(self, host: str, response: httpx.Response) -> Optional[float]:
+        """
+        Ajusta o bucket a partir da resposta
+
+        Returns:
+            Segundos a aguardar antes de repetir a requisição, se ela foi
+            limitada (429); None caso contrário
+        """
+        bucket = self.bucket(host)
+        headers = response.headers
+
+        if response.status_code == 429:
+            bucket.throttled += 1
+            # Retry-After: 0 é válido (repetir já); só a ausência cai no próximo
+            delay = _parse_retry_after(headers.get("Retry-After"))
+            if delay is None:
+                delay = _parse_reset(headers.get("X-RateLimit-Reset"))
+            if delay is None:
+                delay = 1.0 / bucket.rate
+            bucket.slow_down()
+            bucket.pause(delay)
+            logger.warning(
+                f"Limite de taxa em {host}: aguardando {delay:.1f}s "
+                f"(nova taxa {bucket.rate:.2f} req/s)"
+            )
+            return delay
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.strip() == "0":
+            reset = _parse_reset(headers.get("X-RateLimit-Reset"))
+            if reset is not None:
+                bucket.pause(reset)
+        if headers.get("X-RateLimit-NearLimit", "").lower() == "true":
+            bucket.slow_down()
+        elif response.status_code < 400:
+            bucket.speed_up()
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Taxa atual e contagem de 429 por host"""
+        return {
+            host: {
+                "rate": round(bucket.rate, 3),
+                "max_rate": bucket.max_rate,
+                "throttled": bucket.throttled,
+            }
+            for host, bucket in self._buckets.items()
+        }
+
+
+_shared_limiter: Optional[RateLimiter] = None
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """Limitador único do processo, compartilhado por todos os clientes HTTP"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        _shared_limiter = RateLimiter()
+    return _shared_limiter
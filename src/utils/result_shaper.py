@@ -0,0 +1,244 @@
+"""
+Limite de tamanho das respostas das ferramentas MCP
+Resultados acima de RESULT_MAX_BYTES voltam com o primeiro trecho da maior
+lista e um handle de continuação; os trechos seguintes ficam em cache no
+servidor e são buscados com a ferramenta continue_result
+"""
+
+import logging
+import os
+import secrets
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.cache import make_cache
+from src.utils.metrics import RESULTS_TRUNCATED
+
+logger = logging.getLogger(__name__)
+
+# Ferramenta que devolve o próximo trecho de um resultado truncado
+CONTINUE_TOOL = "continue_result"
+
+CONTINUE_TOOL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "handle": {"type": "string", "description": "Handle de continuação recebido em `continuation.handle`"}
+    },
+    "required": ["handle"]
+}
+
+# Espaço reservado para o bloco `continuation` e o envelope do trecho
+_OVERHEAD_BYTES = 512
+
+# Limite de entradas do cache de continuações (o limite efetivo é em bytes)
+_MAX_CONTINUATIONS = 1024
+
+# Caracteres que o JSON escapa ao levar um trecho de texto JSON para `text`
+_ESCAPED_CHARS = ('"', "\\", "\n", "\r", "\t")
+
+_TOO_LARGE_MESSAGE = "Resultado grande demais para continuação; refine a consulta (fields, filtros ou max_results)"
+
+
+def _size(text: str) -> int:
+    """Bytes UTF-8 do texto (sem recodificar quando é ASCII)"""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _escaped_size(chunk: str) -> int:
+    """Bytes de `chunk` como string JSON (sem as aspas externas), sem serializar"""
+    return _size(chunk) + sum(chunk.count(char) for char in _ESCAPED_CHARS)
+
+
+class ResultShaper:
+    """
+    Aplica o orçamento de bytes às respostas e guarda o restante
+
+    A resposta mantém o envelope (status, count, ...) e o maior campo de
+    primeiro nível que é lista é cortado no ponto em que o total cabe no
+    orçamento, com um resumo em `continuation`. Cada handle aponta para
+    uma posição (`<id>:<posição>`), então repetir a mesma continuação
+    devolve o mesmo trecho. Sem uma lista que possa ser dividida, o texto
+    JSON é entregue em fatias.
+
+    O resultado é serializado uma única vez; os itens da lista são
+    medidos uma vez e os tamanhos ficam junto da entrada em cache, de
+    modo que as continuações não voltam a serializar nada além do trecho.
+    """
+
+    def __init__(self, server: str, encode: Callable[[Any], str], max_bytes: Optional[int] = None,
+                 cache: Optional[Any] = None, max_cached_bytes: Optional[int] = None):
+        """
+        Args:
+            server: Nome do servidor nas métricas (simple, admin)
+            encode: Serializador dos resultados (o mesmo da resposta)
+            max_bytes: Tamanho máximo de cada resposta (RESULT_MAX_BYTES; 0 desativa)
+            cache: Armazenamento dos restantes (padrão: make_cache, compartilhado no prefork)
+            max_cached_bytes: Total em bytes guardado para continuações
+                (RESULT_CONTINUATION_MAX_BYTES)
+        """
+        self.server = server
+        self.encode = encode
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("RESULT_MAX_BYTES", 48000))
+        self.max_cached_bytes = (
+            max_cached_bytes if max_cached_bytes is not None
+            else int(os.getenv("RESULT_CONTINUATION_MAX_BYTES", 64 * 1024 * 1024))
+        )
+        if cache is None:
+            cache = make_cache(
+                "continuations",
+                maxsize=_MAX_CONTINUATIONS,
+                ttl=float(os.getenv("RESULT_CONTINUATION_TTL", 600)),
+                maxbytes=self.max_cached_bytes
+            )
+        self.cache = cache
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def render(self, tool: str, result: Any) -> str:
+        """
+        Texto da resposta dentro do orçamento
+
+        A serialização usada na medida é a mesma devolvida quando o
+        resultado cabe; acima do orçamento, só o trecho é serializado de
+        novo. Os trechos de continue_result já saem no tamanho certo.
+        """
+        text = self.encode(result)
+        if not self.enabled or tool == CONTINUE_TOOL:
+            return text
+        shaped = self._shape(tool, result, text)
+        return text if shaped is result else self.encode(shaped)
+
+    def shape(self, tool: str, result: Any) -> Any:
+        """Resultado dentro do orçamento (o próprio resultado quando já cabe)"""
+        if not self.enabled:
+            return result
+        return self._shape(tool, result, self.encode(result))
+
+    def _shape(self, tool: str, result: Any, text: str) -> Any:
+        total_bytes = _size(text)
+        if total_bytes <= self.max_bytes:
+            return result
+
+        RESULTS_TRUNCATED.inc(server=self.server, tool=tool)
+        logger.info(f"Resultado de {tool} com {total_bytes} bytes acima de {self.max_bytes}; entregue com continuação")
+
+        split = self._largest_list(result)
+        if split is not None:
+            field, sizes = split
+            items = result[field]
+            # O envelope é o que sobra do texto completo sem a lista
+            envelope_bytes = total_bytes - (sum(sizes) + len(sizes) + 1)
+            count = self._fit(sizes, 0, self.max_bytes - envelope_bytes - _OVERHEAD_BYTES)
+            if count > 0:
+                entry_id = self._store({"kind": "items", "field": field, "items": items, "sizes": sizes}, total_bytes)
+                shaped = {key: (value[:count] if key == field else value) for key, value in result.items()}
+                shaped["continuation"] = self._continuation(entry_id, field, count, len(items), total_bytes)
+                return shaped
+
+        # Sem lista divisível: fatias do próprio texto JSON
+        entry_id = self._store({"kind": "text", "text": text}, total_bytes)
+        return self._text_page(entry_id, text, 0)
+
+    def continue_result(self, handle: str) -> Dict[str, Any]:
+        """Próximo trecho de um resultado truncado"""
+        entry_id, _, position = str(handle or "").rpartition(":")
+        entry = self.cache.get(entry_id) if entry_id and position.isdigit() else None
+        if entry is None:
+            return {
+                "status": "error",
+                "message": "Handle de continuação desconhecido ou expirado; repita a chamada original"
+            }
+
+        offset = int(position)
+        if entry["kind"] == "text":
+            return self._text_page(entry_id, entry["text"], offset)
+
+        field, items, sizes = entry["field"], entry["items"], entry["sizes"]
+        page: Dict[str, Any] = {"status": "success", "field": field, "offset": offset}
+        budget = self.max_bytes - _OVERHEAD_BYTES - 2 * _size(field)
+        # Sempre avança pelo menos um item, mesmo que ele sozinho passe do orçamento
+        count = max(1, self._fit(sizes, offset, budget)) if offset < len(items) else 0
+        page[field] = items[offset:offset + count]
+        end = offset + count
+        if end < len(items):
+            page["continuation"] = self._continuation(entry_id, field, end, len(items))
+        return page
+
+    def _store(self, entry: Dict[str, Any], size: int) -> Optional[str]:
+        """Guarda o resultado completo; None se ele sozinho passa do limite do cache"""
+        if size > self.max_cached_bytes:
+            logger.warning(f"Resultado com {size} bytes acima de RESULT_CONTINUATION_MAX_BYTES; sem continuação")
+            return None
+        entry_id = secrets.token_urlsafe(9)
+        self.cache.set(entry_id, entry, size=size)
+        return entry_id
+
+    def _largest_list(self, result: Any) -> Optional[Tuple[str, List[int]]]:
+        """Campo de primeiro nível (lista) com a maior serialização e o tamanho de cada item"""
+        if not isinstance(result, dict):
+            return None
+        best: Optional[Tuple[str, List[int]]] = None
+        best_bytes = -1
+        for key, value in result.items():
+            if not isinstance(value, list) or len(value) < 2:
+                continue
+            sizes = [_size(self.encode(item)) for item in value]
+            total = sum(sizes)
+            if total > best_bytes:
+                best, best_bytes = (key, sizes), total
+        return best
+
+    @staticmethod
+    def _fit(sizes: List[int], offset: int, budget: int) -> int:
+        """Quantos itens a partir de `offset` cabem no orçamento"""
+        used = 2  # colchetes
+        count = 0
+        for index in range(offset, len(sizes)):
+            used += sizes[index] + 1
+            if used > budget:
+                break
+            count += 1
+        return count
+
+    def _continuation(self, entry_id: Optional[str], field: str, end: int, total: int,
+                      total_bytes: Optional[int] = None) -> Dict[str, Any]:
+        continuation: Dict[str, Any] = {
+            "handle": f"{entry_id}:{end}" if entry_id else None,
+            "tool": CONTINUE_TOOL,
+            "field": field,
+            "returned_until": end,
+            "total": total,
+            "remaining": total - end,
+        }
+        if total_bytes is not None:
+            continuation["total_bytes"] = total_bytes
+        if entry_id is None:
+            continuation["message"] = _TOO_LARGE_MESSAGE
+        return continuation
+
+    def _text_page(self, entry_id: Optional[str], text: str, offset: int) -> Dict[str, Any]:
+        size = max(1, self.max_bytes - _OVERHEAD_BYTES)
+        chunk = text[offset:offset + size]
+        # O orçamento é em bytes do texto já escapado (aspas, acentos)
+        encoded = _escaped_size(chunk)
+        while encoded > size and len(chunk) > 1:
+            chunk = chunk[:max(1, len(chunk) * size // encoded)]
+            encoded = _escaped_size(chunk)
+        page: Dict[str, Any] = {
+            "status": "partial",
+            "message": "Resultado JSON em fatias: concatene `text` de todas as continuações",
+            "offset": offset,
+            "text": chunk,
+        }
+        end = offset + len(chunk)
+        if end < len(text):
+            page["continuation"] = {
+                "handle": f"{entry_id}:{end}" if entry_id else None,
+                "tool": CONTINUE_TOOL,
+                "remaining_chars": len(text) - end,
+                "total_chars": len(text),
+            }
+            if entry_id is None:
+                page["continuation"]["message"] = _TOO_LARGE_MESSAGE
+        return page
@@ -0,0 +1,158 @@
+"""
+Política de repetição e circuit breaker para chamadas às APIs da Atlassian
+Repetições com backoff exponencial + jitter (apenas chamadas idempotentes)
+e falha rápida por endpoint quando o upstream está fora do ar
+"""
+
+import logging
+import os
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Status considerados falhas transitórias do upstream
+RETRYABLE_STATUS = {500, 502, 503, 504}
+
+# Métodos seguros de repetir sem efeitos colaterais duplicados
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(Exception):
+    """Chamada rejeitada porque o circuito do endpoint está aberto"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        super().__init__(
+            f"Circuito aberto para {endpoint}: upstream indisponível, "
+            f"nova tentativa em {retry_in:.1f}s"
+        )
+
+
+class RetryPolicy:
+    """Backoff exponencial com jitter completo, limitado por tentativas e prazo"""
+
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None, deadline: Optional[float] = None):
+        self.max_attempts = max_attempts or int(os.getenv("RETRY_MAX_ATTEMPTS", 3))
+        self.base_delay = base_delay or float(os.getenv("RETRY_BASE_DELAY", 0.5))
+        self.max_delay = max_delay or float(os.getenv("RETRY_MAX_DELAY", 8))
+        self.deadline = deadline or float(os.getenv("RETRY_DEADLINE", 30))
+
+    def backoff(self, attempt: int) -> float:
+        """Espera antes da tentativa seguinte (attempt começa em 1)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker clássico: closed -> open -> half_open
+
+    Após `failure_threshold` falhas consecutivas o circuito abre e rejeita
+    chamadas por `reset_timeout` segundos; depois disso uma única chamada
+    de teste é liberada e decide se o circuito fecha ou volta a abrir.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        """Indica se a chamada pode seguir"""
+        if self.state == self.OPEN:
+            if self.retry_in() > 0:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN:
+            # Uma chamada de teste por vez (liberada de novo se a anterior se perdeu)
+            if self._trial_in_flight and self._clock() - self._trial_started < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self._trial_in_flight = True
+            self._trial_started = self._clock()
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_neutral(self):
+        """Resposta que não indica saúde nem falha do endpoint (ex: 429 após esgotar as esperas)"""
+        # Libera a vaga de teste sem fechar o circuito nem zerar as falhas
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuito aberto após {self.failures} falhas consecutivas")
+            self.state = self.OPEN
+            self.opened_at = self._clock()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "retry_in": round(self.retry_in(), 1) if self.state == self.OPEN else 0,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Um circuit breaker por endpoint (método + host + caminho normalizado)"""
+
+    def __init__(self, failure_threshold: Optional[int] = None,
+                 reset_timeout: Optional[float] = None):
+        self.failure_threshold = failure_threshold or int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+        self.reset_timeout = reset_timeout or float(os.getenv("CIRCUIT_RESET_TIMEOUT", 30))
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self._breakers[endpoint] = breaker
+        return breaker
+
+    def open_circuits(self) -> Dict[str, Dict[str, Any]]:
+        """Endpoints com circuito aberto ou em teste"""
+        return {
+            endpoint: breaker.stats()
+            for endpoint, breaker in self._breakers.items()
+            if breaker.state != CircuitBreaker.CLOSED
+        }
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {endpoint: breaker.stats() for endpoint, breaker in self._breakers.items()}
+
+
+_shared_breakers: Optional[CircuitBreakerRegistry] = None
+
+
+def get_shared_breakers() -> CircuitBreakerRegistry:
+    """Registro único do processo, compartilhado por todos os clientes HTTP"""
+    global _shared_breakers
+    if _shared_breakers is None:
+        _shared_breakers = CircuitBreakerRegistry()
+    return _shared_breakers
@@ -0,0 +1,115 @@
+"""
+Serialização dos resultados das ferramentas MCP
+JSON compacto por padrão (orjson quando instalado) e projeção genérica
+de campos (`fields`) aplicada antes de serializar
+"""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # opcional: json da biblioteca padrão
+    orjson = None
+
+# Propriedade `fields` do inputSchema das ferramentas de leitura
+FIELDS_SCHEMA = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": "Chaves a manter em cada registro do resultado; aceita caminhos com ponto (ex: status.name)"
+}
+
+
+def _default(value: Any) -> str:
+    """Tipos fora do JSON (datetime, Decimal, ...) viram texto em vez de falhar"""
+    return str(value)
+
+
+def make_encoder(style: Optional[str] = None, encoder: Optional[str] = None) -> Callable[[Any], str]:
+    """
+    Função que serializa um resultado em texto JSON
+
+    Args:
+        style: compact (padrão) ou pretty (indentado, como antes) - RESULT_JSON_STYLE
+        encoder: auto (padrão: orjson se instalado), orjson ou json - RESULT_JSON_ENCODER
+    """
+    style = (style or os.getenv("RESULT_JSON_STYLE", "compact")).strip().lower()
+    encoder = (encoder or os.getenv("RESULT_JSON_ENCODER", "auto")).strip().lower()
+    pretty = style == "pretty"
+    if style not in ("compact", "pretty"):
+        logger.warning(f"RESULT_JSON_STYLE desconhecido: {style}; usando compact")
+
+    if encoder == "orjson" and orjson is None:
+        logger.warning("RESULT_JSON_ENCODER=orjson, mas o orjson não está instalado; usando json")
+    if encoder in ("auto", "orjson") and orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return lambda result: orjson.dumps(result, default=_default, option=option).decode("utf-8")
+
+    # Um JSONEncoder pronto: json.dumps com opções cria um novo a cada chamada
+    if pretty:
+        return json.JSONEncoder(indent=2, ensure_ascii=False, default=_default).encode
+    return json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_default).encode
+
+
+def _field_tree(fields: Iterable[str]) -> Dict[str, Any]:
+    """["a", "b.c", "b.d"] -> {"a": {}, "b": {"c": {}, "d": {}}} ({} = valor inteiro)"""
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        parts = [part for part in str(field).strip().split(".") if part]
+        if not parts:
+            continue
+        node = tree
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is not None and not child:
+                # Um caminho mais curto já pede o valor inteiro
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = {}
+    return tree
+
+
+def _project(value: Any, tree: Dict[str, Any]) -> Any:
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: _project(item, tree[key]) for key, item in value.items() if key in tree}
+    return value
+
+
+def _is_record(value: Any) -> bool:
+    return isinstance(value, dict) or (
+        isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+    )
+
+
+def project_fields(result: Any, fields: Optional[List[str]]) -> Any:
+    """
+    Mantém apenas os campos pedidos em cada registro do resultado
+
+    O envelope (status, count, source, ...) é preservado; a projeção vale
+    para os valores de primeiro nível que são objetos ou listas de objetos
+    (ex: `user`, `issue`, `issues`, `groups`, `schemes`).
+
+    Args:
+        result: Resultado da ferramenta
+        fields: Chaves a manter (caminhos com ponto para campos aninhados)
+    """
+    if not fields or not isinstance(result, dict):
+        return result
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    tree = _field_tree(fields)
+    if not tree:
+        return result
+    return {
+        key: _project(value, tree) if _is_record(value) else value
+        for key, value in result.items()
+    }
@@ -0,0 +1,141 @@
+"""
+Perfil de inicialização dos servidores MCP (--profile-startup)
+Mede a importação do módulo (em um interpretador novo, via -X importtime),
+a construção do servidor e o primeiro list_tools, que é o que o cliente
+espera antes de o agente poder usar qualquer ferramenta
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp.types import ListToolsRequest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def import_timings(module: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Tempo de importação de `module` em um processo novo
+
+    Returns:
+        (total em segundos, [(import direto do módulo, tempo acumulado em segundos)])
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=ROOT)
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Erro ao importar {module}: {result.stderr.strip().splitlines()[-1:]}")
+
+    # Linhas "import time: self | cumulative | <indentação>nome"; os imports
+    # aninhados aparecem antes do módulo que os importou, um nível acima
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, name.strip(), int(cumulative) / 1e6))
+
+    total = 0.0
+    children: List[Tuple[str, float]] = []
+    pending: List[Tuple[str, float]] = []
+    for depth, name, cumulative in entries:
+        if depth == 0:
+            if name == module:
+                total += cumulative
+                children = pending
+            pending = []
+        elif depth == 1:
+            pending.append((name, cumulative))
+        # Pacotes-pai (ex: `src`) entram no total do interpretador
+        if depth == 0 and module.startswith(f"{name}."):
+            total += cumulative
+
+    return total, sorted(children, key=lambda item: item[1], reverse=True)
+
+
+async def profile_startup(module: str, factory: Callable[[], Any], top: int = 10) -> Dict[str, Any]:
+    """
+    Mede as fases da inicialização
+
+    Args:
+        module: Módulo do servidor (ex: src.simple_mcp_server)
+        factory: Cria a instância do servidor (com atributo `server`)
+        top: Quantos imports diretos listar
+    """
+    import_total, imports = import_timings(module)
+
+    started = time.perf_counter()
+    instance = factory()
+    construct = time.perf_counter() - started
+
+    handler = instance.server.request_handlers[ListToolsRequest]
+    started = time.perf_counter()
+    result = await handler(ListToolsRequest(method="tools/list"))
+    first_list_tools = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await handler(ListToolsRequest(method="tools/list"))
+    next_list_tools = time.perf_counter() - started
+
+    http = getattr(instance, "http", None)
+    if http is not None:
+        await http.aclose()
+
+    return {
+        "module": module,
+        "python": sys.version.split()[0],
+        "import_ms": round(import_total * 1000, 2),
+        "imports": [{"module": name, "ms": round(seconds * 1000, 2)} for name, seconds in imports[:top]],
+        "construct_ms": round(construct * 1000, 2),
+        "first_list_tools_ms": round(first_list_tools * 1000, 2),
+        "next_list_tools_ms": round(next_list_tools * 1000, 2),
+        "tools": len(result.root.tools),
+        "total_ms": round((import_total + construct + first_list_tools) * 1000, 2),
+    }
+
+
+def print_profile(report: Dict[str, Any], as_json: bool = False, stream=None):
+    """Escreve o relatório (stderr por padrão: stdout é o canal MCP no stdio)"""
+    stream = stream or sys.stderr
+    if as_json:
+        print(json.dumps(report, indent=2), file=stream)
+        return
+
+    print(f"Perfil de inicialização: {report['module']} (Python {report['python']})", file=stream)
+    print(f"  {'importação':<42}{report['import_ms']:>10.1f} ms", file=stream)
+    for entry in report["imports"]:
+        print(f"    {entry['module']:<40}{entry['ms']:>10.1f} ms", file=stream)
+    print(f"  {'construção do servidor':<42}{report['construct_ms']:>10.1f} ms", file=stream)
+    print(f"  {'primeiro list_tools':<42}{report['first_list_tools_ms']:>10.1f} ms", file=stream)
+    print(f"  {'list_tools seguintes':<42}{report['next_list_tools_ms']:>10.1f} ms", file=stream)
+    print(f"  {'total até a lista de ferramentas':<42}{report['total_ms']:>10.1f} ms ({report['tools']} ferramentas)", file=stream)
+
+
+def run_cli(module: str, factory: Callable[[], Any], argv: Optional[List[str]] = None) -> bool:
+    """
+    Trata --profile-startup [--json] nos pontos de entrada dos servidores
+
+    Returns:
+        True se o perfil foi executado (o servidor não deve subir)
+    """
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(prog=f"python -m {module}")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Mede importação, construção e primeiro list_tools e sai")
+    parser.add_argument("--json", action="store_true", help="Relatório do perfil em JSON")
+    args, _ = parser.parse_known_args(argv)
+    if not args.profile_startup:
+        return False
+
+    report = asyncio.run(profile_startup(module, factory))
+    print_profile(report, as_json=args.json)
+    return True
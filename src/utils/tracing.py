@@ -0,0 +1,281 @@
+"""
+Rastreamento das chamadas de ferramentas
+Um span por chamada de ferramenta, com spans filhos para cada requisição
+às APIs da Atlassian, exportados para JSONL local ou para um coletor OTLP
+"""
+
+import asyncio
+import logging
+import os
+import secrets
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+
+from src.utils.action_log import ActionLog, ActionLogWriter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "traces.jsonl"
+)
+
+
+class Span:
+    """Operação com início, fim, atributos e status"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 kind: str = "internal", attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        # Spans filhos concluídos (apenas no span raiz)
+        self.finished: List["Span"] = []
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    def fail(self, error: Any):
+        self.status = "error"
+        self.error = str(error)
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        entry = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+        if self.error:
+            entry["error"] = self.error
+        return entry
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class OTLPExporter:
+    """
+    Exportador OTLP/HTTP (JSON) em segundo plano
+
+    Envia lotes para {endpoint}/v1/traces sem depender do SDK do
+    OpenTelemetry; quando a fila enche, spans novos são descartados
+    para não atrasar as ferramentas.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, max_queue: int = 2048,
+                 batch_size: int = 256, flush_interval: float = 1.0,
+                 headers: Optional[Dict[str, str]] = None):
+        self.url = f"{endpoint.rstrip('/')}/v1/traces"
+        self.service_name = service_name
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.headers = headers or {}
+        self.dropped = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._client = self._client or httpx.AsyncClient(timeout=10.0)
+            self._task = asyncio.create_task(self._run())
+
+    async def enqueue_many(self, entries: Iterable[Dict[str, Any]]):
+        self.start()
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    def _payload(self, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        def attribute(key: str, value: Any) -> Dict[str, Any]:
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        spans = []
+        for entry in batch:
+            span = {
+                "traceId": entry["trace_id"],
+                "spanId": entry["span_id"],
+                "name": entry["name"],
+                # 1 = INTERNAL, 3 = CLIENT
+                "kind": 3 if entry["kind"] == "client" else 1,
+                "startTimeUnixNano": str(entry["start_ns"]),
+                "endTimeUnixNano": str(entry["end_ns"]),
+                "attributes": [attribute(k, v) for k, v in entry["attributes"].items()],
+                # 1 = OK, 2 = ERROR
+                "status": {"code": 2, "message": entry.get("error", "")} if entry["status"] == "error" else {"code": 1},
+            }
+            if entry.get("parent_id"):
+                span["parentSpanId"] = entry["parent_id"]
+            spans.append(span)
+
+        return {"resourceSpans": [{
+            "resource": {"attributes": [attribute("service.name", self.service_name)]},
+            "scopeSpans": [{"scope": {"name": "jira-mcp"}, "spans": spans}],
+        }]}
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            if queue.empty():
+                await asyncio.sleep(self.flush_interval)
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                response = await self._client.post(self.url, json=self._payload(batch), headers=self.headers)
+                if response.status_code >= 400:
+                    logger.warning(f"Coletor OTLP recusou {len(batch)} spans: HTTP {response.status_code}")
+            except Exception as e:
+                logger.warning(f"Erro ao exportar {len(batch)} spans para {self.url}: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def flush(self):
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def aclose(self):
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class Tracer:
+    """Cria spans e entrega cada trace concluído ao exportador"""
+
+    def __init__(self, exporter: Optional[Any] = None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """
+        TRACE_EXPORTER: none (padrão), jsonl ou otlp
+        TRACE_FILE: arquivo JSONL (exportador jsonl)
+        OTEL_EXPORTER_OTLP_ENDPOINT / OTEL_SERVICE_NAME: coletor OTLP/HTTP
+        """
+        kind = os.getenv("TRACE_EXPORTER", "none").strip().lower()
+        if kind == "jsonl":
+            log = ActionLog(os.getenv("TRACE_FILE") or DEFAULT_TRACE_FILE)
+            return cls(ActionLogWriter(log, fsync=False))
+        if kind == "otlp":
+            return cls(OTLPExporter(
+                os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318"),
+                os.getenv("OTEL_SERVICE_NAME", "jira-mcp"),
+            ))
+        if kind not in ("", "none"):
+            logger.warning(f"TRACE_EXPORTER desconhecido: {kind}; rastreamento desativado")
+        return cls()
+
+    @asynccontextmanager
+    async def tool_span(self, server: str, tool: str) -> AsyncIterator[Optional[Span]]:
+        """Span raiz de uma chamada de ferramenta; exporta o trace ao terminar"""
+        if not self.enabled:
+            yield None
+            return
+
+        span = Span(f"{server}.{tool}", trace_id=secrets.token_hex(16),
+                    attributes={"mcp.server": server, "mcp.tool": tool})
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.fail(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            span.set(**{"upstream.requests": len(span.finished)})
+            entries = [span.to_dict()] + [child.to_dict() for child in span.finished]
+            try:
+                await self.exporter.enqueue_many(entries)
+            except Exception as e:
+                logger.warning(f"Erro ao exportar trace de {span.name}: {e}")
+
+    @contextmanager
+    def upstream_span(self, method: str, route: str) -> Iterator[Optional[Span]]:
+        """Span filho de uma requisição ao upstream (no-op fora de um trace)"""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+
+        span = Span(f"{method} {route}", trace_id=parent.trace_id, parent_id=parent.span_id,
+                    kind="client", attributes={"http.method": method, "http.route": route})
+        try:
+            yield span
+        except BaseException as e:
+            span.fail(e)
+            raise
+        finally:
+            span.end()
+            parent.finished.append(span)
+
+    async def aclose(self):
+        """Grava os spans pendentes"""
+        if self.exporter is not None:
+            await self.exporter.aclose()
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Tracer único do processo, configurado pelo ambiente"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer.from_env()
+    return _tracer
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Teste do gravador em segundo plano do log de ações (ActionLogWriter)
+Agrupamento das entradas em lotes (group commit) e gravação do que
+estiver pendente em aclose, em um arquivo temporário
+"""
+
+import asyncio
+import os
+import tempfile
+
+from src.utils.action_log import ActionLog, ActionLogWriter
+
+
+class CountingLog(ActionLog):
+    """ActionLog que registra o tamanho de cada lote gravado"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.batches = []
+
+    def append(self, entries, fsync=False):
+        entries = list(entries)
+        self.batches.append(len(entries))
+        return super().append(entries, fsync)
+
+
+def make_writer(directory, **options):
+    log = CountingLog(os.path.join(directory, "actions.jsonl"))
+    options.setdefault("fsync", False)
+    return ActionLogWriter(log, **options), log
+
+
+async def _concurrent_entries_share_one_write():
+    with tempfile.TemporaryDirectory() as directory:
+        writer, log = make_writer(directory, batch_size=100, flush_interval=0.05)
+        await asyncio.gather(*(writer.enqueue({"action": "create_user", "n": i}) for i in range(50)))
+        await writer.flush()
+
+        assert log.batches == [50]
+        assert [entry["n"] for entry in log.iter_entries()] == list(range(50))
+        await writer.aclose()
+
+
+async def _batches_are_bounded():
+    with tempfile.TemporaryDirectory() as directory:
+        writer, log = make_writer(directory, batch_size=100, flush_interval=0.05)
+        await writer.enqueue_many({"action": "grant", "n": i} for i in range(250))
+        await writer.flush()
+
+        assert sum(log.batches) == 250
+        assert max(log.batches) <= 100
+        assert len(log.batches) < 250
+        assert [entry["n"] for entry in log.iter_entries("grant")] == list(range(250))
+        await writer.aclose()
+
+
+async def _aclose_flushes_pending_entries():
+    with tempfile.TemporaryDirectory() as directory:
+        # Intervalo longo: sem aclose, as entradas ainda estariam na fila
+        writer, log = make_writer(directory, flush_interval=0.5)
+        for i in range(5):
+            await writer.enqueue({"action": "create_user", "n": i})
+        assert log.batches == []
+
+        await writer.aclose()
+        assert writer._task is None
+        assert [entry["n"] for entry in log.iter_entries()] == list(range(5))
+
+        # O gravador volta a funcionar após aclose
+        await writer.enqueue({"action": "create_user", "n": 5})
+        await writer.aclose()
+        assert len(list(log.iter_entries())) == 6
+
+
+async def _full_queue_applies_backpressure():
+    with tempfile.TemporaryDirectory() as directory:
+        writer, log = make_writer(directory, max_queue=2, batch_size=2, flush_interval=0)
+        await writer.enqueue_many({"action": "grant", "n": i} for i in range(20))
+        await writer.aclose()
+
+        assert max(log.batches) <= 2
+        assert [entry["n"] for entry in log.iter_entries()] == list(range(20))
+
+
+def test_concurrent_entries_share_one_write():
+    asyncio.run(_concurrent_entries_share_one_write())
+
+
+def test_batches_are_bounded_by_batch_size():
+    asyncio.run(_batches_are_bounded())
+
+
+def test_aclose_flushes_pending_entries():
+    asyncio.run(_aclose_flushes_pending_entries())
+
+
+def test_full_queue_applies_backpressure():
+    asyncio.run(_full_queue_applies_backpressure())
+
+
+if __name__ == "__main__":
+    test_concurrent_entries_share_one_write()
+    test_batches_are_bounded_by_batch_size()
+    test_aclose_flushes_pending_entries()
+    test_full_queue_applies_backpressure()
+    print("✅ ActionLogWriter: group commit e aclose")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Teste do circuit breaker do cliente HTTP diante de respostas 429
+Usa httpx.MockTransport, sem acesso à rede nem credenciais
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from src.utils.http_client import JiraHttpClient
+from src.utils.rate_limiter import RateLimiter
+from src.utils.retry import CircuitBreaker, CircuitBreakerRegistry, RetryPolicy
+
+JIRA_URL = "https://example.atlassian.net"
+ENDPOINT = "GET example.atlassian.net/rest/api/3/myself"
+
+
+def make_client(statuses, breakers, seen=None):
+    """Cliente cujo transporte responde com os status da lista (o último se repete)"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if seen is not None:
+            seen.append(request)
+        status = statuses[min(len(calls), len(statuses) - 1)]
+        calls.append(status)
+        headers = {"Retry-After": "0.001"} if status == 429 else {}
+        return httpx.Response(status, headers=headers, json={})
+
+    http = JiraHttpClient(
+        JIRA_URL, "user@example.com", "token",
+        rate_limiter=RateLimiter(jira_rate=1000, burst=10),
+        retry_policy=RetryPolicy(max_attempts=1),
+        breakers=breakers
+    )
+    http.max_throttle_retries = 2
+    http.coalesce_gets = False
+    http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return http, calls
+
+
+async def _repeated_429_keep_failures():
+    breakers = CircuitBreakerRegistry(failure_threshold=5, reset_timeout=30)
+    breaker = breakers.get(ENDPOINT)
+    for _ in range(3):
+        breaker.record_failure()
+
+    http, calls = make_client([429], breakers)
+    for _ in range(3):
+        response = await http.get(http.jira_api("myself"))
+        assert response.status_code == 429
+    await http.aclose()
+
+    # 3 chamadas x (1 + 2 repetições após 429)
+    assert len(calls) == 9
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 3
+
+
+async def _repeated_429_keep_half_open():
+    breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=0.05)
+    breaker = breakers.get(ENDPOINT)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+
+    http, _ = make_client([429, 429, 429, 429, 429, 429, 200], breakers)
+    for _ in range(2):
+        response = await http.get(http.jira_api("myself"))
+        assert response.status_code == 429
+        # Sem fechar o circuito, mas liberando a próxima chamada de teste
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.failures == 1
+
+    response = await http.get(http.jira_api("myself"))
+    await http.aclose()
+    assert response.status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+async def _timeout_forms_are_capped():
+    seen = []
+    http, _ = make_client([200], CircuitBreakerRegistry(), seen=seen)
+    http.retry_policy.deadline = 5.0
+    url = http.jira_api("myself")
+
+    for timeout in (2.0, 10, None, httpx.Timeout(3.0, connect=1.0), httpx.Timeout(None, read=60.0)):
+        response = await http.get(url, timeout=timeout)
+        assert response.status_code == 200
+    await http.aclose()
+
+    phases = [seen_request.extensions["timeout"] for seen_request in seen]
+    # Cada fase limitada ao prazo restante da chamada (5s)
+    assert phases[0]["read"] == 2.0
+    assert 4.0 < phases[1]["read"] <= 5.0
+    assert all(4.0 < value <= 5.0 for value in phases[2].values())
+    assert phases[3]["connect"] == 1.0 and phases[3]["read"] == 3.0
+    assert 4.0 < phases[4]["connect"] <= 5.0 and 4.0 < phases[4]["read"] <= 5.0
+
+
+def test_retry_after_zero_is_respected():
+    limiter = RateLimiter(jira_rate=1, burst=1)
+    headers = {"Retry-After": "0", "X-RateLimit-Reset": "2999-01-01T00:00:00Z"}
+    response = httpx.Response(429, headers=headers)
+    assert limiter.observe("example.atlassian.net", response) == 0.0
+
+
+def test_repeated_429_do_not_reset_failures():
+    asyncio.run(_repeated_429_keep_failures())
+
+
+def test_repeated_429_do_not_close_half_open_circuit():
+    asyncio.run(_repeated_429_keep_half_open())
+
+
+def test_timeout_accepts_number_none_and_httpx_timeout():
+    asyncio.run(_timeout_forms_are_capped())
+
+
+if __name__ == "__main__":
+    test_repeated_429_do_not_reset_failures()
+    test_repeated_429_do_not_close_half_open_circuit()
+    print("✅ Circuit breaker inalterado após respostas 429")
+    test_timeout_accepts_number_none_and_httpx_timeout()
+    print("✅ Timeout numérico, None e httpx.Timeout limitados ao prazo")
+    test_retry_after_zero_is_respected()
+    print("✅ Retry-After: 0 respeitado")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Teste da sincronização incremental do espelho (MirrorSyncer)
+Watermark por página, busca `updated >=` nas sincronizações seguintes e
+retomada após falha, com httpx.MockTransport e SQLite temporário
+"""
+
+import asyncio
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, timedelta
+
+import httpx
+
+from src.sync.issue_mirror import IssueMirror, MirrorSyncer
+from src.utils.http_client import JiraHttpClient
+from src.utils.rate_limiter import RateLimiter
+from src.utils.retry import CircuitBreakerRegistry, RetryPolicy
+
+JIRA_URL = "https://example.atlassian.net"
+BASE = datetime(2025, 9, 16, 10, 0)
+
+
+def jira_time(minutes: int) -> str:
+    return (BASE + timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%S.000-0300")
+
+
+class MockSearch:
+    """/search/jql sobre issues em memória (filtro por `updated >=` e paginação)"""
+
+    def __init__(self, count: int):
+        self.issues = {
+            f"SCRUM-{i}": {"id": str(i), "key": f"SCRUM-{i}",
+                           "fields": {"summary": f"Issue {i}", "updated": jira_time(i),
+                                      "status": {"name": "To Do"}}}
+            for i in range(count)
+        }
+        self.jqls = []
+        self.fail_on_page = None
+
+    def touch(self, key: str, minutes: int, summary: str):
+        self.issues[key]["fields"].update({"updated": jira_time(minutes), "summary": summary})
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.jqls.append(body["jql"])
+        offset = int(body.get("nextPageToken") or 0)
+        if self.fail_on_page is not None and offset // body["maxResults"] == self.fail_on_page:
+            return httpx.Response(500, json={})
+
+        matches = sorted(self.issues.values(), key=lambda issue: issue["fields"]["updated"])
+        since = re.search(r'updated >= "([^"]+)"', body["jql"])
+        if since:
+            start = datetime.strptime(since.group(1), "%Y-%m-%d %H:%M")
+            matches = [issue for issue in matches
+                       if datetime.strptime(issue["fields"]["updated"][:16], "%Y-%m-%dT%H:%M") >= start]
+
+        page = matches[offset:offset + body["maxResults"]]
+        end = offset + len(page)
+        response = {"issues": page, "isLast": end >= len(matches)}
+        if end < len(matches):
+            response["nextPageToken"] = str(end)
+        return httpx.Response(200, json=response)
+
+
+def make_syncer(jira: MockSearch, directory: str) -> MirrorSyncer:
+    http = JiraHttpClient(
+        JIRA_URL, "user@example.com", "token",
+        rate_limiter=RateLimiter(jira_rate=1000, burst=10),
+        retry_policy=RetryPolicy(max_attempts=1),
+        breakers=CircuitBreakerRegistry()
+    )
+    http._client = httpx.AsyncClient(transport=httpx.MockTransport(jira.handler))
+    mirror = IssueMirror(os.path.join(directory, "mirror.sqlite3"))
+    return MirrorSyncer(http, mirror, projects=["scrum"], interval=60)
+
+
+async def _full_then_incremental_sync():
+    with tempfile.TemporaryDirectory() as directory:
+        jira = MockSearch(150)
+        syncer = make_syncer(jira, directory)
+
+        assert await syncer.sync_project("SCRUM") == 150
+        assert jira.jqls == ['project = "SCRUM" ORDER BY updated ASC'] * 2
+        state = syncer.mirror.get_sync_state("SCRUM")
+        assert state["watermark"] == jira_time(149)
+        assert state["issue_count"] == 150
+        assert syncer.mirror.staleness("SCRUM") < 5
+
+        # Só os issues alterados (e os do minuto do watermark) voltam do JIRA
+        jira.jqls.clear()
+        jira.touch("SCRUM-3", 200, "Resumo novo")
+        jira.touch("SCRUM-7", 201, "Outro resumo")
+        received = await syncer.sync_project("SCRUM")
+
+        assert jira.jqls == ['project = "SCRUM" AND updated >= "2025-09-16 12:28" ORDER BY updated ASC']
+        assert received == 4
+        assert syncer.mirror.get_sync_state("SCRUM")["watermark"] == jira_time(201)
+        assert syncer.mirror.get_issue("SCRUM-3")["summary"] == "Resumo novo"
+        assert syncer.mirror.count("SCRUM") == 150
+
+        await syncer.http.aclose()
+        syncer.mirror.close()
+
+
+async def _interrupted_sync_resumes_from_last_page():
+    with tempfile.TemporaryDirectory() as directory:
+        jira = MockSearch(150)
+        jira.fail_on_page = 1
+        syncer = make_syncer(jira, directory)
+
+        results = await syncer.sync_all()
+        assert results["SCRUM"].startswith("erro")
+        # A primeira página ficou gravada e o watermark avançou até ela
+        state = syncer.mirror.get_sync_state("SCRUM")
+        assert state["watermark"] == jira_time(99)
+        assert state["last_synced_at"] is None
+        assert syncer.mirror.count("SCRUM") == 100
+
+        jira.fail_on_page = None
+        jira.jqls.clear()
+        assert await syncer.sync_project("SCRUM") == 52
+        assert 'updated >= "2025-09-16 11:38"' in jira.jqls[0]
+        assert syncer.mirror.count("SCRUM") == 150
+        assert syncer.mirror.staleness("SCRUM") is not None
+
+        await syncer.http.aclose()
+        syncer.mirror.close()
+
+
+def test_full_then_incremental_sync():
+    asyncio.run(_full_then_incremental_sync())
+
+
+def test_interrupted_sync_resumes_from_last_page():
+    asyncio.run(_interrupted_sync_resumes_from_last_page())
+
+
+if __name__ == "__main__":
+    test_full_then_incremental_sync()
+    test_interrupted_sync_resumes_from_last_page()
+    print("✅ Espelho: sincronização incremental pelo watermark")
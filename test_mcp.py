@@ -5,7 +5,7 @@ Testa a criação real de issues no JIRA usando as credenciais do .env
 """
 
 import asyncio
-import json
+from collections import deque
 from src.simple_mcp_server import SimpleJiraMCP
 
 async def test_real_jira_creation():
@@ -52,22 +52,22 @@ async def test_real_jira_creation():
     
     # Verificar arquivo de log
     print("\n📊 Verificando arquivo de log...")
-    try:
-        with open("test_actions.json", "r", encoding="utf-8") as f:
-            actions = json.load(f)
-        
-        real_issues = [action for action in actions if action.get("action") == "create_real_issue"]
-        print(f"✅ Total de issues reais criados: {len(real_issues)}")
+    await server.action_writer.flush()
+    total = 0
+    real_issues = deque(maxlen=2)  # Manter apenas os 2 últimos
+    for action in server.action_log.iter_entries("create_real_issue"):
+        total += 1
+        real_issues.append(action)
+    
+    if total:
+        print(f"✅ Total de issues reais criados: {total}")
         
-        for i, action in enumerate(real_issues[-2:], 1):  # Mostrar os 2 últimos
+        for i, action in enumerate(real_issues, 1):
             data = action["data"]
             print(f"  {i}. {data['key']}: {data['summary']}")
             print(f"     🔗 {data['url']}")
-            
-    except FileNotFoundError:
-        print("❌ Arquivo de log não encontrado")
-    except json.JSONDecodeError:
-        print("❌ Erro ao ler arquivo de log")
+    else:
+        print("❌ Nenhum issue encontrado no arquivo de log")
     
     print("\n🎉 Teste concluído!")
     print("\n📋 Próximos passos:")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Teste do índice de esquemas de permissões (PermissionSchemeIndex)
+Consultas por permissão e por detentor, expiração do TTL e invalidação
+após grant_permission_to_scheme, com httpx.MockTransport
+"""
+
+import asyncio
+import json
+
+import httpx
+
+from src.tools.jira_admin_tools import JiraAdminTools
+from src.tools.permission_index import PermissionSchemeIndex
+from src.utils.http_client import JiraHttpClient
+from src.utils.rate_limiter import RateLimiter
+from src.utils.retry import CircuitBreakerRegistry, RetryPolicy
+
+JIRA_URL = "https://example.atlassian.net"
+
+
+class MockJira:
+    """Esquemas de permissões em memória; conta as cargas do índice"""
+
+    def __init__(self):
+        self.loads = 0
+        self.schemes = [
+            {"id": 10000, "name": "Padrão", "permissions": [
+                {"id": 1, "permission": "BROWSE_PROJECTS",
+                 "holder": {"type": "group", "parameter": "jira-users", "value": "g-123"}},
+                {"id": 2, "permission": "ADMINISTER_PROJECTS",
+                 "holder": {"type": "projectRole", "parameter": "10002", "value": "10002"}},
+            ]},
+            {"id": 10001, "name": "Restrito", "permissions": [
+                {"id": 3, "permission": "BROWSE_PROJECTS",
+                 "holder": {"type": "user", "parameter": "acc-1", "value": "acc-1"}},
+            ]},
+        ]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "GET" and path == "/rest/api/3/permissionscheme":
+            self.loads += 1
+            return httpx.Response(200, json={"permissionSchemes": self.schemes})
+        if request.method == "POST" and path.endswith("/permission"):
+            scheme_id = int(path.split("/")[-2])
+            body = json.loads(request.content)
+            grant = {"id": 100 + self.loads, **body}
+            for scheme in self.schemes:
+                if scheme["id"] == scheme_id:
+                    scheme["permissions"].append(grant)
+            return httpx.Response(201, json=grant)
+        return httpx.Response(404, json={})
+
+
+def make_http(jira: MockJira) -> JiraHttpClient:
+    http = JiraHttpClient(
+        JIRA_URL, "user@example.com", "token",
+        rate_limiter=RateLimiter(jira_rate=1000, burst=10),
+        retry_policy=RetryPolicy(max_attempts=1),
+        breakers=CircuitBreakerRegistry()
+    )
+    http._client = httpx.AsyncClient(transport=httpx.MockTransport(jira.handler))
+    return http
+
+
+async def _lookups():
+    jira = MockJira()
+    http = make_http(jira)
+    index = PermissionSchemeIndex(http, ttl=300)
+
+    schemes = await index.schemes_granting("browse_projects")
+    assert sorted(scheme["id"] for scheme in schemes) == ["10000", "10001"]
+
+    # Grupo aceito pelo nome ou pelo groupId, sem diferenciar maiúsculas
+    for holder in ("jira-users", "G-123"):
+        schemes = await index.schemes_granting("BROWSE_PROJECTS", "group", holder)
+        assert [scheme["name"] for scheme in schemes] == ["Padrão"]
+        assert schemes[0]["grants"][0]["grant_id"] == 1
+    assert await index.schemes_granting("BROWSE_PROJECTS", "group", "outro") == []
+
+    permissions = await index.holder_permissions("projectRole", "10002")
+    assert permissions == [{"id": "10000", "name": "Padrão", "description": "",
+                            "permissions": ["ADMINISTER_PROJECTS"]}]
+    assert await index.holder_permissions("user", "acc-2") == []
+
+    # Todas as consultas acima vieram de uma única carga
+    assert jira.loads == 1
+    await http.aclose()
+
+
+async def _ttl_expiry():
+    jira = MockJira()
+    http = make_http(jira)
+    index = PermissionSchemeIndex(http, ttl=300)
+
+    await index.holder_permissions("user", "acc-1")
+    await index.holder_permissions("user", "acc-1")
+    assert jira.loads == 1
+
+    index.loaded_at -= 301
+    await index.holder_permissions("user", "acc-1")
+    assert jira.loads == 2
+    await http.aclose()
+
+
+async def _concurrent_queries_share_one_load():
+    jira = MockJira()
+    http = make_http(jira)
+    index = PermissionSchemeIndex(http, ttl=300)
+
+    await asyncio.gather(*(index.schemes_granting("BROWSE_PROJECTS") for _ in range(10)))
+    assert jira.loads == 1
+    await http.aclose()
+
+
+async def _grant_invalidates_index():
+    jira = MockJira()
+    http = make_http(jira)
+    tools = JiraAdminTools(JIRA_URL, "user@example.com", "token", "org", "key", http=http)
+
+    assert await tools.permissions.holder_permissions("group", "qa") == []
+    await tools.grant_permission_to_scheme("10001", "BROWSE_PROJECTS", "group", "qa")
+
+    permissions = await tools.permissions.holder_permissions("group", "qa")
+    assert [(scheme["id"], scheme["permissions"]) for scheme in permissions] == [
+        ("10001", ["BROWSE_PROJECTS"])
+    ]
+    assert jira.loads == 2
+    await http.aclose()
+
+
+def test_lookups_by_permission_and_holder():
+    asyncio.run(_lookups())
+
+
+def test_index_reloads_after_ttl():
+    asyncio.run(_ttl_expiry())
+
+
+def test_concurrent_queries_share_one_load():
+    asyncio.run(_concurrent_queries_share_one_load())
+
+
+def test_grant_permission_invalidates_index():
+    asyncio.run(_grant_invalidates_index())
+
+
+if __name__ == "__main__":
+    test_lookups_by_permission_and_holder()
+    test_index_reloads_after_ttl()
+    test_concurrent_queries_share_one_load()
+    test_grant_permission_invalidates_index()
+    print("✅ Índice de permissões: consultas, TTL e invalidação")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Teste do limite de tamanho das respostas (ResultShaper)
+Divisão da maior lista, fatias de texto JSON e handles desconhecidos ou
+expirados, com cache em memória e relógio controlado
+"""
+
+import json
+
+from src.utils.cache import TTLCache
+from src.utils.result_shaper import CONTINUE_TOOL, ResultShaper
+from src.utils.serialization import make_encoder
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_shaper(max_bytes=2000, clock=None, max_cached_bytes=10_000_000):
+    """Shaper com encoder contado (chamadas em `shaper.encodes`)"""
+    encode = make_encoder("compact", "json")
+    cache = TTLCache(maxsize=100, ttl=60, clock=clock or FakeClock(), maxbytes=max_cached_bytes)
+
+    def counted(value):
+        shaper.encodes += 1
+        return encode(value)
+
+    shaper = ResultShaper("test", counted, max_bytes=max_bytes, cache=cache,
+                          max_cached_bytes=max_cached_bytes)
+    shaper.encodes = 0
+    return shaper
+
+
+def issues_result(count=100):
+    issues = [{"key": f"SCRUM-{i}", "summary": f"Issue {i} " + "x" * 40} for i in range(count)]
+    return {"status": "success", "count": count, "issues": issues}
+
+
+def follow(shaper, first):
+    """Segue as continuações e devolve todas as páginas"""
+    pages = [first]
+    continuation = first.get("continuation")
+    while continuation:
+        page = json.loads(shaper.render(CONTINUE_TOOL, shaper.continue_result(continuation["handle"])))
+        pages.append(page)
+        continuation = page.get("continuation")
+    return pages
+
+
+def test_small_result_is_unchanged():
+    shaper = make_shaper()
+    result = {"status": "success", "issues": [{"key": "SCRUM-1"}]}
+    assert json.loads(shaper.render("search_issues", result)) == result
+    assert shaper.encodes == 1
+
+
+def test_largest_list_is_split_and_reassembled():
+    shaper = make_shaper()
+    result = issues_result()
+    text = shaper.render("search_issues", result)
+    first = json.loads(text)
+
+    assert len(text.encode("utf-8")) <= shaper.max_bytes
+    assert first["status"] == "success" and first["count"] == 100
+    assert 0 < len(first["issues"]) < 100
+    assert first["continuation"]["total"] == 100
+
+    pages = follow(shaper, first)
+    for page in pages:
+        assert len(json.dumps(page, separators=(",", ":"), ensure_ascii=False).encode("utf-8")) <= shaper.max_bytes
+    issues = [issue for page in pages for issue in page["issues"]]
+    assert issues == result["issues"]
+
+
+def test_each_item_is_encoded_once():
+    shaper = make_shaper()
+    result = issues_result()
+    first = json.loads(shaper.render("search_issues", result))
+    # resultado completo + um por item + o trecho devolvido
+    assert shaper.encodes == 1 + 100 + 1
+
+    shaper.encodes = 0
+    shaper.continue_result(first["continuation"]["handle"])
+    assert shaper.encodes == 0
+
+
+def test_same_handle_returns_same_chunk():
+    shaper = make_shaper()
+    first = json.loads(shaper.render("search_issues", issues_result()))
+    handle = first["continuation"]["handle"]
+    assert shaper.continue_result(handle) == shaper.continue_result(handle)
+
+
+def test_result_without_list_falls_back_to_text_slices():
+    shaper = make_shaper(max_bytes=1000)
+    result = {"status": "success", "description": 'ação "citada" \\ ' * 300}
+    first = json.loads(shaper.render("get_issue", result))
+
+    assert first["status"] == "partial"
+    pages = follow(shaper, first)
+    assert len(pages) > 1
+    for page in pages:
+        assert len(json.dumps(page, separators=(",", ":"), ensure_ascii=False).encode("utf-8")) <= shaper.max_bytes
+    assert json.loads("".join(page["text"] for page in pages)) == result
+
+
+def test_single_oversized_item_falls_back_to_text_slices():
+    shaper = make_shaper(max_bytes=1000)
+    result = {"issues": [{"key": "SCRUM-1", "description": "y" * 3000}, {"key": "SCRUM-2"}]}
+    first = json.loads(shaper.render("search_issues", result))
+    assert first["status"] == "partial"
+    assert json.loads("".join(page["text"] for page in follow(shaper, first))) == result
+
+
+def test_unknown_handle_is_an_error():
+    shaper = make_shaper()
+    for handle in ("nope:3", "", "sem-posicao", None):
+        page = shaper.continue_result(handle)
+        assert page["status"] == "error"
+        assert "repita a chamada original" in page["message"]
+
+
+def test_expired_handle_is_an_error():
+    clock = FakeClock()
+    shaper = make_shaper(clock=clock)
+    first = json.loads(shaper.render("search_issues", issues_result()))
+    handle = first["continuation"]["handle"]
+    assert shaper.continue_result(handle)["status"] == "success"
+
+    clock.now += 61
+    assert shaper.continue_result(handle)["status"] == "error"
+
+
+def test_continuation_cache_is_bounded_by_bytes():
+    shaper = make_shaper(max_cached_bytes=12_000)
+    handles = [
+        json.loads(shaper.render("search_issues", issues_result()))["continuation"]["handle"]
+        for _ in range(3)
+    ]
+    # Cada resultado tem ~6 KB: só os dois mais recentes cabem
+    assert shaper.cache.bytes <= 12_000
+    assert shaper.continue_result(handles[0])["status"] == "error"
+    assert shaper.continue_result(handles[-1])["status"] == "success"
+
+
+def test_result_larger_than_cache_returns_without_handle():
+    shaper = make_shaper(max_cached_bytes=1000)
+    first = json.loads(shaper.render("search_issues", issues_result()))
+    assert first["continuation"]["handle"] is None
+    assert first["continuation"]["remaining"] > 0
+    assert len(shaper.cache) == 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+    print("✅ ResultShaper: divisão, fatias e continuações")
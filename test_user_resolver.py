@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Teste da resolução de usuários com cache (UserResolver)
+Entradas negativas com TTL curto e `remember` após criar o usuário,
+com httpx.MockTransport e relógio controlado
+"""
+
+import asyncio
+
+import httpx
+
+from src.tools.user_resolver import UserResolver
+from src.utils.cache import TTLCache
+from src.utils.http_client import JiraHttpClient
+from src.utils.rate_limiter import RateLimiter
+from src.utils.retry import CircuitBreakerRegistry, RetryPolicy
+
+JIRA_URL = "https://example.atlassian.net"
+
+ANA = {"accountId": "acc-ana", "emailAddress": "ana@example.com", "displayName": "Ana"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_resolver(users, clock):
+    """Resolver cujo /user/search procura em `users`; consultas em `queries`"""
+    queries = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["query"].strip().lower()
+        queries.append(query)
+        return httpx.Response(200, json=[user for user in users if query in user["emailAddress"]])
+
+    http = JiraHttpClient(
+        JIRA_URL, "user@example.com", "token",
+        rate_limiter=RateLimiter(jira_rate=1000, burst=10),
+        retry_policy=RetryPolicy(max_attempts=1),
+        breakers=CircuitBreakerRegistry()
+    )
+    http.coalesce_gets = False
+    http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    cache = TTLCache(maxsize=100, ttl=600, clock=clock)
+    return UserResolver(http, cache=cache, negative_ttl=60), queries
+
+
+async def _positive_results_are_cached():
+    resolver, queries = make_resolver([ANA], FakeClock())
+    assert await resolver.account_id("Ana@Example.com ") == "acc-ana"
+    assert await resolver.find_by_email("ana@example.com") == ANA
+    assert await resolver.search("ANA@example.com") == [ANA]
+    assert queries == ["ana@example.com"]
+    await resolver.http.aclose()
+
+
+async def _negative_results_expire_sooner():
+    users = []
+    clock = FakeClock()
+    resolver, queries = make_resolver(users, clock)
+
+    assert await resolver.find_by_email("novo@example.com") is None
+    assert await resolver.find_by_email("novo@example.com") is None
+    assert await resolver.search("novo@example.com") == []
+    assert len(queries) == 1
+
+    # O usuário passa a existir no JIRA; o negativo vale só negative_ttl
+    users.append({"accountId": "acc-novo", "emailAddress": "novo@example.com"})
+    clock.now += 30
+    assert await resolver.find_by_email("novo@example.com") is None
+    clock.now += 31
+    assert await resolver.account_id("novo@example.com") == "acc-novo"
+    assert len(queries) == 2
+    await resolver.http.aclose()
+
+
+async def _remember_replaces_negative_entries():
+    clock = FakeClock()
+    resolver, queries = make_resolver([], clock)
+
+    assert await resolver.find_by_email("ana@example.com") is None
+    resolver.remember(ANA)
+
+    assert await resolver.find_by_email("ana@example.com") == ANA
+    assert await resolver.account_id("ANA@example.com") == "acc-ana"
+    # A busca negativa também foi descartada: a próxima vai ao JIRA
+    assert await resolver.search("ana@example.com") == []
+    assert len(queries) == 2
+    await resolver.http.aclose()
+
+
+async def _http_errors_are_not_cached():
+    statuses = [500, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses.pop(0)
+        return httpx.Response(status, json=[ANA] if status == 200 else {})
+
+    resolver, _ = make_resolver([], FakeClock())
+    resolver.http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    try:
+        await resolver.find_by_email("ana@example.com")
+        raise AssertionError("erro HTTP deveria propagar")
+    except Exception as e:
+        assert "500" in str(e)
+    assert await resolver.find_by_email("ana@example.com") == ANA
+    await resolver.http.aclose()
+
+
+def test_positive_results_are_cached():
+    asyncio.run(_positive_results_are_cached())
+
+
+def test_negative_results_expire_after_negative_ttl():
+    asyncio.run(_negative_results_expire_sooner())
+
+
+def test_remember_replaces_negative_entries():
+    asyncio.run(_remember_replaces_negative_entries())
+
+
+def test_http_errors_are_not_cached():
+    asyncio.run(_http_errors_are_not_cached())
+
+
+if __name__ == "__main__":
+    test_positive_results_are_cached()
+    test_negative_results_expire_after_negative_ttl()
+    test_remember_replaces_negative_entries()
+    test_http_errors_are_not_cached()
+    print("✅ UserResolver: cache positivo, negativo e remember")